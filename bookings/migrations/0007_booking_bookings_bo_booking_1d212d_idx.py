@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0006_booking_expires_at'),
+        ('turfs', '0008_turf_rules'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['booking_date', 'start_time', 'id'], name='bookings_bo_booking_1d212d_idx'),
+        ),
+    ]
@@ -99,6 +99,8 @@ class Booking(models.Model):
         indexes = [
             models.Index(fields=['turf', 'booking_date', 'start_time']),
             models.Index(fields=['user']),
+            # Keyset pagination / export order for the admin booking report
+            models.Index(fields=['booking_date', 'start_time', 'id']),
         ]
 
     def __str__(self):
@@ -6,10 +6,13 @@ from django.db import transaction
 from .models import Booking
 from turfs.models import Turf
 from payments.models import DemoPayment
+from core.utils.ratelimit import rate_limit, by_user
 import datetime
 import uuid
 
 @login_required
+@rate_limit('booking_ip')
+@rate_limit('booking_user', key=by_user)
 @transaction.atomic
 def book_slot(request, turf_id):
     from turfs.services import AvailabilityService
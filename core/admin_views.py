@@ -1,10 +1,22 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib import messages
-from django.core.paginator import Paginator
 from django.db.models import Q
+from django.db.models.functions import Coalesce
+from core.utils.pagination import KeysetPaginator
 from users.models import CustomUser
 from turfs.models import Turf
+from turfs.search import TurfSearchService
+from turfs.services import TurfVisibilityService
+
+# Sort options offered by the venue directory, mapped to unique keyset orderings
+VENUE_SORTS = {
+    '-created_at': ('-created_at', '-id'),
+    'created_at': ('created_at', 'id'),
+    'price_per_hour': ('price_per_hour', 'id'),
+    '-price_per_hour': ('-price_per_hour', '-id'),
+    'city': ('city', 'id'),
+}
 
 @staff_member_required
 def admin_dashboard(request):
@@ -58,13 +70,13 @@ def venue_directory(request):
     # Base queryset
     turfs = Turf.objects.select_related('owner', 'owner__owner_profile').prefetch_related('sports')
     
-    # Apply filters
+    # Apply filters: phone numbers by prefix, everything else via the search index
     if search:
-        turfs = turfs.filter(
-            Q(name__icontains=search) | 
-            Q(owner__phone_number__icontains=search) |
-            Q(city__icontains=search)
-        )
+        digits = search.strip().lstrip('+')
+        if digits.isdigit():
+            turfs = turfs.filter(owner__phone_number__startswith=search.strip())
+        else:
+            turfs = TurfSearchService.filter(turfs, search)
     
     if city_filter:
         turfs = turfs.filter(city=city_filter)
@@ -74,16 +86,16 @@ def venue_directory(request):
     elif status_filter == 'inactive':
         turfs = turfs.filter(is_active=False)
     
-    # Apply sorting
-    turfs = turfs.order_by(sort_by)
+    # Apply sorting (unknown sort keys fall back to newest first)
+    if sort_by not in VENUE_SORTS:
+        sort_by = '-created_at'
     
     # Get unique cities for filter dropdown
     cities = Turf.objects.values_list('city', flat=True).distinct().order_by('city')
     
-    # Pagination
-    paginator = Paginator(turfs, 20)  # 20 turfs per page
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Cursor pagination: deep pages cost the same as the first one
+    paginator = KeysetPaginator(turfs, VENUE_SORTS[sort_by], per_page=20)
+    page_obj = paginator.get_page(request.GET.get('cursor'))
     
     # Count pending approvals for sidebar
     pending_count = CustomUser.objects.filter(
@@ -158,11 +170,11 @@ def turf_owners_list(request):
     elif status_filter == 'pending':
         owners = owners.filter(is_owner_approved=False)
     
-    owners = owners.order_by('-owner_application_date')
+    # Owners without an application date sort by their signup date
+    owners = owners.annotate(applied_at=Coalesce('owner_application_date', 'date_joined'))
     
-    paginator = Paginator(owners, 20)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    paginator = KeysetPaginator(owners, ('-applied_at', '-id'), per_page=20)
+    page_obj = paginator.get_page(request.GET.get('cursor'))
     
     pending_count = CustomUser.objects.filter(
         is_turf_owner=True,
@@ -228,7 +240,7 @@ def approve_owner(request, user_id):
         owner.save()
         
         # Activate all their turfs
-        owner.turfs.all().update(is_active=True)
+        TurfVisibilityService.activate_owner_turfs(owner)
         
         messages.success(request, f'Successfully approved {owner.owner_profile.business_name}. Their turf is now live!')
         return redirect('admin:pending_approvals_list')
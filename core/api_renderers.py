@@ -0,0 +1,40 @@
+import re
+
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # Optional speed-up; the stdlib encoder is used without it
+    orjson = None
+
+# Floats orjson spells differently from json.dumps: exponents (1e-7 vs 1e-07,
+# 1e16 vs 1e+16) and small values in fixed notation (0.000015 vs 1.5e-05)
+_FLOAT_MISMATCH_RE = re.compile(rb'\de[-\d]|0\.0000')
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that encodes with orjson when it is installed.
+
+    Output is byte-identical to JSONRenderer's compact form: anything orjson would
+    spell differently (some floats, ASCII-only or indented output, values it
+    can't encode) goes through the stock encoder instead.
+    """
+    orjson_options = (
+        (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME) if orjson else 0
+    )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or not self.compact or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=self.orjson_options)
+        except (orjson.JSONEncodeError, TypeError, ValueError):
+            return super().render(data, accepted_media_type, renderer_context)
+        if _FLOAT_MISMATCH_RE.search(ret):
+            return super().render(data, accepted_media_type, renderer_context)
+        # Same escaping JSONRenderer applies for JavaScript compatibility
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
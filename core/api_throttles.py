@@ -0,0 +1,54 @@
+from rest_framework.throttling import BaseThrottle
+
+from core.utils.ratelimit import TokenBucket, client_ip
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    DRF throttle backed by core.utils.ratelimit. Subclasses set `scope` (a key of
+    settings.RATE_LIMITS) and implement get_key(request, view); None skips the check.
+    """
+    scope = None
+
+    def get_key(self, request, view):
+        raise NotImplementedError("Subclasses must implement get_key")
+
+    def allow_request(self, request, view):
+        allowed, self.wait_seconds = TokenBucket(self.scope).consume(self.get_key(request, view))
+        return allowed
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class IPThrottle(TokenBucketThrottle):
+    def get_key(self, request, view):
+        return client_ip(request)
+
+
+class UserThrottle(TokenBucketThrottle):
+    def get_key(self, request, view):
+        return request.user.pk if request.user and request.user.is_authenticated else None
+
+
+class PhoneNumberThrottle(TokenBucketThrottle):
+    """Keyed on the phone_number in the request body."""
+    def get_key(self, request, view):
+        data = request.data if hasattr(request.data, 'get') else {}
+        return str(data.get('phone_number') or '').strip() or None
+
+
+class OTPRequestPhoneThrottle(PhoneNumberThrottle):
+    scope = 'otp_request_phone'
+
+
+class OTPRequestIPThrottle(IPThrottle):
+    scope = 'otp_request_ip'
+
+
+class OTPVerifyPhoneThrottle(PhoneNumberThrottle):
+    scope = 'otp_verify_phone'
+
+
+class OTPVerifyIPThrottle(IPThrottle):
+    scope = 'otp_verify_ip'
@@ -1,21 +1,32 @@
 from rest_framework import views
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
-from turfs.models import Turf, SportType
+from turfs.autocomplete import TurfAutocomplete
+from core.services.versioning import VersionService, APP_CONFIG_KEY
+from core.utils.conditional import make_etag, not_modified_response, set_validators
 
 class AppConfigAPIView(views.APIView):
+    """
+    Static app bootstrap data. Supports conditional GET: clients polling with
+    If-None-Match / If-Modified-Since get 304 after a single version lookup.
+    """
     permission_classes = [AllowAny]
 
     def get(self, request):
-        cities = Turf.objects.filter(is_active=True).values_list('city', flat=True).distinct()
-        sports = SportType.objects.all().values('id', 'name', 'icon')
-        
-        return Response({
-            "cities": list(cities),
-            "sports": list(sports),
+        version, modified = VersionService.get(APP_CONFIG_KEY)
+        etag = make_etag('config', version, request.accepted_renderer.format)
+        not_modified = not_modified_response(request, etag, modified)
+        if not_modified is not None:
+            return not_modified
+
+        # Cities and sports come from the in-memory autocomplete index
+        response = Response({
+            "cities": TurfAutocomplete.cities(),
+            "sports": TurfAutocomplete.sports(),
             "amenities_options": ["Floodlights", "Water", "Parking", "Changing Room", "Locker"],
             "price_range": {
                 "min": 500,
                 "max": 5000
             }
         })
+        return set_validators(response, etag, modified)
@@ -0,0 +1,84 @@
+"""
+Django management command to benchmark the Google Maps link parser.
+
+Builds a corpus of links in every supported format plus links without usable
+coordinates (core/utils/maps_corpus.py) and compares the throughput of
+GoogleMapsParser.parse_coordinates with the previous urlparse/parse_qs +
+three-regex implementation. Correctness is covered by the corpus tests in
+core/tests.py, which use the same URL shapes.
+
+A real corpus can be supplied with --file: one link per line.
+
+Usage:
+    python manage.py benchmark_maps_parser
+    python manage.py benchmark_maps_parser --links 200000 --repeat 3
+    python manage.py benchmark_maps_parser --file links.txt
+"""
+
+import re
+import time
+from urllib.parse import urlparse, parse_qs
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.utils.geo import GoogleMapsParser
+from core.utils.maps_corpus import build_corpus
+
+_LEGACY_AT = re.compile(r'@(-?\d+\.\d+),(-?\d+\.\d+)')
+_LEGACY_BANG = re.compile(r'!3d(-?\d+\.\d+)!4d(-?\d+\.\d+)')
+
+
+def legacy_parse(url):
+    """The parser before the single-pass rewrite, kept as the baseline."""
+    params = parse_qs(urlparse(url).query)
+    if 'q' in params:
+        q_match = re.match(r'(-?\d+\.\d+),(-?\d+\.\d+)', params['q'][0])
+        if q_match:
+            return float(q_match.group(1)), float(q_match.group(2))
+    at_match = _LEGACY_AT.search(url)
+    if at_match:
+        return float(at_match.group(1)), float(at_match.group(2))
+    bang_match = _LEGACY_BANG.search(url)
+    if bang_match:
+        return float(bang_match.group(1)), float(bang_match.group(2))
+    return None, None
+
+
+def load_corpus(path):
+    with open(path, encoding='utf-8') as fh:
+        # Anything after a tab on a line is ignored
+        return [line.split('\t')[0].strip() for line in fh if line.strip()]
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks GoogleMapsParser.parse_coordinates against the previous parser'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--links', type=int, default=50000, help='Size of the generated corpus')
+        parser.add_argument('--file', help='Corpus file: one link per line')
+        parser.add_argument('--repeat', type=int, default=5, help='Timed runs per parser (best one is reported)')
+
+    def handle(self, *args, **options):
+        urls = load_corpus(options['file']) if options['file'] else build_corpus(options['links'])
+        if not urls:
+            raise CommandError('The corpus is empty.')
+
+        found = sum(1 for url in urls if GoogleMapsParser.parse_coordinates(url)[0] is not None)
+        legacy_found = sum(1 for url in urls if legacy_parse(url)[0] is not None)
+        self.stdout.write(f'{len(urls)} links. Coordinates found in {found} (previous parser: {legacy_found}).')
+
+        results = {}
+        for label, parse in (('previous', legacy_parse), ('single-pass', GoogleMapsParser.parse_coordinates)):
+            best = None
+            for _ in range(max(options['repeat'], 1)):
+                start = time.perf_counter()
+                for url in urls:
+                    parse(url)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            results[label] = best
+            self.stdout.write(f'  {label:<12} {len(urls) / best:>12,.0f} links/sec')
+
+        self.stdout.write(self.style.SUCCESS(
+            f"single-pass parser is {results['previous'] / results['single-pass']:.1f}x faster"
+        ))
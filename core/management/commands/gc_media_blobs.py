@@ -0,0 +1,31 @@
+"""
+Django management command to garbage-collect the content-addressed media storage.
+
+Recounts the references to every stored blob from TurfImage, TurfVideo and
+finalized uploads, fixes drifted ref counts and deletes blobs that have been
+unreferenced for longer than the grace period (core.services.media).
+
+Usage:
+    python manage.py gc_media_blobs --dry-run
+    python manage.py gc_media_blobs
+
+Recommended: Run this daily via cron or Celery Beat
+    30 3 * * * cd /path/to/project && python manage.py gc_media_blobs
+"""
+
+from django.core.management.base import BaseCommand
+from core.services.media import MediaBlobService
+
+
+class Command(BaseCommand):
+    help = 'Deletes unreferenced media blobs and repairs blob reference counts'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Report what would be deleted without deleting')
+
+    def handle(self, *args, **options):
+        deleted, freed, fixed = MediaBlobService.collect_garbage(dry_run=options['dry_run'])
+        verb = 'Would delete' if options['dry_run'] else 'Deleted'
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {deleted} blob(s), {freed / (1024 * 1024):.1f} MB. Fixed {fixed} reference count(s).'
+        ))
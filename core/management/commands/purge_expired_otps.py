@@ -0,0 +1,24 @@
+"""
+Django management command to delete expired login OTPs.
+
+A challenge row is removed when its code is verified or locked out; numbers that
+request a code and never come back leave their row behind. This deletes every
+row past its expiry (users.models.OTPChallenge, indexed on expires_at).
+
+Usage:
+    python manage.py purge_expired_otps
+
+Recommended: Run this hourly via cron or Celery Beat
+    15 * * * * cd /path/to/project && python manage.py purge_expired_otps
+"""
+
+from django.core.management.base import BaseCommand
+from core.services.otp import OTPService
+
+
+class Command(BaseCommand):
+    help = 'Deletes login OTP challenges that have expired'
+
+    def handle(self, *args, **options):
+        deleted = OTPService.purge_expired()
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} expired OTP challenge(s).'))
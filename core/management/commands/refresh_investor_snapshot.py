@@ -0,0 +1,34 @@
+"""
+Django management command to precompute the investor dashboard metrics.
+
+The investor dashboard serves the latest snapshot instead of running its
+revenue aggregates on every page load.
+
+Usage:
+    python manage.py refresh_investor_snapshot
+    python manage.py refresh_investor_snapshot --keep 100
+
+Recommended: Run this every 15 minutes via cron or Celery Beat
+    */15 * * * * cd /path/to/project && python manage.py refresh_investor_snapshot
+"""
+
+from django.core.management.base import BaseCommand
+from core.services.investor import InvestorMetricsService
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the investor dashboard snapshot'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--keep', type=int, default=50, help='Number of historical snapshots to retain')
+
+    def handle(self, *args, **options):
+        snapshot = InvestorMetricsService.build_snapshot()
+        pruned = InvestorMetricsService.prune_snapshots(keep=max(options['keep'], 1))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Stored investor snapshot #{snapshot.id} (schema v{snapshot.schema_version}) '
+                f'in {snapshot.duration_ms} ms. Pruned {pruned} old snapshot(s).'
+            )
+        )
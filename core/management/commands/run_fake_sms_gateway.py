@@ -0,0 +1,41 @@
+"""
+Django management command to run a local fake SMS gateway for development and
+load testing of OTP delivery (core/services/fake_sms_gateway.py).
+
+Usage:
+    python manage.py run_fake_sms_gateway --port 8025
+    python manage.py run_fake_sms_gateway --latency 0.3 --failure-rate 0.05
+
+Then, in settings:
+    SMS_PROVIDER = 'core.services.sms.HttpGatewaySMSProvider'
+    SMS_GATEWAY = {'URL': 'http://127.0.0.1:8025/messages'}
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from core.services.fake_sms_gateway import FakeSMSGateway
+
+
+class Command(BaseCommand):
+    help = 'Runs a local HTTP server that accepts SMS batches like a real gateway'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8025)
+        parser.add_argument('--latency', type=float, default=0.0, help='Seconds to wait before answering each batch')
+        parser.add_argument('--failure-rate', type=float, default=0.0, help='Share of messages reported as failed')
+        parser.add_argument('--error-rate', type=float, default=0.0, help='Share of batches answered with HTTP 503')
+
+    def handle(self, *args, **options):
+        gateway = FakeSMSGateway(
+            host=options['host'], port=options['port'], latency=options['latency'],
+            failure_rate=options['failure_rate'], error_rate=options['error_rate'], verbose=True
+        ).start()
+        self.stdout.write(self.style.SUCCESS(f'Fake SMS gateway listening on {gateway.url} (Ctrl+C to stop)'))
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            gateway.stop()
+            self.stdout.write(f'{len(gateway.messages)} message(s) in {gateway.batches} batch(es).')
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:13
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_adminactionlog'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InvestorSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('schema_version', models.PositiveIntegerField(help_text='Payload layout version, bumped when metric keys change')),
+                ('payload', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('computed_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('duration_ms', models.PositiveIntegerField(default=0, help_text='Time taken to compute the snapshot')),
+            ],
+            options={
+                'verbose_name': 'Investor Snapshot',
+                'verbose_name_plural': 'Investor Snapshots',
+                'ordering': ['-computed_at'],
+                'get_latest_by': 'computed_at',
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_mediablob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MapLinkResolution',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url_hash', models.CharField(help_text='SHA-256 of the short link', max_length=64, unique=True)),
+                ('url', models.TextField()),
+                ('status', models.CharField(choices=[('RESOLVED', 'Resolved'), ('NO_COORDINATES', 'No Coordinates In Link'), ('FAILED', 'Request Failed')], max_length=20)),
+                ('latitude', models.FloatField(blank=True, null=True)),
+                ('longitude', models.FloatField(blank=True, null=True)),
+                ('resolved_url', models.TextField(blank=True)),
+                ('error', models.CharField(blank=True, max_length=255)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('checked_at', models.DateTimeField()),
+                ('retry_after', models.DateTimeField(blank=True, help_text='Failures are not retried before this time', null=True)),
+            ],
+        ),
+    ]
@@ -1,6 +1,7 @@
 from django.db import models
 from decimal import Decimal
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 
 class PlatformSettings(models.Model):
     """
@@ -90,3 +91,80 @@ class AdminActionLog(models.Model):
     
     def __str__(self):
         return f"{self.admin_user} - {self.get_action_display()} at {self.timestamp}"
+
+
+class InvestorSnapshot(models.Model):
+    """
+    Precomputed investor dashboard metrics.
+    Written by the refresh_investor_snapshot command (or the dashboard's
+    "Refresh now" button) so the dashboard never aggregates on page load.
+    """
+    schema_version = models.PositiveIntegerField(help_text="Payload layout version, bumped when metric keys change")
+    payload = models.JSONField(encoder=DjangoJSONEncoder)
+    computed_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    duration_ms = models.PositiveIntegerField(default=0, help_text="Time taken to compute the snapshot")
+
+    class Meta:
+        ordering = ['-computed_at']
+        get_latest_by = 'computed_at'
+        verbose_name = "Investor Snapshot"
+        verbose_name_plural = "Investor Snapshots"
+
+    def __str__(self):
+        return f"Investor snapshot v{self.schema_version} at {self.computed_at}"
+
+
+class ChangeCounter(models.Model):
+    """
+    Monotonic version per cacheable entity (e.g. 'app_config', 'turf:12').
+    Bumped whenever the entity changes; drives ETags and cache keys.
+    """
+    key = models.CharField(max_length=100, unique=True)
+    version = models.PositiveBigIntegerField(default=1)
+    updated_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.key} v{self.version}"
+
+
+class MediaBlob(models.Model):
+    """
+    One stored file in the content-addressed media storage (core.storage).
+    ref_count is the number of TurfImage/TurfVideo rows pointing at it; blobs left
+    at zero are deleted by the gc_media_blobs command after a grace period.
+    """
+    name = models.CharField(max_length=500, unique=True, help_text="Storage path")
+    sha256 = models.CharField(max_length=64, db_index=True)
+    size = models.PositiveBigIntegerField()
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    released_at = models.DateTimeField(null=True, blank=True, help_text="When ref_count last dropped to zero")
+
+    def __str__(self):
+        return f"{self.name} ({self.ref_count} refs)"
+
+
+class MapLinkResolution(models.Model):
+    """
+    Cached result of expanding a Google Maps short link (core.services.maps).
+    Resolved coordinates are kept for good; failures are negative-cached until retry_after.
+    """
+    STATUS_CHOICES = [
+        ('RESOLVED', 'Resolved'),
+        ('NO_COORDINATES', 'No Coordinates In Link'),
+        ('FAILED', 'Request Failed'),
+    ]
+
+    url_hash = models.CharField(max_length=64, unique=True, help_text="SHA-256 of the short link")
+    url = models.TextField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES)
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    resolved_url = models.TextField(blank=True)
+    error = models.CharField(max_length=255, blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    checked_at = models.DateTimeField()
+    retry_after = models.DateTimeField(null=True, blank=True, help_text="Failures are not retried before this time")
+
+    def __str__(self):
+        return f"{self.url} ({self.get_status_display()})"
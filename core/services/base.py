@@ -1,12 +1,60 @@
-class BaseSMSProvider:
-    """Base interface for SMS providers."""
+class BaseProvider:
+    """
+    Lifecycle hooks for swappable providers. Instances are created once per
+    process by core.utils.providers: warm_up() runs after construction, close()
+    when the instance is discarded.
+    """
+    def warm_up(self):
+        pass
+
+    def close(self):
+        pass
+
+class BaseSMSProvider(BaseProvider):
+    """Base interface for SMS providers. The instance is shared process-wide, so it may hold connections."""
     def send_otp(self, phone_number, otp):
         raise NotImplementedError("Subclasses must implement send_otp")
 
-class BasePaymentProvider:
+    def send_batch(self, messages):
+        """
+        Sends [(phone_number, otp), ...]; returns one result per message: True when
+        sent, False for a failure worth retrying, or core.services.sms.REJECTED when
+        the gateway refused the message for good.
+        """
+        return [bool(self.send_otp(phone_number, otp)) for phone_number, otp in messages]
+
+    async def asend_batch(self, messages):
+        """Not natively async: runs send_batch() in a worker thread, for callers on an event loop."""
+        from asgiref.sync import sync_to_async
+        return await sync_to_async(self.send_batch, thread_sensitive=False)(messages)
+
+class BasePaymentProvider(BaseProvider):
     """Base interface for payment providers."""
     def create_order(self, amount, currency='INR', receipt=None):
         raise NotImplementedError("Subclasses must implement create_order")
     
     def verify_payment(self, payment_id, order_id, signature):
         raise NotImplementedError("Subclasses must implement verify_payment")
+
+    def charge(self, amount, currency='INR', receipt=None, customer=None):
+        """
+        Charges a saved payment method (recurring payments). Returns
+        {'id': ..., 'status': 'captured' | 'failed', 'error': ...}. `receipt` is an
+        idempotency key: charging the same receipt twice must not bill twice.
+        """
+        raise NotImplementedError("Subclasses must implement charge")
+
+    def charge_batch(self, charges):
+        """Charges [{'amount', 'currency', 'receipt', 'customer'}, ...]; returns one result per charge."""
+        return [self.charge(**charge) for charge in charges]
+
+class BaseMapLinkResolver(BaseProvider):
+    """Base interface for expanding Google Maps short links."""
+    def resolve(self, url):
+        """Returns the URL the short link redirects to; raises on network errors."""
+        raise NotImplementedError("Subclasses must implement resolve")
+
+class BaseOTPSink(BaseProvider):
+    """Base interface for OTP delivery channels (see core.services.otp)."""
+    def deliver(self, phone_number, otp):
+        raise NotImplementedError("Subclasses must implement deliver")
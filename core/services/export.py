@@ -0,0 +1,48 @@
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+EXPORT_CHUNK_SIZE = 2000
+
+CONTENT_TYPES = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+}
+
+
+class _Echo:
+    """File-like object whose write() hands the line back instead of buffering it."""
+    def write(self, value):
+        return value
+
+
+class ExportService:
+    @staticmethod
+    def csv_lines(columns, rows):
+        writer = csv.writer(_Echo())
+        yield writer.writerow([label for label, _ in columns])
+        for row in rows:
+            yield writer.writerow([row[key] for _, key in columns])
+
+    @staticmethod
+    def jsonl_lines(columns, rows):
+        encoder = DjangoJSONEncoder(separators=(',', ':'))
+        for row in rows:
+            yield encoder.encode({label: row[key] for label, key in columns}) + '\n'
+
+    @staticmethod
+    def streaming_response(basename, fmt, columns, rows):
+        """
+        Streams `rows` (an iterator of dicts) as CSV or JSON Lines.
+        `columns` is a list of (output label, row key) pairs.
+        """
+        if fmt not in CONTENT_TYPES:
+            fmt = 'csv'
+        lines = ExportService.jsonl_lines(columns, rows) if fmt == 'jsonl' else ExportService.csv_lines(columns, rows)
+        response = StreamingHttpResponse(lines, content_type=CONTENT_TYPES[fmt])
+        filename = f"{basename}_{timezone.now():%Y%m%d_%H%M}.{fmt}"
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
@@ -0,0 +1,80 @@
+"""
+Local stand-in for an SMS gateway, speaking the protocol of HttpGatewaySMSProvider.
+Run it with `python manage.py run_fake_sms_gateway`, or start one in-process:
+
+    gateway = FakeSMSGateway(latency=0.2, failure_rate=0.1).start()
+    settings.SMS_GATEWAY = {'URL': gateway.url}
+    ...
+    gateway.stop()
+"""
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeSMSGateway:
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0, failure_rate=0.0, error_rate=0.0, verbose=False):
+        """failure_rate: share of messages reported as failed; error_rate: share of batches answered with a 503."""
+        self.latency, self.failure_rate, self.error_rate, self.verbose = latency, failure_rate, error_rate, verbose
+        self.messages = []
+        self.batches = 0
+        self.connections = set()
+        self.lock = threading.Lock()
+        gateway = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # keep-alive
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+                with gateway.lock:
+                    gateway.batches += 1
+                    gateway.connections.add(self.client_address)
+                if gateway.latency:
+                    time.sleep(gateway.latency)
+                if random.random() < gateway.error_rate:
+                    return self.reply(503, {'error': 'unavailable'})
+                try:
+                    messages = json.loads(body)['messages']
+                except (ValueError, KeyError, TypeError):
+                    return self.reply(400, {'error': 'bad request'})
+                results = []
+                for message in messages:
+                    if random.random() < gateway.failure_rate:
+                        results.append({'status': 'failed', 'error': 'carrier unavailable'})
+                        continue
+                    results.append({'status': 'sent'})
+                    with gateway.lock:
+                        gateway.messages.append(message)
+                    if gateway.verbose:
+                        print(f"[fake-sms] {message['to']}: {message['text']}", flush=True)
+                self.reply(200, {'results': results})
+
+            def reply(self, status, payload):
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f'http://{host}:{port}/messages'
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, name='fake-sms-gateway', daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,155 @@
+import datetime
+import logging
+import threading
+import time
+from decimal import Decimal
+
+from django.db import connection
+from django.db.models import Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+logger = logging.getLogger('django')
+
+# Bump when the payload layout changes; older snapshots are then ignored.
+SNAPSHOT_SCHEMA_VERSION = 1
+
+# Payload keys holding Decimal amounts (stored as strings by DjangoJSONEncoder)
+MONEY_KEYS = ('total', 'commission', 'fees', 'subscriptions', 'ads', 'events')
+
+_refresh_lock = threading.Lock()
+
+
+class InvestorMetricsService:
+    @staticmethod
+    def get_month_earnings(start_date, end_date):
+        from bookings.models import Booking
+        from subscriptions.services import SubscriptionLedgerService
+        from ads.models import AdCampaign
+        from events.models import TournamentRegistration, Tournament
+
+        # Transactional Earnings
+        bookings = Booking.objects.filter(payment_status='SUCCESS', created_at__range=(start_date, end_date)).aggregate(
+            commission=Sum('platform_commission'),
+            fees=Sum('convenience_fee')
+        )
+        comm = bookings['commission'] or Decimal('0.00')
+        fees = bookings['fees'] or Decimal('0.00')
+
+        # Subscription Earnings (periods paid during the range, from the billing ledger)
+        sub_rev = SubscriptionLedgerService.revenue(start_date, end_date)
+
+        # Ad Revenue (Current month spend)
+        ad_rev = AdCampaign.objects.filter(created_at__range=(start_date, end_date)).aggregate(Sum('spent_amount'))['spent_amount__sum'] or Decimal('0.00')
+
+        # Event Revenue (Commissions + Listing)
+        event_listing = Tournament.objects.filter(is_paid_listing=True, created_at__range=(start_date, end_date)).aggregate(Sum('listing_fee'))['listing_fee__sum'] or Decimal('0.00')
+        event_reg = TournamentRegistration.objects.filter(payment_status='SUCCESS', registered_at__range=(start_date, end_date)).aggregate(Sum('platform_commission'))['platform_commission__sum'] or Decimal('0.00')
+
+        total = comm + fees + sub_rev + ad_rev + event_listing + event_reg
+        return {
+            'total': total,
+            'commission': comm,
+            'fees': fees,
+            'subscriptions': sub_rev,
+            'ads': ad_rev,
+            'events': event_listing + event_reg
+        }
+
+    @staticmethod
+    def compute_metrics(now=None):
+        """
+        Runs every aggregate behind the investor dashboard.
+        Returns a JSON-serializable dict (Decimals are encoded by the model field).
+        """
+        from bookings.models import Booking
+
+        now = now or timezone.now()
+        first_of_this_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        first_of_last_month = (first_of_this_month - datetime.timedelta(days=1)).replace(day=1)
+
+        this_month = InvestorMetricsService.get_month_earnings(first_of_this_month, now)
+        last_month = InvestorMetricsService.get_month_earnings(first_of_last_month, first_of_this_month)
+
+        # Calculate MoM Growth
+        growth_pct = Decimal('0')
+        if last_month['total'] > 0:
+            growth_pct = ((this_month['total'] - last_month['total']) / last_month['total']) * 100
+
+        # Growth History (only the last 6 months are charted)
+        history_start = first_of_this_month
+        for _ in range(5):
+            history_start = (history_start - datetime.timedelta(days=1)).replace(day=1)
+
+        history_raw = Booking.objects.filter(payment_status='SUCCESS', created_at__gte=history_start).annotate(
+            month=TruncMonth('created_at')
+        ).values('month').annotate(
+            rev=Sum('platform_commission') + Sum('convenience_fee')
+        ).order_by('month')
+
+        return {
+            'this_month': this_month,
+            'last_month': last_month,
+            'growth_pct': growth_pct,
+            'history_labels': [h['month'].strftime('%b %Y') for h in history_raw],
+            'history_values': [float(h['rev']) for h in history_raw],
+            'top_source': max(this_month, key=lambda k: this_month[k] if k != 'total' else 0),
+        }
+
+    @staticmethod
+    def build_snapshot():
+        """Computes the metrics and stores them as a new snapshot row."""
+        from core.models import InvestorSnapshot
+
+        started = time.monotonic()
+        payload = InvestorMetricsService.compute_metrics()
+        duration_ms = int((time.monotonic() - started) * 1000)
+        return InvestorSnapshot.objects.create(
+            schema_version=SNAPSHOT_SCHEMA_VERSION,
+            payload=payload,
+            duration_ms=duration_ms
+        )
+
+    @staticmethod
+    def get_latest_snapshot():
+        from core.models import InvestorSnapshot
+        return InvestorSnapshot.objects.filter(schema_version=SNAPSHOT_SCHEMA_VERSION).first()
+
+    @staticmethod
+    def load_payload(snapshot):
+        """Restores Decimal amounts so templates can compare and format them."""
+        payload = dict(snapshot.payload)
+        for period in ('this_month', 'last_month'):
+            payload[period] = {k: Decimal(v) if k in MONEY_KEYS else v for k, v in payload[period].items()}
+        payload['growth_pct'] = Decimal(payload['growth_pct'])
+        return payload
+
+    @staticmethod
+    def prune_snapshots(keep=50):
+        """Deletes all but the most recent `keep` snapshots."""
+        from core.models import InvestorSnapshot
+        stale_ids = list(InvestorSnapshot.objects.values_list('id', flat=True)[keep:])
+        if stale_ids:
+            InvestorSnapshot.objects.filter(id__in=stale_ids).delete()
+        return len(stale_ids)
+
+    @staticmethod
+    def refresh_async():
+        """
+        Recomputes the snapshot in a background thread.
+        Returns False if a refresh is already running in this process.
+        """
+        if not _refresh_lock.acquire(blocking=False):
+            return False
+
+        def _run():
+            try:
+                InvestorMetricsService.build_snapshot()
+            except Exception:
+                logger.exception("Investor snapshot refresh failed")
+            finally:
+                connection.close()
+                _refresh_lock.release()
+
+        threading.Thread(target=_run, name='investor-snapshot-refresh', daemon=True).start()
+        return True
@@ -0,0 +1,197 @@
+"""
+Google Maps short-link resolution.
+
+maps.app.goo.gl / goo.gl links carry no coordinates; the only way to get them is
+to follow the redirect, which can take seconds when Google is slow. Registration
+therefore never waits on the network: full links are parsed inline, short links
+are answered from the MapLinkResolution table when already known, and unknown
+ones are accepted with empty coordinates and resolved on a background pool, which
+then fills in the coordinates of every turf registered with that link.
+
+Results are cached in the database: coordinates forever, links that resolve to a
+place without coordinates for a day, and network failures with an exponential
+backoff. `python manage.py resolve_map_links` retries whatever is still missing
+(e.g. after a restart dropped the queue).
+
+The HTTP call is made by settings.MAPS_LINK_RESOLVER, so tests can point it at a stub.
+"""
+import hashlib
+import logging
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from core.services.base import BaseMapLinkResolver
+from core.utils.geo import GoogleMapsParser
+
+logger = logging.getLogger(__name__)
+
+NO_COORDINATES_RETRY = timedelta(hours=24)
+FAILURE_RETRY = timedelta(minutes=5)
+MAX_FAILURE_RETRY = timedelta(hours=6)
+
+# Outcomes of MapLinkService.locate
+RESOLVED = 'RESOLVED'
+PENDING = 'PENDING'
+INVALID = 'INVALID'
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='maps-link-resolver')
+_in_flight = set()
+_in_flight_lock = threading.Lock()
+
+
+class HttpRedirectResolver(BaseMapLinkResolver):
+    """Follows the short link's redirects with a HEAD request."""
+    # Google blocks default python user-agents, so we must spoof a browser.
+    USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+    def resolve(self, url):
+        request = urllib.request.Request(url, headers={'User-Agent': self.USER_AGENT}, method='HEAD')
+        timeout = getattr(settings, 'MAPS_RESOLVER_TIMEOUT', 5)
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return response.geturl()
+
+
+class MapLinkService:
+    @staticmethod
+    def url_hash(url):
+        return hashlib.sha256(url.strip().encode()).hexdigest()
+
+    @staticmethod
+    def lookup(url):
+        from core.models import MapLinkResolution
+        return MapLinkResolution.objects.filter(url_hash=MapLinkService.url_hash(url)).first()
+
+    @staticmethod
+    def locate(url):
+        """
+        Coordinates for a Maps link without touching the network.
+        Returns (latitude, longitude, outcome), outcome being RESOLVED, PENDING (short
+        link not resolved yet; queue it with resolve_async) or INVALID (no coordinates).
+        """
+        url = url.strip()
+        if not GoogleMapsParser.is_short_link(url):
+            lat, lon = GoogleMapsParser.parse_coordinates(url)
+            return lat, lon, (RESOLVED if lat is not None and lon is not None else INVALID)
+
+        cached = MapLinkService.lookup(url)
+        if cached is None or cached.status == 'FAILED':
+            # A network failure says nothing about the link itself
+            return None, None, PENDING
+        if cached.status == 'RESOLVED':
+            return cached.latitude, cached.longitude, RESOLVED
+        if cached.retry_after and cached.retry_after > timezone.now():
+            return None, None, INVALID
+        return None, None, PENDING
+
+    @staticmethod
+    def is_due(cached, now=None):
+        if cached is None:
+            return True
+        if cached.status == 'RESOLVED':
+            return False
+        return cached.retry_after is None or cached.retry_after <= (now or timezone.now())
+
+    @staticmethod
+    def fetch(url, resolver=None):
+        """
+        Follows the short link and parses the result. Network only, no database
+        access, so it is safe to run on many threads. Returns the outcome fields.
+        """
+        from core.utils import get_map_link_resolver
+        resolver = resolver or get_map_link_resolver()
+        try:
+            resolved_url = resolver.resolve(url)
+        except Exception as e:
+            logger.warning("Resolving Maps link %s failed: %s", url, e)
+            return {'status': 'FAILED', 'error': str(e)[:255]}
+        lat, lon = GoogleMapsParser.parse_coordinates(resolved_url)
+        if lat is None or lon is None:
+            return {'status': 'NO_COORDINATES', 'resolved_url': resolved_url}
+        return {'status': 'RESOLVED', 'resolved_url': resolved_url, 'latitude': lat, 'longitude': lon}
+
+    @staticmethod
+    def record(url, outcome, cached=None):
+        """Stores a fetch() outcome in the cache table, with its retry time. Returns the row."""
+        from core.models import MapLinkResolution
+        now = timezone.now()
+        attempts = (cached.attempts if cached else 0) + 1
+        values = {
+            'url': url, 'attempts': attempts, 'checked_at': now,
+            'latitude': None, 'longitude': None, 'resolved_url': '', 'error': '', 'retry_after': None,
+        }
+        values.update(outcome)
+        if values['status'] == 'FAILED':
+            values['retry_after'] = now + min(FAILURE_RETRY * 2 ** min(attempts - 1, 10), MAX_FAILURE_RETRY)
+        elif values['status'] == 'NO_COORDINATES':
+            values['retry_after'] = now + NO_COORDINATES_RETRY
+        row, _ = MapLinkResolution.objects.update_or_create(url_hash=MapLinkService.url_hash(url), defaults=values)
+        return row
+
+    @staticmethod
+    def resolve(url, force=False):
+        """
+        Resolves a short link (unless a cached result is still valid), stores the
+        outcome and copies coordinates to the turfs using the link. Returns the row.
+        """
+        url = url.strip()
+        cached = MapLinkService.lookup(url)
+        if not force and not MapLinkService.is_due(cached):
+            return cached
+
+        row = MapLinkService.record(url, MapLinkService.fetch(url), cached)
+        if row.status == 'RESOLVED':
+            MapLinkService.apply_to_turfs(url, row.latitude, row.longitude)
+        elif row.status == 'NO_COORDINATES' and (cached is None or cached.status != 'NO_COORDINATES'):
+            MapLinkService.report_missing(url)
+        return row
+
+    @staticmethod
+    def apply_to_turfs(url, latitude, longitude):
+        """Fills in coordinates for turfs registered with `url` that have none yet."""
+        from turfs.models import Turf
+        from core.services.versioning import VersionService, APP_CONFIG_KEY, turf_key
+        turf_ids = list(Turf.objects.filter(map_share_url=url, latitude__isnull=True).values_list('pk', flat=True))
+        if turf_ids:
+            Turf.objects.filter(pk__in=turf_ids).update(latitude=latitude, longitude=longitude)
+            VersionService.bump(APP_CONFIG_KEY, *[turf_key(pk) for pk in turf_ids])
+        return len(turf_ids)
+
+    @staticmethod
+    def report_missing(url):
+        """Leaves a note on turfs whose link turned out to have no coordinates."""
+        from turfs.models import Turf, TurfActivityLog
+        TurfActivityLog.objects.bulk_create([
+            TurfActivityLog(
+                turf_id=turf_id, event_type='INFO',
+                description="Location could not be detected from the Google Maps link. "
+                            "Drop a pin on the exact location and update the link."
+            )
+            for turf_id in Turf.objects.filter(map_share_url=url, latitude__isnull=True).values_list('pk', flat=True)
+        ])
+
+    @staticmethod
+    def resolve_async(url):
+        """Queues resolution on the background pool; a link already queued is not queued twice."""
+        url = url.strip()
+        with _in_flight_lock:
+            if url in _in_flight:
+                return
+            _in_flight.add(url)
+
+        def _run():
+            try:
+                MapLinkService.resolve(url)
+            except Exception:
+                logger.exception("Resolving Maps link %s failed", url)
+            finally:
+                with _in_flight_lock:
+                    _in_flight.discard(url)
+                connection.close()
+
+        _executor.submit(_run)
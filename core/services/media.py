@@ -0,0 +1,105 @@
+import os
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.db.models import Case, F, When
+from django.utils import timezone
+
+from core.storage import BLOB_NAME_RE, content_addressed_storage
+
+# Blobs are only collected once unreferenced for this long, so a file saved by an
+# upload whose TurfImage row hasn't been committed yet is never taken away.
+GC_GRACE_PERIOD = timedelta(hours=6)
+
+
+class MediaBlobService:
+    @staticmethod
+    def acquire(name):
+        from core.models import MediaBlob
+        if name:
+            MediaBlob.objects.filter(name=name).update(ref_count=F('ref_count') + 1, released_at=None)
+
+    @staticmethod
+    def release(name):
+        from core.models import MediaBlob
+        if name:
+            MediaBlob.objects.filter(name=name, ref_count__gt=0).update(
+                ref_count=F('ref_count') - 1,
+                released_at=Case(When(ref_count=1, then=timezone.now()), default=F('released_at'))
+            )
+
+    @staticmethod
+    def live_references():
+        """name -> number of rows using it, across every model that stores blob names."""
+        from collections import Counter
+        from turfs.models import TurfImage, TurfVideo, MediaUpload
+        refs = Counter()
+        refs.update(TurfImage.objects.values_list('image', flat=True).iterator())
+        refs.update(TurfVideo.objects.values_list('video', flat=True).iterator())
+        # Finalized uploads waiting to be attached to a turf
+        refs.update(MediaUpload.objects.filter(status='COMPLETE').values_list('stored_name', flat=True).iterator())
+        return refs
+
+    @staticmethod
+    def collect_garbage(dry_run=False, now=None):
+        """
+        Corrects drifted ref counts, then deletes blobs (rows and files) that have been
+        unreferenced for longer than the grace period, plus blob files with no row
+        (left behind by rolled-back transactions). Returns (blobs deleted, bytes freed, counts fixed).
+        """
+        from core.models import MediaBlob
+        now = now or timezone.now()
+        cutoff = now - GC_GRACE_PERIOD
+        storage = content_addressed_storage()
+        refs = MediaBlobService.live_references()
+
+        fixed = deleted = freed = 0
+        known = set()
+        for blob in MediaBlob.objects.all().iterator(chunk_size=1000):
+            known.add(blob.name)
+            actual = refs.get(blob.name, 0)
+            if actual != blob.ref_count:
+                fixed += 1
+                blob.released_at = None if actual else (blob.released_at or now)
+                if not dry_run:
+                    MediaBlob.objects.filter(pk=blob.pk).update(ref_count=actual, released_at=blob.released_at)
+            if actual == 0 and (blob.released_at or blob.created_at) < cutoff:
+                if dry_run:
+                    deleted += 1
+                    freed += blob.size
+                    continue
+                # Conditional delete: a save that just reused this blob resets released_at
+                removed, _ = MediaBlob.objects.filter(
+                    pk=blob.pk, ref_count=0, released_at=blob.released_at, created_at__lt=cutoff
+                ).delete()
+                if removed:
+                    storage.delete(blob.name)
+                    deleted += 1
+                    freed += blob.size
+
+        for name, size in MediaBlobService.untracked_files(known, refs, cutoff):
+            deleted += 1
+            freed += size
+            if not dry_run:
+                storage.delete(name)
+        return deleted, freed, fixed
+
+    @staticmethod
+    def untracked_files(known, refs, cutoff):
+        """Yields (name, size) of blob-named files older than `cutoff` with no MediaBlob row or reference."""
+        from turfs.models import TurfImage, TurfVideo
+        storage = content_addressed_storage()
+        for field in (TurfImage._meta.get_field('image'), TurfVideo._meta.get_field('video')):
+            root = storage.path(field.upload_to)
+            if not os.path.isdir(root):
+                continue
+            for directory, _, files in os.walk(root):
+                for filename in files:
+                    if not BLOB_NAME_RE.match(filename):
+                        continue
+                    path = os.path.join(directory, filename)
+                    name = os.path.relpath(path, storage.location).replace('\\', '/')
+                    if name in known or name in refs:
+                        continue
+                    stat = os.stat(path)
+                    if datetime.fromtimestamp(stat.st_mtime, tz=dt_timezone.utc) < cutoff:
+                        yield name, stat.st_size
@@ -0,0 +1,211 @@
+"""
+Login OTPs: storage, verification and delivery.
+
+Pending codes live in the cache under a TTL, with a durable copy in the
+OTPChallenge table that is read whenever the cache misses (eviction, restart,
+another process's local cache). Codes are stored as keyed hashes and compared in
+constant time; each code allows MAX_ATTEMPTS guesses and can be used once. The
+attempt count lives only in the database row, so the limit holds across
+processes. No user row is written until a code is verified. Rows of codes that
+were never verified are removed by `manage.py purge_expired_otps`.
+
+Issuing an OTP only stores it; sending it (SMS gateway, dev file, ...) happens
+on a background pool after the transaction commits, so a slow gateway never
+holds up the login request. Each entry of settings.OTP_DELIVERY_SINKS is a
+dotted path to a BaseOTPSink; a failing sink is logged and the others still run.
+"""
+import hashlib
+import hmac
+import logging
+import os
+import secrets
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from core.services.base import BaseOTPSink
+
+logger = logging.getLogger(__name__)
+
+OTP_TTL = timedelta(minutes=10)
+MAX_ATTEMPTS = 5
+# Code accepted for every number while DEBUG is on
+DEBUG_OTP = '123456'
+
+# Outcomes of OTPService.verify
+VERIFIED = 'VERIFIED'
+INVALID = 'INVALID'
+EXPIRED = 'EXPIRED'
+LOCKED = 'LOCKED'
+MISSING = 'MISSING'
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='otp-delivery')
+
+
+class SMSProviderSink(BaseOTPSink):
+    """Queues the OTP for the configured SMS_PROVIDER (batched, with retries; see core.services.sms)."""
+    def deliver(self, phone_number, otp):
+        from core.services.sms import sms_delivery_queue
+        sms_delivery_queue().enqueue(phone_number, otp)
+        return True
+
+
+class DevFileSink(BaseOTPSink):
+    """
+    Development only: writes the latest OTP to settings.OTP_DEV_FILE
+    (OTP_ACTUAL.txt in the project root by default).
+    """
+    _lock = threading.Lock()
+
+    def deliver(self, phone_number, otp):
+        path = getattr(settings, 'OTP_DEV_FILE', os.path.join(settings.BASE_DIR, 'OTP_ACTUAL.txt'))
+        with self._lock:
+            tmp = f'{path}.tmp'
+            with open(tmp, 'w') as f:
+                f.write(f"USER: {phone_number}\nOTP: {otp}\nTIME: {timezone.now()}\n")
+            os.replace(tmp, path)
+        return True
+
+
+class OTPDeliveryService:
+    @staticmethod
+    def sinks():
+        from core.utils.providers import providers
+        return providers.get_all('OTP_DELIVERY_SINKS')
+
+    @staticmethod
+    def deliver(phone_number, otp):
+        """Runs every sink; returns the number that succeeded."""
+        delivered = 0
+        for sink in OTPDeliveryService.sinks():
+            try:
+                if sink.deliver(phone_number, otp) is not False:
+                    delivered += 1
+            except Exception:
+                logger.exception("OTP delivery via %s failed", type(sink).__name__)
+        return delivered
+
+    @staticmethod
+    def deliver_async(phone_number, otp):
+        """Queues delivery once the current transaction (if any) commits."""
+        transaction.on_commit(lambda: _executor.submit(OTPDeliveryService.deliver, phone_number, otp))
+
+
+class OTPService:
+    @staticmethod
+    def _cache_key(phone_number):
+        return f'otp:{phone_number}'
+
+    @staticmethod
+    def hash_code(phone_number, code):
+        message = f'{phone_number}:{code}'.encode()
+        return hmac.new(settings.SECRET_KEY.encode(), message, hashlib.sha256).hexdigest()
+
+    @staticmethod
+    def generate_code():
+        # STATIC OTP FOR DEBUG MODE TO UNBLOCK USER
+        if settings.DEBUG:
+            return DEBUG_OTP
+        return f'{secrets.randbelow(1000000):06d}'
+
+    @staticmethod
+    def _cache_state(phone_number, code_hash, expires_at):
+        ttl = (expires_at - timezone.now()).total_seconds()
+        if ttl > 0:
+            cache.set(OTPService._cache_key(phone_number), {'code_hash': code_hash, 'expires_at': expires_at}, ttl)
+
+    @staticmethod
+    def issue(phone_number):
+        """Stores a new OTP for `phone_number` (replacing any pending one) and queues its delivery."""
+        from users.models import OTPChallenge
+        code = OTPService.generate_code()
+        now = timezone.now()
+        code_hash = OTPService.hash_code(phone_number, code)
+        expires_at = now + OTP_TTL
+        OTPChallenge.objects.update_or_create(
+            phone_number=phone_number,
+            defaults={'code_hash': code_hash, 'attempts': 0, 'expires_at': expires_at, 'created_at': now}
+        )
+        cache.delete(OTPService._cache_key(phone_number))
+        transaction.on_commit(lambda: OTPService._cache_state(phone_number, code_hash, expires_at))
+        OTPDeliveryService.deliver_async(phone_number, code)
+        return code
+
+    @staticmethod
+    def _load(phone_number):
+        state = cache.get(OTPService._cache_key(phone_number))
+        if state is not None:
+            return state
+        from users.models import OTPChallenge
+        row = OTPChallenge.objects.filter(phone_number=phone_number).first()
+        if row is None:
+            return None
+        OTPService._cache_state(phone_number, row.code_hash, row.expires_at)
+        return {'code_hash': row.code_hash, 'expires_at': row.expires_at}
+
+    @staticmethod
+    def _claim_attempt(phone_number):
+        """
+        Counts one guess in the database before it is checked. Returns False once
+        MAX_ATTEMPTS have been used, so concurrent guesses on any number of
+        processes can't exceed the limit.
+        """
+        from users.models import OTPChallenge
+        return OTPChallenge.objects.filter(
+            phone_number=phone_number, attempts__lt=MAX_ATTEMPTS
+        ).update(attempts=F('attempts') + 1) > 0
+
+    @staticmethod
+    def discard(phone_number):
+        from users.models import OTPChallenge
+        OTPChallenge.objects.filter(phone_number=phone_number).delete()
+        cache.delete(OTPService._cache_key(phone_number))
+
+    @staticmethod
+    def purge_expired(now=None):
+        """Deletes challenges that expired before `now`. Returns the number deleted."""
+        from users.models import OTPChallenge
+        deleted, _ = OTPChallenge.objects.filter(expires_at__lt=now or timezone.now()).delete()
+        return deleted
+
+    @staticmethod
+    def verify(phone_number, code):
+        """Checks `code` against the pending OTP. Returns VERIFIED, INVALID, EXPIRED, LOCKED or MISSING."""
+        from users.models import OTPChallenge
+        state = OTPService._load(phone_number)
+        if state is None:
+            return MISSING
+        if state['expires_at'] <= timezone.now():
+            OTPService.discard(phone_number)
+            return EXPIRED
+
+        if not OTPService._claim_attempt(phone_number):
+            OTPService.discard(phone_number)
+            return LOCKED
+
+        candidate = OTPService.hash_code(phone_number, code or '')
+        code_hash = state['code_hash']
+        if not hmac.compare_digest(candidate, code_hash):
+            row = OTPChallenge.objects.filter(phone_number=phone_number).first()
+            if row is None:
+                return MISSING
+            if row.code_hash != code_hash and row.expires_at > timezone.now():
+                # This process had cached a code that was since reissued elsewhere
+                code_hash = row.code_hash
+                OTPService._cache_state(phone_number, code_hash, row.expires_at)
+            if not hmac.compare_digest(candidate, code_hash):
+                if row.attempts >= MAX_ATTEMPTS:
+                    OTPService.discard(phone_number)
+                    return LOCKED
+                return INVALID
+
+        # Single use: only the request that removes the row gets in
+        deleted, _ = OTPChallenge.objects.filter(phone_number=phone_number, code_hash=code_hash).delete()
+        cache.delete(OTPService._cache_key(phone_number))
+        return VERIFIED if deleted else MISSING
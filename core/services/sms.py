@@ -1,5 +1,36 @@
+"""
+SMS providers and the OTP delivery queue.
+
+Request code never talks to the SMS gateway. OTPs are put on SMSDeliveryQueue,
+whose worker thread groups whatever arrives within BATCH_WINDOW into one
+send_batch() call on the process-wide provider instance and retries transient
+failures with backoff; rejected messages are given up straight away.
+HttpGatewaySMSProvider keeps its HTTP connections open between batches. For
+local testing run `python manage.py run_fake_sms_gateway` and point
+settings.SMS_GATEWAY at it.
+"""
+import http.client
+import json
+import logging
+import queue
+import threading
+import time
+from urllib.parse import urlsplit
+
+from django.conf import settings
+
+from core.utils import get_sms_provider
 from .base import BaseSMSProvider
-import random
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 50
+BATCH_WINDOW = 0.05   # seconds to wait for more messages before sending a batch
+MAX_ATTEMPTS = 4
+RETRY_BACKOFF = 1.0   # seconds, doubled per attempt
+
+# send_batch() result for a message the gateway refused for good (bad number, bad auth)
+REJECTED = 'rejected'
 
 class ConsoleSMSProvider(BaseSMSProvider):
     """A provider that 'sends' SMS by printing to the console."""
@@ -15,3 +46,195 @@ class MockSMSProvider(BaseSMSProvider):
     """A mock provider that always succeeds without printing."""
     def send_otp(self, phone_number, otp):
         return True
+
+
+class GatewayError(Exception):
+    """The gateway could not take the batch (network error or 5xx); worth retrying."""
+
+
+class HttpConnectionPool:
+    """Keep-alive HTTP(S) connections to one host, reused across requests and threads."""
+
+    def __init__(self, url, size=4, timeout=5):
+        parts = urlsplit(url)
+        self.connection_class = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+        self.host, self.port = parts.hostname, parts.port
+        self.timeout = timeout
+        self.idle = queue.LifoQueue(maxsize=size)
+        self.opened = 0
+
+    def _connection(self):
+        try:
+            return self.idle.get_nowait()
+        except queue.Empty:
+            self.opened += 1
+            return self.connection_class(self.host, self.port, timeout=self.timeout)
+
+    def request(self, method, path, body=None, headers=None):
+        """Returns (status, body bytes). A connection the server closed while idle is retried once."""
+        for attempt in (1, 2):
+            conn = self._connection()
+            try:
+                conn.request(method, path, body=body, headers=headers or {})
+                response = conn.getresponse()
+                data = response.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                conn.close()
+                if attempt == 2:
+                    raise
+                continue
+            except Exception:
+                conn.close()
+                raise
+            if response.will_close:
+                conn.close()
+            else:
+                try:
+                    self.idle.put_nowait(conn)
+                except queue.Full:
+                    conn.close()
+            return response.status, data
+
+    def close(self):
+        while True:
+            try:
+                self.idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class HttpGatewaySMSProvider(BaseSMSProvider):
+    """
+    Sends batches as JSON to settings.SMS_GATEWAY['URL']:
+        POST {"messages": [{"to": "...", "text": "..."}]}
+        200  {"results": [{"status": "sent"} | {"status": "failed" | "rejected", "error": "..."}]}
+    "failed" is transient and retried; "rejected" and 4xx responses are permanent.
+    """
+    MESSAGE = "{otp} is your TurfSpot login code. It expires in 10 minutes."
+
+    def __init__(self):
+        config = getattr(settings, 'SMS_GATEWAY', {})
+        self.url = config['URL']
+        self.path = urlsplit(self.url).path or '/'
+        self.headers = {'Content-Type': 'application/json'}
+        if config.get('API_KEY'):
+            self.headers['Authorization'] = f"Bearer {config['API_KEY']}"
+        self.pool = HttpConnectionPool(self.url, size=config.get('POOL_SIZE', 4), timeout=config.get('TIMEOUT', 5))
+
+    def close(self):
+        self.pool.close()
+
+    def send_otp(self, phone_number, otp):
+        return self.send_batch([(phone_number, otp)])[0] is True
+
+    def send_batch(self, messages):
+        body = json.dumps({
+            'messages': [{'to': phone_number, 'text': self.MESSAGE.format(otp=otp)} for phone_number, otp in messages]
+        })
+        try:
+            status, data = self.pool.request('POST', self.path, body=body, headers=self.headers)
+        except OSError as e:
+            raise GatewayError(str(e)) from e
+        if status >= 500:
+            raise GatewayError(f"Gateway returned HTTP {status}")
+        if status >= 300:
+            logger.error("SMS gateway rejected a batch of %d: HTTP %s %s", len(messages), status, data[:200])
+            return [REJECTED] * len(messages)
+        try:
+            results = json.loads(data).get('results', [])
+        except (ValueError, AttributeError) as e:
+            raise GatewayError(f"Unreadable gateway response: {data[:200]!r}") from e
+        return [self._result(results[i] if i < len(results) else {}) for i in range(len(messages))]
+
+    @staticmethod
+    def _result(result):
+        status = result.get('status')
+        if status == 'sent':
+            return True
+        return REJECTED if status == REJECTED else False
+
+
+class SMSDeliveryQueue:
+    """In-process queue drained by one worker thread that sends in batches and retries failures."""
+
+    def __init__(self):
+        self.pending = queue.Queue()
+        self.sent = self.failed = self.batches = 0
+        self.outstanding = 0
+        self.lock = threading.Lock()
+        self.worker = threading.Thread(target=self._run, name='sms-delivery', daemon=True)
+        self.worker.start()
+
+    def enqueue(self, phone_number, otp, attempt=1):
+        if attempt == 1:
+            with self.lock:
+                self.outstanding += 1
+        self.pending.put((phone_number, otp, attempt))
+
+    def _done(self, ok):
+        with self.lock:
+            self.outstanding -= 1
+            if ok:
+                self.sent += 1
+            else:
+                self.failed += 1
+
+    def _next_batch(self):
+        batch = [self.pending.get()]
+        deadline = time.monotonic() + BATCH_WINDOW
+        while len(batch) < BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self.pending.get(timeout=remaining) if remaining > 0 else self.pending.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            try:
+                results = get_sms_provider().send_batch([(phone, otp) for phone, otp, _ in batch])
+            except GatewayError as e:
+                logger.warning("Sending %d SMS failed: %s", len(batch), e)
+                results = [False] * len(batch)
+            except Exception:
+                logger.exception("Sending %d SMS failed", len(batch))
+                results = [REJECTED] * len(batch)
+            self.batches += 1
+            for (phone, otp, attempt), ok in zip(batch, results):
+                if ok is True:
+                    self._done(True)
+                elif ok == REJECTED:
+                    self._done(False)
+                    logger.error("OTP SMS to %s was rejected", phone)
+                elif attempt < MAX_ATTEMPTS:
+                    retry = threading.Timer(RETRY_BACKOFF * 2 ** (attempt - 1), self.enqueue, (phone, otp, attempt + 1))
+                    retry.daemon = True
+                    retry.start()
+                else:
+                    self._done(False)
+                    logger.error("Giving up on OTP SMS to %s after %d attempts", phone, attempt)
+
+    def drain(self, timeout=10):
+        """Waits until every queued message is sent or given up (for commands and tests). Returns True if so."""
+        deadline = time.monotonic() + timeout
+        while self.outstanding:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def sms_delivery_queue():
+    """The process-wide delivery queue; it sends through get_sms_provider()."""
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = SMSDeliveryQueue()
+    return _queue
@@ -0,0 +1,58 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+# Versions are cached briefly; with a per-process cache a bump made by another
+# worker becomes visible here after at most this many seconds.
+VERSION_CACHE_TTL = 10
+
+APP_CONFIG_KEY = 'app_config'
+
+
+def turf_key(turf_id):
+    return f'turf:{turf_id}'
+
+
+def user_claims_key(user_id):
+    """Bumped when the user's JWT claims go stale; tokens carrying an older version are rejected."""
+    return f'user_claims:{user_id}'
+
+
+class VersionService:
+    @staticmethod
+    def _cache_key(key):
+        return f'version:{key}'
+
+    @staticmethod
+    def get(key, create=True):
+        """
+        Returns (version, updated_at) for `key`.
+        Missing counters start at version 1, or return None when create=False.
+        """
+        from core.models import ChangeCounter
+        cached = cache.get(VersionService._cache_key(key))
+        if cached is not None:
+            return cached
+        if create:
+            counter, _ = ChangeCounter.objects.get_or_create(key=key, defaults={'updated_at': timezone.now()})
+        else:
+            counter = ChangeCounter.objects.filter(key=key).first()
+            if counter is None:
+                return None
+        value = (counter.version, counter.updated_at)
+        cache.set(VersionService._cache_key(key), value, VERSION_CACHE_TTL)
+        return value
+
+    @staticmethod
+    def bump(*keys):
+        """
+        Increments the counters for `keys`. Counters nobody has read yet don't exist
+        and need no bump. Cached copies are dropped once the transaction commits.
+        """
+        from core.models import ChangeCounter
+        if not keys:
+            return
+        ChangeCounter.objects.filter(key__in=keys).update(version=F('version') + 1, updated_at=timezone.now())
+        cache_keys = [VersionService._cache_key(k) for k in keys]
+        transaction.on_commit(lambda: cache.delete_many(cache_keys))
@@ -0,0 +1,69 @@
+"""
+Content-addressed media storage.
+
+Files are stored under their SHA-256: saving turf_images/IMG_2041.JPG writes
+turf_images/3f/3fa9...c1.jpg. Saving identical bytes again (the same photo
+re-uploaded from the owner form, the image manager or the partner API) finds the
+existing blob and returns its name without writing anything. Each blob has a
+MediaBlob row whose ref_count tracks the TurfImage/TurfVideo rows using it;
+`python manage.py gc_media_blobs` deletes blobs nothing references any more.
+"""
+import hashlib
+import os
+import re
+
+from django.core.files.storage import FileSystemStorage
+from django.utils import timezone
+
+HASH_CHUNK_SIZE = 64 * 1024
+BLOB_NAME_RE = re.compile(r'^[0-9a-f]{64}(\.[0-9a-z]+)?$')
+
+
+def blob_name(directory, digest, extension):
+    return os.path.join(directory, digest[:2], digest + extension.lower()).replace('\\', '/')
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """FileSystemStorage that names files by content hash and stores each distinct file once."""
+
+    @staticmethod
+    def hash_content(content):
+        digest = hashlib.sha256()
+        size = 0
+        if hasattr(content, 'seek'):
+            content.seek(0)
+        for chunk in content.chunks(chunk_size=HASH_CHUNK_SIZE):
+            if isinstance(chunk, str):
+                chunk = chunk.encode()
+            digest.update(chunk)
+            size += len(chunk)
+        if hasattr(content, 'seek'):
+            content.seek(0)
+        return digest.hexdigest(), size
+
+    def _save(self, name, content):
+        from core.models import MediaBlob
+
+        digest, size = self.hash_content(content)
+        directory, filename = os.path.split(name)
+        target = blob_name(directory, digest, os.path.splitext(filename)[1])
+        if not self.exists(target):
+            # A concurrent save of the same bytes may win the race; the loser gets a
+            # suffixed copy, which is still a valid (if redundant) blob.
+            target = super()._save(target, content)
+        blob, created = MediaBlob.objects.get_or_create(name=target, defaults={'sha256': digest, 'size': size})
+        if not created and blob.ref_count == 0:
+            # Restart the garbage-collection grace period for a blob about to be reused
+            MediaBlob.objects.filter(pk=blob.pk).update(released_at=timezone.now())
+        return target
+
+
+_storage = None
+
+
+def content_addressed_storage():
+    """Storage for TurfImage.image / TurfVideo.video, created on first use."""
+    global _storage
+    if _storage is None:
+        _storage = ContentAddressedStorage()
+    return _storage
@@ -1,3 +1,218 @@
-from django.test import TestCase
+import random
+import threading
+import time
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from core.models import MapLinkResolution
+from core.services.base import BaseMapLinkResolver
+from core.services.maps import MapLinkService, HttpRedirectResolver, FAILURE_RETRY, PENDING, RESOLVED
+from core.utils.geo import GoogleMapsParser
+from core.utils.ratelimit import TokenBucket
+from core.utils.maps_corpus import URL_SHAPES, NO_COORDINATES, coordinate
+
+
+class GoogleMapsParserTests(SimpleTestCase):
+    """Corpus-driven checks of GoogleMapsParser.parse_coordinates (timing: benchmark_maps_parser)."""
+    LINKS_PER_SHAPE = 500
+
+    def test_each_url_shape(self):
+        rng = random.Random(7)
+        for shape, template in URL_SHAPES.items():
+            with self.subTest(shape=shape):
+                for _ in range(self.LINKS_PER_SHAPE):
+                    lat, lon = coordinate(rng, 89.9), coordinate(rng, 179.9)
+                    url = template(lat, lon, rng)
+                    self.assertEqual(GoogleMapsParser.parse_coordinates(url), (float(lat), float(lon)), url)
+
+    def test_links_without_coordinates(self):
+        for case, url in NO_COORDINATES.items():
+            with self.subTest(case=case):
+                self.assertEqual(GoogleMapsParser.parse_coordinates(url), (None, None))
+
+    def test_explicit_query_beats_pin_and_viewport(self):
+        url = (
+            'https://www.google.com/maps/place/Turf/@12.9,77.5,17z'
+            '/data=!3d12.95!4d77.55?q=12.97,77.59'
+        )
+        self.assertEqual(GoogleMapsParser.parse_coordinates(url), (12.97, 77.59))
+
+    def test_out_of_range_match_falls_back_to_next_format(self):
+        url = 'https://www.google.com/maps/place/Turf/@12.9,77.5,17z/data=!3d95.0!4d77.55'
+        self.assertEqual(GoogleMapsParser.parse_coordinates(url), (12.9, 77.5))
+
+
+class StubResolver(BaseMapLinkResolver):
+    """Answers from `redirects` (url -> final url, or an exception to raise) and records every call."""
+    redirects = {}
+    calls = []
+
+    def resolve(self, url):
+        StubResolver.calls.append(url)
+        result = StubResolver.redirects[url]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+@override_settings(MAPS_LINK_RESOLVER='core.tests.StubResolver')
+class MapLinkServiceTests(TestCase):
+    SHORT_LINK = 'https://maps.app.goo.gl/AbCdEf123'
+
+    def setUp(self):
+        StubResolver.redirects = {}
+        StubResolver.calls = []
+
+    def test_redirect_fills_in_turf_coordinates(self):
+        from turfs.models import Turf
+        from users.models import CustomUser
+        owner = CustomUser.objects.create_user('+910000000002', is_turf_owner=True)
+        turf = Turf.objects.create(
+            owner=owner, name='Green Arena', description='', address='1 Main Road', city='Chennai',
+            price_per_hour='1000', map_share_url=self.SHORT_LINK,
+        )
+        StubResolver.redirects[self.SHORT_LINK] = 'https://www.google.com/maps/place/Green+Arena/@12.97,77.59,17z'
+
+        row = MapLinkService.resolve(self.SHORT_LINK)
+
+        self.assertEqual((row.status, row.latitude, row.longitude), ('RESOLVED', 12.97, 77.59))
+        turf.refresh_from_db()
+        self.assertEqual((turf.latitude, turf.longitude), (12.97, 77.59))
+        self.assertEqual(MapLinkService.locate(self.SHORT_LINK), (12.97, 77.59, RESOLVED))
+
+    def test_resolved_link_is_not_fetched_again(self):
+        StubResolver.redirects[self.SHORT_LINK] = 'https://www.google.com/maps/@12.97,77.59,17z'
+        MapLinkService.resolve(self.SHORT_LINK)
+        row = MapLinkService.resolve(self.SHORT_LINK)
+        self.assertEqual(row.status, 'RESOLVED')
+        self.assertEqual(StubResolver.calls, [self.SHORT_LINK])
+
+    def test_failure_is_cached_until_retry_after(self):
+        StubResolver.redirects[self.SHORT_LINK] = TimeoutError('timed out')
+
+        row = MapLinkService.resolve(self.SHORT_LINK)
+        self.assertEqual((row.status, row.attempts), ('FAILED', 1))
+        self.assertIn('timed out', row.error)
+        self.assertGreater(row.retry_after, timezone.now())
+        # A network failure says nothing about the link, so registration keeps treating it as pending
+        self.assertEqual(MapLinkService.locate(self.SHORT_LINK), (None, None, PENDING))
+
+        # Within the backoff the cached failure is returned without a request
+        self.assertEqual(MapLinkService.resolve(self.SHORT_LINK).pk, row.pk)
+        self.assertEqual(len(StubResolver.calls), 1)
+
+        # Once it is due, the retry succeeds
+        MapLinkResolution.objects.filter(pk=row.pk).update(retry_after=timezone.now() - timedelta(seconds=1))
+        StubResolver.redirects[self.SHORT_LINK] = 'https://www.google.com/maps/@12.97,77.59,17z'
+        row = MapLinkService.resolve(self.SHORT_LINK)
+        self.assertEqual((row.status, row.attempts, row.retry_after), ('RESOLVED', 2, None))
+        self.assertEqual(len(StubResolver.calls), 2)
+
+    def test_repeated_failures_back_off(self):
+        StubResolver.redirects[self.SHORT_LINK] = ConnectionResetError('reset')
+        first = MapLinkService.resolve(self.SHORT_LINK)
+        second = MapLinkService.resolve(self.SHORT_LINK, force=True)
+        self.assertAlmostEqual(
+            (second.retry_after - second.checked_at).total_seconds(), (FAILURE_RETRY * 2).total_seconds(), delta=1
+        )
+        self.assertEqual((first.attempts, second.attempts), (1, 2))
+
+    def test_link_without_coordinates_is_cached(self):
+        StubResolver.redirects[self.SHORT_LINK] = 'https://www.google.com/maps/place/Green+Arena+Turf'
+        row = MapLinkService.resolve(self.SHORT_LINK)
+        self.assertEqual(row.status, 'NO_COORDINATES')
+        self.assertGreater(row.retry_after, timezone.now())
+        MapLinkService.resolve(self.SHORT_LINK)
+        self.assertEqual(len(StubResolver.calls), 1)
+
+
+class HttpRedirectResolverTests(SimpleTestCase):
+    """HttpRedirectResolver against a local server standing in for the short-link host."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_HEAD(self):
+                if self.path == '/slow':
+                    time.sleep(0.5)
+                if self.path in ('/short', '/slow'):
+                    self.send_response(302)
+                    self.send_header('Location', f'{cls.base_url}/maps/@12.97,77.59,17z')
+                else:
+                    self.send_response(200)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            # urllib follows the redirect with a GET
+            do_GET = do_HEAD
+
+            def log_message(self, *args):
+                pass
+
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        cls.server.daemon_threads = True
+        cls.base_url = f'http://127.0.0.1:{cls.server.server_address[1]}'
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def test_follows_redirect(self):
+        url = HttpRedirectResolver().resolve(f'{self.base_url}/short')
+        self.assertEqual(url, f'{self.base_url}/maps/@12.97,77.59,17z')
+        self.assertEqual(GoogleMapsParser.parse_coordinates(url), (12.97, 77.59))
+
+    @override_settings(MAPS_RESOLVER_TIMEOUT=0.1)
+    def test_times_out(self):
+        with self.assertRaises(TimeoutError):
+            HttpRedirectResolver().resolve(f'{self.base_url}/slow')
+
+
+class TokenBucketTests(SimpleTestCase):
+    NOW = 1_699_999_800.0  # the start of a 600 s window
+
+    def setUp(self):
+        cache.clear()
+        self.bucket = TokenBucket('test', '3/10m')
+
+    def test_burst_then_refused_until_room_frees_up(self):
+        self.assertEqual([self.bucket.consume('k', now=self.NOW)[0] for _ in range(3)], [True] * 3)
+        allowed, wait = self.bucket.consume('k', now=self.NOW + 10)
+        self.assertFalse(allowed)
+        self.assertGreater(wait, 0)
+        # Refused requests don't count against the key
+        self.assertEqual(self.bucket.consume('k', now=self.NOW + 10), (False, wait))
+        self.assertFalse(self.bucket.consume('k', now=self.NOW + 10 + wait - 1)[0])
+        self.assertTrue(self.bucket.consume('k', now=self.NOW + 10 + wait)[0])
+
+    def test_keys_are_independent(self):
+        for _ in range(3):
+            self.bucket.consume('a', now=self.NOW)
+        self.assertFalse(self.bucket.consume('a', now=self.NOW)[0])
+        self.assertTrue(self.bucket.consume('b', now=self.NOW)[0])
+
+    def test_concurrent_requests_never_exceed_capacity(self):
+        bucket = TokenBucket('test', '50/m')
+        results = []
+        lock = threading.Lock()
+
+        def hit():
+            allowed, _ = bucket.consume('k', now=self.NOW)
+            with lock:
+                results.append(allowed)
+
+        threads = [threading.Thread(target=hit) for _ in range(200)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results.count(True), 50)
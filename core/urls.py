@@ -7,8 +7,10 @@ urlpatterns = [
     path('', views.home, name='home'),
     path('platform-admin/', views.platform_admin_dashboard, name='platform_admin'),
     path('platform-admin/investor-insights/', views.investor_dashboard, name='investor_insights'),
+    path('platform-admin/investor-insights/refresh/', views.refresh_investor_snapshot, name='refresh_investor_insights'),
     path('platform-admin/users/', views.admin_user_list, name='admin_users'),
     path('platform-admin/revenue/', views.admin_revenue_list, name='admin_revenue'),
+    path('platform-admin/revenue/export/', views.admin_revenue_export, name='admin_revenue_export'),
     path('platform-admin/turfs/', views.admin_turf_list, name='admin_turfs'),
     path('platform-admin/pending-owners/', views.admin_pending_owners, name='admin_pending_owners'),
     path('platform-admin/review-application/<int:user_id>/', views.review_owner_application, name='review_application'),
@@ -19,4 +21,5 @@ urlpatterns = [
     path('platform-admin/turfs/<int:turf_id>/review/', views.admin_turf_review, name='admin_turf_review'),
     path('platform-admin/turfs/<int:turf_id>/hide/', views.hide_turf, name='hide_turf'),
     path('platform-admin/bookings/', views.admin_booking_list, name='admin_bookings'),
+    path('platform-admin/bookings/export/', views.admin_booking_export, name='admin_bookings_export'),
 ]
@@ -1,10 +1,13 @@
-from django.conf import settings
-from django.utils.module_loading import import_string
+from core.utils.providers import providers
 
 def get_sms_provider():
-    """Returns an instance of the configured SMS provider."""
-    return import_string(settings.SMS_PROVIDER)()
+    """Returns the process-wide instance of the configured SMS provider."""
+    return providers.get('SMS_PROVIDER')
 
 def get_payment_provider():
-    """Returns an instance of the configured Payment provider."""
-    return import_string(settings.PAYMENT_PROVIDER)()
+    """Returns the process-wide instance of the configured Payment provider."""
+    return providers.get('PAYMENT_PROVIDER')
+
+def get_map_link_resolver():
+    """Returns the process-wide instance of the configured Maps short-link resolver."""
+    return providers.get('MAPS_LINK_RESOLVER')
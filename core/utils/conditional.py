@@ -0,0 +1,30 @@
+import zlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+def make_etag(*parts):
+    return '"%s"' % '-'.join(str(p) for p in parts)
+
+
+def request_variant(request):
+    """Short hash of the host and query string, for responses that embed absolute URLs or params."""
+    raw = f"{request.get_host()}?{request.META.get('QUERY_STRING', '')}"
+    return format(zlib.crc32(raw.encode()), '08x')
+
+
+def set_validators(response, etag, last_modified):
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified.timestamp())
+    # Clients may store the payload but must revalidate before reuse
+    response['Cache-Control'] = 'no-cache'
+    return response
+
+
+def not_modified_response(request, etag, last_modified):
+    """Returns a 304 response when the client's validators still match, else None."""
+    response = get_conditional_response(request, etag=etag, last_modified=int(last_modified.timestamp()))
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
@@ -1,68 +1,81 @@
 import re
-import urllib.request
-from urllib.parse import urlparse, parse_qs
+
+_NUMBER = r'(-?\d{1,3}\.\d+)'
+# "12.97,77.59", "12.97, 77.59", "12.97%2C+77.59"
+_SEPARATOR = r'(?:,|%2[Cc])(?:\+|%20|\s)*'
+
+# Every supported format in one pattern, each alternative capturing (lat, lon).
+# Alternatives are listed best first; m.lastindex // 2 - 1 is the rank of a match.
+_COORDINATES = re.compile(
+    # 0: explicit query parameters (?q=, &ll=, ?query= from Maps URLs API, ...)
+    r'[?&](?:q|ll|sll|query|center|destination|daddr)=(?:loc:|loc%3[Aa])?(?:\+|%20)*'
+    + _NUMBER + _SEPARATOR + _NUMBER
+    # 1: place pin in the data blob (!3dLAT!4dLON)
+    + r'|!3d' + _NUMBER + r'!4d' + _NUMBER
+    # 2: coordinates as the place / search path (/maps/place/12.97,77.59)
+    + r'|/(?:place|search)/(?:\+|%20)*' + _NUMBER + _SEPARATOR + _NUMBER
+    # 3: map viewport centre (@LAT,LON,17z)
+    + r'|@' + _NUMBER + ',' + _NUMBER
+)
+_BEST_RANK = 0
+
 
 class GoogleMapsParser:
     """
     Utility class to extract latitude and longitude from various Google Maps URL formats.
     Works without paid APIs by parsing URL patterns and following redirects.
     """
-    
-    # Pattern for @lat,lon (Common in full Google Maps URLs)
-    COORD_PATTERN_AT = re.compile(r'@(-?\d+\.\d+),(-?\d+\.\d+)')
-    
-    # Pattern for !3dLAT!4dLON (Found in some Google Maps internal state URLs)
-    COORD_PATTERN_BANG = re.compile(r'!3d(-?\d+\.\d+)!4d(-?\d+\.\d+)')
+
+    SHORT_LINK_DOMAINS = ('goo.gl', 'maps.app.goo.gl')
+
+    @staticmethod
+    def is_short_link(url):
+        """Short links carry no coordinates; they must be resolved (see core.services.maps)."""
+        return bool(url) and any(domain in url for domain in GoogleMapsParser.SHORT_LINK_DOMAINS)
+
+    @staticmethod
+    def parse_coordinates(url):
+        """
+        Parses coordinates out of a full Google Maps URL without any network access,
+        in a single scan of the string. When a link carries several, an explicit
+        query (q=, ll=, query=) wins over the place pin (!3d!4d), which wins over a
+        /place/LAT,LON path, which wins over the viewport centre (@).
+        Returns (latitude, longitude) or (None, None)
+        """
+        if not url:
+            return None, None
+
+        best_rank = best = None
+        for match in _COORDINATES.finditer(url):
+            rank = match.lastindex // 2 - 1
+            if best_rank is not None and rank >= best_rank:
+                continue
+            lat = float(match.group(match.lastindex - 1))
+            lon = float(match.group(match.lastindex))
+            if -90 <= lat <= 90 and -180 <= lon <= 180:
+                best_rank, best = rank, (lat, lon)
+                if rank == _BEST_RANK:
+                    break
+        return best if best is not None else (None, None)
 
     @staticmethod
     def extract_lat_lon(url):
         """
-        Main entry point. Handles redirection and multiple URL formats.
+        Blocking variant: follows short-link redirects with the configured resolver,
+        then parses the result. Request handlers should use MapLinkService.locate instead.
         Returns (latitude, longitude) or (None, None)
         """
         if not url:
             return None, None
-            
+
         url = url.strip()
-        
-        # 1. Handle Short URLs (goo.gl, maps.app.goo.gl)
-        # We follow the redirect to get the full URL which contains the coords
-        if "goo.gl" in url or "maps.app.goo.gl" in url:
+        if GoogleMapsParser.is_short_link(url):
+            from core.utils import get_map_link_resolver
             try:
-                # We only need the headers to find the redirect location
-                # CRITICAL: Google blocks default python user-agents, so we must spoof a browser.
-                headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'}
-                request = urllib.request.Request(url, headers=headers, method='HEAD')
-                
-                with urllib.request.urlopen(request, timeout=10) as response:
-                    url = response.geturl()
-            except Exception as e:
-                # If we can't follow redirect, we can't parse short URLs
-                print(f"Error resolving short URL: {e}")
+                url = get_map_link_resolver().resolve(url)
+            except Exception:
                 return None, None
-
-        # 2. Try parsing Query Parameters (q=lat,lon)
-        parsed_url = urlparse(url)
-        params = parse_qs(parsed_url.query)
-        
-        if 'q' in params:
-            q_val = params['q'][0]
-            # Check if q is in format "lat,lon"
-            q_match = re.match(r'(-?\d+\.\d+),(-?\d+\.\d+)', q_val)
-            if q_match:
-                return float(q_match.group(1)), float(q_match.group(2))
-
-        # 3. Try parsing from Path (@lat,lon)
-        at_match = GoogleMapsParser.COORD_PATTERN_AT.search(url)
-        if at_match:
-            return float(at_match.group(1)), float(at_match.group(2))
-
-        # 4. Try parsing internal bang format (!3dlat!4dlon)
-        bang_match = GoogleMapsParser.COORD_PATTERN_BANG.search(url)
-        if bang_match:
-            return float(bang_match.group(1)), float(bang_match.group(2))
-
-        return None, None
+        return GoogleMapsParser.parse_coordinates(url)
 
     @staticmethod
     def is_valid_link(url):
@@ -0,0 +1,62 @@
+"""
+Generated Google Maps links for checking and timing GoogleMapsParser.
+
+URL_SHAPES has one template per URL shape the parser supports and NO_COORDINATES
+the links it must turn down. core/tests.py checks the parser against both and
+`manage.py benchmark_maps_parser` times it on build_corpus(); a new shape added
+here is covered by both.
+"""
+import random
+
+
+def place_name(rng):
+    return '+'.join(rng.choice(['Green', 'Arena', 'Turf', 'Sports', 'Hub', '5s', 'Kick']) for _ in range(rng.randint(1, 4)))
+
+
+def coordinate(rng, limit):
+    """A coordinate string in [-limit, limit] with 1 to 7 decimals."""
+    return f'{rng.uniform(-limit, limit):.{rng.randint(1, 7)}f}'
+
+
+# One template per supported URL shape: (lat, lon, rng) -> url
+URL_SHAPES = {
+    'viewport @': lambda lat, lon, rng: f'https://www.google.com/maps/@{lat},{lon},{rng.randint(3, 21)}z',
+    'place pin !3d!4d': lambda lat, lon, rng: (
+        # The pin wins over the nearby viewport centre
+        f'https://www.google.com/maps/place/{place_name(rng)}/@{float(lat) + 0.001:.6f},{float(lon) - 0.002:.6f},17z'
+        f'/data=!3m1!4b1!4m6!3m5!1s0x3bae1670c9b44e6d:0xf8dfc3e8517e4fe0!8m2!3d{lat}!4d{lon}!16s%2Fg%2F11c5'
+    ),
+    'q=': lambda lat, lon, rng: f'https://maps.google.com/?q={lat},{lon}',
+    'q=loc:': lambda lat, lon, rng: f'https://maps.google.com/maps?q=loc:{lat}%2C+{lon}&z=16',
+    'll=': lambda lat, lon, rng: f'https://maps.google.com/maps?hl=en&ll={lat},{lon}&z=15',
+    'query=': lambda lat, lon, rng: f'https://www.google.com/maps/search/?api=1&query={lat}%2C{lon}',
+    'destination=': lambda lat, lon, rng: f'https://www.google.com/maps/dir/?api=1&destination={lat},{lon}',
+    '/place/': lambda lat, lon, rng: f'https://www.google.com/maps/place/{lat},{lon}/@{lat},{lon},17z',
+    '/search/': lambda lat, lon, rng: f'https://www.google.com/maps/search/{lat},+{lon}?entry=ttu',
+}
+
+NO_COORDINATES = {
+    'place name only': 'https://www.google.com/maps/place/Green+Arena+Turf',
+    'search text': 'https://www.google.com/maps/search/5s+turf+near+me',
+    'q= with a name': 'https://maps.google.com/?q=Kick+Sports+Hub',
+    'latitude out of range': 'https://www.google.com/maps/@95.123,10.5,3z',
+    'longitude out of range': 'https://www.google.com/maps/@12.5,190.5,3z',
+    'integers only': 'https://maps.google.com/?q=12,77',
+    'short link': 'https://maps.app.goo.gl/AbCdEf123',
+    'empty': '',
+    'none': None,
+}
+
+
+def build_corpus(count, seed=7):
+    """`count` links: nine in ten in a random supported shape, the rest without coordinates."""
+    rng = random.Random(seed)
+    templates = list(URL_SHAPES.values())
+    misses = [url for url in NO_COORDINATES.values() if url]
+    corpus = []
+    for i in range(count):
+        if i % 10 == 9:
+            corpus.append(rng.choice(misses))
+        else:
+            corpus.append(rng.choice(templates)(coordinate(rng, 89.9), coordinate(rng, 179.9), rng))
+    return corpus
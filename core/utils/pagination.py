@@ -0,0 +1,155 @@
+import base64
+import datetime
+import json
+from functools import reduce
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    """Keeps full microsecond precision; DjangoJSONEncoder rounds datetimes to milliseconds."""
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def encode_cursor(values, reverse=False):
+    """Packs the sort-key values of a boundary row into an opaque URL-safe token."""
+    data = json.dumps({'k': list(values), 'r': int(reverse)}, cls=CursorEncoder, separators=(',', ':'))
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """Returns (values, reverse). Raises InvalidCursor for malformed tokens."""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        return data['k'], bool(data.get('r'))
+    except (ValueError, KeyError, TypeError) as e:
+        raise InvalidCursor(str(e))
+
+
+def row_value(row, field):
+    if isinstance(row, dict):
+        return row[field]
+    return getattr(row, field)
+
+
+def keyset_filter(ordering, values, reverse=False):
+    """
+    Builds the WHERE clause selecting rows strictly after `values` in `ordering`
+    (or strictly before when reverse=True).
+
+    For ordering (-a, -b, -id) this is:
+        a < va OR (a = va AND b < vb) OR (a = va AND b = vb AND id < vid)
+    Sort keys must be non-null and the last one must be unique (usually id).
+    """
+    clauses = []
+    for i, field in enumerate(ordering):
+        name = field.lstrip('-')
+        descending = field.startswith('-')
+        lookup = 'lt' if descending != reverse else 'gt'
+        equals = {f.lstrip('-'): v for f, v in zip(ordering[:i], values[:i])}
+        clauses.append(Q(**equals, **{f'{name}__{lookup}': values[i]}))
+    return reduce(lambda a, b: a | b, clauses)
+
+
+def reverse_ordering(ordering):
+    return [f[1:] if f.startswith('-') else f'-{f}' for f in ordering]
+
+
+class KeysetPage:
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """
+    Cursor pagination over a stable, unique sort key.
+    Unlike Paginator it never runs COUNT(*) or OFFSET, so page N costs the same as page 1.
+    """
+    def __init__(self, queryset, ordering, per_page=20):
+        self.queryset = queryset
+        self.ordering = list(ordering)
+        self.per_page = per_page
+
+    def get_page(self, cursor=None):
+        """Returns a KeysetPage. Malformed cursors fall back to the first page."""
+        try:
+            return self.page(cursor)
+        except InvalidCursor:
+            return self.page(None)
+
+    def page(self, cursor=None):
+        values, reverse = decode_cursor(cursor) if cursor else (None, False)
+        if values is not None and len(values) != len(self.ordering):
+            raise InvalidCursor("Cursor does not match the current ordering")
+
+        ordering = reverse_ordering(self.ordering) if reverse else self.ordering
+        qs = self.queryset.order_by(*ordering)
+        if values is not None:
+            try:
+                qs = qs.filter(keyset_filter(self.ordering, values, reverse=reverse))
+            except (ValueError, TypeError, ValidationError) as e:
+                raise InvalidCursor(str(e))
+
+        rows = list(qs[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if reverse:
+            rows.reverse()
+
+        # Walking backwards always leaves the cursor row ahead of us, and vice versa
+        has_next = reverse or has_more
+        has_previous = has_more if reverse else values is not None
+
+        next_cursor = previous_cursor = None
+        if rows:
+            if has_next:
+                next_cursor = encode_cursor([row_value(rows[-1], f.lstrip('-')) for f in self.ordering])
+            if has_previous:
+                previous_cursor = encode_cursor([row_value(rows[0], f.lstrip('-')) for f in self.ordering], reverse=True)
+        return KeysetPage(rows, next_cursor, previous_cursor)
+
+
+def keyset_iterator(queryset, ordering, chunk_size=2000):
+    """
+    Yields every row of `queryset` in `ordering`, fetching `chunk_size` rows per query.
+    Memory stays bounded and no long-lived server-side cursor or transaction is held.
+    """
+    ordering = list(ordering)
+    qs = queryset.order_by(*ordering)
+    values = None
+    while True:
+        batch_qs = qs.filter(keyset_filter(ordering, values)) if values is not None else qs
+        count, last = 0, None
+        for last in batch_qs[:chunk_size].iterator(chunk_size=chunk_size):
+            count += 1
+            yield last
+        if count < chunk_size:
+            return
+        values = [row_value(last, f.lstrip('-')) for f in ordering]
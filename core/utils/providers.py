@@ -0,0 +1,78 @@
+"""
+Process-wide registry of the swappable service providers (SMS_PROVIDER,
+PAYMENT_PROVIDER, MAPS_LINK_RESOLVER, OTP_DELIVERY_SINKS).
+
+Each configured class is imported and instantiated once per process, so a
+provider can keep pooled resources (HTTP connections, sessions, clients) across
+requests. Providers may define warm_up(), called right after construction, and
+close(), called when the instance is dropped: at exit, or when a test changes
+the setting it came from (or one it reads, see DEPENDENT_SETTINGS) with
+override_settings.
+"""
+import atexit
+import logging
+import threading
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+# Settings a provider reads in __init__: changing them must rebuild the provider
+DEPENDENT_SETTINGS = {
+    'SMS_GATEWAY': 'SMS_PROVIDER',
+}
+
+
+class ProviderRegistry:
+    def __init__(self):
+        self._instances = {}   # (setting, dotted path) -> instance
+        self._lock = threading.Lock()
+
+    def get(self, setting):
+        """The instance of the class named by settings.<setting>."""
+        return self.instance(getattr(settings, setting), setting)
+
+    def get_all(self, setting):
+        """Instances of every class listed in settings.<setting>."""
+        return [self.instance(path, setting) for path in getattr(settings, setting, [])]
+
+    def instance(self, path, setting):
+        key = (setting, path)
+        provider = self._instances.get(key)
+        if provider is not None:
+            return provider
+        with self._lock:
+            provider = self._instances.get(key)
+            if provider is None:
+                provider = import_string(path)()
+                warm_up = getattr(provider, 'warm_up', None)
+                if warm_up is not None:
+                    warm_up()
+                self._instances[key] = provider
+        return provider
+
+    def reset(self, setting=None):
+        """Closes and forgets the instances built for `setting` (all of them when None)."""
+        with self._lock:
+            keys = [key for key in self._instances if setting is None or key[0] == setting]
+            dropped = [self._instances.pop(key) for key in keys]
+        for provider in dropped:
+            close = getattr(provider, 'close', None)
+            if close is not None:
+                try:
+                    close()
+                except Exception:
+                    logger.exception("Closing provider %s failed", type(provider).__name__)
+
+
+providers = ProviderRegistry()
+atexit.register(providers.reset)
+
+
+def _reset_on_setting_change(setting, **kwargs):
+    providers.reset(DEPENDENT_SETTINGS.get(setting, setting))
+
+
+setting_changed.connect(_reset_on_setting_change)
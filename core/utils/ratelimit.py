@@ -0,0 +1,157 @@
+"""
+Rate limiting for views and the API.
+
+Each (scope, key) pair, e.g. ('otp_request_phone', '+9198...'), may make up to
+`capacity` requests per sliding period. Limits are configured per scope in
+settings.RATE_LIMITS as "<capacity>/<period>", e.g. '3/10m' allows a burst of 3
+and then one more as each ten-minute stretch frees up room.
+
+Requests are counted per fixed window with cache.add/cache.incr, so counting
+is atomic on any cache with atomic incr (local memory, Redis, Memcached), and
+the sliding count weighs the previous window by how much of it still overlaps
+the period. Counters live in settings.RATE_LIMIT_CACHE ('default' by default)
+and expire after two windows. With the local-memory cache limits are per
+process; they are only global when CACHES points at a shared cache (see
+REDIS_URL in settings).
+
+Used by the DRF throttles in core/api_throttles.py and the `rate_limit` view decorator.
+"""
+import hashlib
+import math
+import re
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.contrib import messages
+from django.core.cache import caches
+from django.shortcuts import redirect
+
+RATE_RE = re.compile(r'^\s*(\d+)\s*/\s*(\d*)\s*([smhd])\w*\s*$')
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+    """'5/10m' -> (capacity 5, refill 5 tokens per 600 s as tokens/sec)."""
+    match = RATE_RE.match(rate)
+    if not match:
+        raise ValueError(f"Invalid rate {rate!r}; expected e.g. '5/m' or '3/10m'")
+    capacity = int(match.group(1))
+    period = int(match.group(2) or 1) * PERIODS[match.group(3)]
+    return capacity, capacity / period
+
+
+def client_ip(request):
+    """REMOTE_ADDR, or the client address added by the last settings.RATE_LIMIT_PROXIES proxies."""
+    proxies = getattr(settings, 'RATE_LIMIT_PROXIES', 0)
+    forwarded = request.META.get('HTTP_X_FORWARDED_FOR')
+    if proxies and forwarded:
+        hops = [hop.strip() for hop in forwarded.split(',')]
+        return hops[max(len(hops) - proxies, 0)]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+class TokenBucket:
+    def __init__(self, scope, rate=None):
+        self.scope = scope
+        rate = rate or getattr(settings, 'RATE_LIMITS', {}).get(scope)
+        self.capacity, self.refill = parse_rate(rate) if rate else (None, None)
+        self.cache = caches[getattr(settings, 'RATE_LIMIT_CACHE', 'default')]
+
+    @property
+    def enabled(self):
+        return self.capacity is not None
+
+    @property
+    def period(self):
+        """Seconds in which `capacity` requests are allowed."""
+        return self.capacity / self.refill
+
+    def cache_key(self, key, window):
+        digest = hashlib.sha1(str(key).encode()).hexdigest()
+        return f'rl:{self.scope}:{digest}:{window}'
+
+    def _incr(self, cache_key, tokens):
+        """Atomically adds `tokens` to the window counter, creating it if needed. Returns the new count."""
+        timeout = math.ceil(self.period * 2)
+        for _ in range(2):
+            if self.cache.add(cache_key, tokens, timeout):
+                return tokens
+            try:
+                return self.cache.incr(cache_key, tokens)
+            except ValueError:
+                # Expired between add() and incr()
+                continue
+        return tokens
+
+    def consume(self, key, tokens=1, now=None):
+        """Takes `tokens` from the allowance for `key`. Returns (allowed, seconds until allowed)."""
+        if not self.enabled or key is None or key == '':
+            return True, 0
+        now = time.time() if now is None else now
+        period = self.period
+        window, elapsed = divmod(now, period)
+        current_key = self.cache_key(key, int(window))
+        count = self._incr(current_key, tokens)
+        previous = self.cache.get(self.cache_key(key, int(window) - 1), 0)
+        # The part of the previous window still inside the sliding period
+        overlap = 1 - elapsed / period
+        if previous * overlap + count <= self.capacity:
+            return True, 0
+        # Refused requests don't count
+        try:
+            self.cache.decr(current_key, tokens)
+        except ValueError:
+            pass
+        return False, self._wait(previous, count - tokens, tokens, elapsed)
+
+    def _wait(self, previous, count, tokens, elapsed):
+        """Seconds until `tokens` more fit, given the previous and current window counts."""
+        period = self.period
+        room = self.capacity - count - tokens
+        if room >= 0 and previous > 0:
+            # Within this window, once enough of the previous one has slid out
+            return max((1 - room / previous) * period - elapsed, 0)
+        # In the next window, where this window's count is the one sliding out
+        room = self.capacity - tokens
+        overlap = room / count if count > room else 1
+        return (period - elapsed) + (1 - overlap) * period
+
+    def reset(self, key):
+        if not self.enabled:
+            return
+        window = int(time.time() // self.period)
+        self.cache.delete_many([self.cache_key(key, window), self.cache_key(key, window - 1)])
+
+
+def by_ip(request):
+    return client_ip(request)
+
+
+def by_user(request):
+    return request.user.pk if request.user.is_authenticated else None
+
+
+def by_post_field(name):
+    def key(request):
+        return (request.POST.get(name) or '').strip() or None
+    return key
+
+
+def rate_limit(scope, key=by_ip, methods=('POST',)):
+    """
+    View decorator: when the bucket for (scope, key(request)) is empty, shows an
+    error message and redirects back to the page (GET requests are not limited
+    by default, so the redirect always lands).
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def _wrapped_view(request, *args, **kwargs):
+            if request.method in methods:
+                allowed, wait = TokenBucket(scope).consume(key(request))
+                if not allowed:
+                    messages.error(request, f"Too many requests. Please try again in {math.ceil(wait)} seconds.")
+                    return redirect(request.get_full_path())
+            return view_func(request, *args, **kwargs)
+        return _wrapped_view
+    return decorator
@@ -8,6 +8,7 @@ from users.models import CustomUser
 from turfs.models import Turf, TurfActivityLog
 from bookings.models import Booking
 from payments.models import DemoPayment
+from core.utils.pagination import KeysetPaginator, keyset_iterator
 import datetime
 from decimal import Decimal
 
@@ -62,12 +63,10 @@ def platform_admin_dashboard(request):
     
     # Subscription Metrics
     from subscriptions.models import OwnerSubscription
-    sub_stats = OwnerSubscription.objects.filter(status='ACTIVE', end_date__gt=timezone.now()).aggregate(
-        mrr=Sum('plan__price'),
-        active_subs=Count('id')
-    )
-    mrr = sub_stats['mrr'] or 0
-    active_subscribers = sub_stats['active_subs'] or 0
+    from subscriptions.services import SubscriptionLedgerService
+    mrr = SubscriptionLedgerService.mrr()
+    # Lapsed subscriptions are marked EXPIRED by process_subscriptions
+    active_subscribers = OwnerSubscription.objects.filter(status='ACTIVE').count()
     
     # Event Revenue (Tournaments)
     from events.services import EventService
@@ -119,87 +118,67 @@ def investor_dashboard(request):
     """
     High-fidelity dashboard for investors and stakeholders.
     Focuses on MoM growth, revenue stream diversification, and health metrics.
+    Served from the latest precomputed snapshot (see refresh_investor_snapshot).
     """
-    from django.db.models.functions import TruncMonth
-    from decimal import Decimal
-    
-    # 1. Current Month Revenue Breakdown
-    now = timezone.now()
-    first_of_this_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    first_of_last_month = (first_of_this_month - datetime.timedelta(days=1)).replace(day=1)
+    from core.services.investor import InvestorMetricsService
 
-    def get_month_earnings(start_date, end_date):
-        # Transactional Earnings
-        bookings = Booking.objects.filter(payment_status='SUCCESS', created_at__range=(start_date, end_date)).aggregate(
-            commission=Sum('platform_commission'),
-            fees=Sum('convenience_fee')
-        )
-        comm = bookings['commission'] or Decimal('0.00')
-        fees = bookings['fees'] or Decimal('0.00')
-        
-        # Subscription Earnings (Estimate based on active subs during period)
-        # For simplicity in this demo, we'll take a snapshot of active MRR
-        from subscriptions.models import OwnerSubscription
-        sub_rev = OwnerSubscription.objects.filter(status='ACTIVE', created_at__lte=end_date).aggregate(Sum('plan__price'))['plan__price__sum'] or Decimal('0.00')
-        
-        # Ad Revenue (Current month spend)
-        from ads.models import AdCampaign
-        ad_rev = AdCampaign.objects.filter(created_at__range=(start_date, end_date)).aggregate(Sum('spent_amount'))['spent_amount__sum'] or Decimal('0.00')
-        
-        # Event Revenue (Commissions + Listing)
-        from events.models import TournamentRegistration, Tournament
-        event_listing = Tournament.objects.filter(is_paid_listing=True, created_at__range=(start_date, end_date)).aggregate(Sum('listing_fee'))['listing_fee__sum'] or Decimal('0.00')
-        event_reg = TournamentRegistration.objects.filter(payment_status='SUCCESS', registered_at__range=(start_date, end_date)).aggregate(Sum('platform_commission'))['platform_commission__sum'] or Decimal('0.00')
-        
-        total = comm + fees + sub_rev + ad_rev + event_listing + event_reg
-        return {
-            'total': total,
-            'commission': comm,
-            'fees': fees,
-            'subscriptions': sub_rev,
-            'ads': ad_rev,
-            'events': event_listing + event_reg
-        }
+    snapshot = InvestorMetricsService.get_latest_snapshot()
+    if snapshot is None:
+        # First load on a fresh install: compute once so the page isn't empty
+        snapshot = InvestorMetricsService.build_snapshot()
 
-    this_month = get_month_earnings(first_of_this_month, now)
-    last_month = get_month_earnings(first_of_last_month, first_of_this_month)
-    
-    # Calculate MoM Growth
-    growth_pct = 0
-    if last_month['total'] > 0:
-        growth_pct = ((this_month['total'] - last_month['total']) / last_month['total']) * 100
-    
-    # Growth History (Last 6 Months)
-    history_raw = Booking.objects.filter(payment_status='SUCCESS').annotate(
-        month=TruncMonth('created_at')
-    ).values('month').annotate(
-        rev=Sum('platform_commission') + Sum('convenience_fee')
-    ).order_by('month')
-    
-    history_labels = [h['month'].strftime('%b %Y') for h in history_raw]
-    history_values = [float(h['rev']) for h in history_raw]
-
-    context = {
-        'this_month': this_month,
-        'last_month': last_month,
-        'growth_pct': growth_pct,
-        'history_labels': history_labels,
-        'history_values': history_values,
-        'top_source': max(this_month, key=lambda k: this_month[k] if k != 'total' else 0),
+    context = InvestorMetricsService.load_payload(snapshot)
+    context.update({
+        'snapshot_computed_at': snapshot.computed_at,
         'investor_ready': True # Flag for UI branding
-    }
-    
+    })
+
     return render(request, 'admin/investor_dashboard.html', context)
 
+@user_passes_test(lambda u: u.is_staff)
+def refresh_investor_snapshot(request):
+    """Queues a background recompute of the investor dashboard snapshot."""
+    if request.method == 'POST':
+        from core.services.investor import InvestorMetricsService
+        if InvestorMetricsService.refresh_async():
+            messages.info(request, "Refreshing investor metrics in the background. Reload in a few seconds.")
+        else:
+            messages.warning(request, "A refresh is already in progress.")
+    return redirect('core:investor_insights')
+
 @user_passes_test(lambda u: u.is_staff)
 def admin_user_list(request):
     users = CustomUser.objects.all().order_by('-date_joined')
     return render(request, 'admin/reports/user_list.html', {'report_users': users, 'title': 'Platform Users'})
 
+REVENUE_ORDERING = ('-created_at', '-id')
+BOOKING_ORDERING = ('-booking_date', '-start_time', '-id')
+
 @user_passes_test(lambda u: u.is_staff)
 def admin_revenue_list(request):
-    payments = DemoPayment.objects.filter(status='SUCCESS').select_related('booking__user', 'booking__turf').order_by('-created_at')
-    return render(request, 'admin/reports/revenue_list.html', {'payments': payments, 'title': 'Revenue History'})
+    payments = DemoPayment.objects.filter(status='SUCCESS').select_related('booking__user', 'booking__turf')
+    page = KeysetPaginator(payments, REVENUE_ORDERING, per_page=50).get_page(request.GET.get('cursor'))
+    return render(request, 'admin/reports/revenue_list.html', {'payments': page, 'page': page, 'title': 'Revenue History'})
+
+@user_passes_test(lambda u: u.is_staff)
+def admin_revenue_export(request):
+    """Streams every successful payment as CSV or JSONL (?format=jsonl) with bounded memory."""
+    from core.services.export import ExportService, EXPORT_CHUNK_SIZE
+    columns = [
+        ('transaction_id', 'transaction_id'),
+        ('created_at', 'created_at'),
+        ('amount', 'amount'),
+        ('currency', 'currency'),
+        ('status', 'status'),
+        ('booking_id', 'booking__booking_id'),
+        ('user_phone', 'booking__user__phone_number'),
+        ('turf', 'booking__turf__name'),
+    ]
+    rows = DemoPayment.objects.filter(status='SUCCESS').values('id', *[key for _, key in columns])
+    return ExportService.streaming_response(
+        'revenue', request.GET.get('format', 'csv'), columns,
+        keyset_iterator(rows, REVENUE_ORDERING, chunk_size=EXPORT_CHUNK_SIZE)
+    )
 
 @user_passes_test(lambda u: u.is_staff)
 def admin_turf_list(request):
@@ -252,7 +231,8 @@ def approve_owner(request, user_id):
             user.save()
             
             # Activate all their turfs
-            turf_count = user.turfs.all().update(is_active=True)
+            from turfs.services import TurfVisibilityService
+            turf_count = TurfVisibilityService.activate_owner_turfs(user)
             
             # Create audit log
             AdminActionLog.objects.create(
@@ -335,10 +315,36 @@ def hide_turf(request, turf_id):
 
 @user_passes_test(lambda u: u.is_staff)
 def admin_booking_list(request):
-    bookings = Booking.objects.all().select_related('user', 'turf').order_by('-booking_date', '-time_slot')
-    for b in bookings:
-        b.short_id = str(b.booking_id)[:8] + '...'
-    return render(request, 'admin/reports/booking_list.html', {'report_bookings': bookings, 'title': 'All Bookings'})
+    bookings = Booking.objects.all().select_related('user', 'turf')
+    page = KeysetPaginator(bookings, BOOKING_ORDERING, per_page=50).get_page(request.GET.get('cursor'))
+    return render(request, 'admin/reports/booking_list.html', {'report_bookings': page, 'page': page, 'title': 'All Bookings'})
+
+@user_passes_test(lambda u: u.is_staff)
+def admin_booking_export(request):
+    """Streams every booking as CSV or JSONL (?format=jsonl) with bounded memory."""
+    from core.services.export import ExportService, EXPORT_CHUNK_SIZE
+    columns = [
+        ('booking_id', 'booking_id'),
+        ('booking_date', 'booking_date'),
+        ('start_time', 'start_time'),
+        ('end_time', 'end_time'),
+        ('user_phone', 'user__phone_number'),
+        ('turf', 'turf__name'),
+        ('city', 'turf__city'),
+        ('status', 'status'),
+        ('payment_status', 'payment_status'),
+        ('base_amount', 'base_amount'),
+        ('convenience_fee', 'convenience_fee'),
+        ('total_amount', 'total_amount'),
+        ('platform_commission', 'platform_commission'),
+        ('owner_earnings', 'owner_earnings'),
+        ('created_at', 'created_at'),
+    ]
+    rows = Booking.objects.values('id', *[key for _, key in columns])
+    return ExportService.streaming_response(
+        'bookings', request.GET.get('format', 'csv'), columns,
+        keyset_iterator(rows, BOOKING_ORDERING, chunk_size=EXPORT_CHUNK_SIZE)
+    )
 
 @user_passes_test(lambda u: u.is_staff)
 def admin_turf_review(request, turf_id):
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0007_booking_bookings_bo_booking_1d212d_idx'),
+        ('payments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='demopayment',
+            index=models.Index(fields=['status', 'created_at', 'id'], name='payments_de_status_2260c2_idx'),
+        ),
+    ]
@@ -12,5 +12,11 @@ class DemoPayment(models.Model):
     # Store fake gateway response
     gateway_response = models.JSONField(default=dict)
 
+    class Meta:
+        indexes = [
+            # Keyset pagination / export order for the admin revenue report
+            models.Index(fields=['status', 'created_at', 'id']),
+        ]
+
     def __str__(self):
         return f"Payment {self.transaction_id} for {self.booking.booking_id}"
@@ -0,0 +1,33 @@
+"""
+Django management command that runs the subscription lifecycle.
+
+Charges auto-renewing subscriptions that end within a day through the payment
+provider (in batches, retrying failed charges), then marks every ACTIVE
+subscription whose end_date has passed as EXPIRED. Listings, dashboards and
+ranking tiers can then rely on status='ACTIVE' alone.
+
+Usage:
+    python manage.py process_subscriptions
+    python manage.py process_subscriptions --batch-size 500
+
+Recommended: Run this every 15 minutes via cron or Celery Beat
+    */15 * * * * cd /path/to/project && python manage.py process_subscriptions
+"""
+
+from django.core.management.base import BaseCommand
+
+from subscriptions.services import SubscriptionLifecycleService, BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = 'Renews due auto-renewing subscriptions and expires lapsed ones'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help=f'Subscriptions per batch (default {BATCH_SIZE})')
+
+    def handle(self, *args, **options):
+        counts = SubscriptionLifecycleService.run(batch_size=max(options['batch_size'], 1))
+        self.stdout.write(self.style.SUCCESS(
+            f"Renewed {counts['renewed']}, renewal failed for {counts['renewal_failed']}, "
+            f"expired {counts['expired']} subscription(s)."
+        ))
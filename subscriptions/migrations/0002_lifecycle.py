@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:52
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('subscriptions', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ownersubscription',
+            name='last_payment_id',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='ownersubscription',
+            name='last_renewal_attempt',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='ownersubscription',
+            name='renewal_attempts',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='ownersubscription',
+            index=models.Index(fields=['status', 'end_date'], name='subscriptio_status_97621d_idx'),
+        ),
+    ]
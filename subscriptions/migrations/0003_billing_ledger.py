@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:54
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from decimal import Decimal
+
+from django.db import migrations, models
+
+
+def backfill_current_periods(apps, schema_editor):
+    # The only period on record for existing subscriptions is the current one
+    OwnerSubscription = apps.get_model('subscriptions', 'OwnerSubscription')
+    SubscriptionPayment = apps.get_model('subscriptions', 'SubscriptionPayment')
+    SubscriptionPayment.objects.bulk_create([
+        SubscriptionPayment(
+            subscription=sub, owner_id=sub.owner_id, plan=sub.plan, kind='ACTIVATION',
+            amount=sub.plan.price,
+            monthly_amount=(sub.plan.price * 30 / max(sub.plan.duration_days, 1)).quantize(Decimal('0.01')),
+            period_start=sub.start_date, period_end=sub.end_date, paid_at=sub.start_date,
+            receipt=f"sub_{sub.pk}_a{sub.start_date:%Y%m%d%H%M%S%f}",
+        )
+        for sub in OwnerSubscription.objects.filter(status='ACTIVE').select_related('plan')
+    ], ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('subscriptions', '0002_lifecycle'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubscriptionPayment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('ACTIVATION', 'Activation'), ('RENEWAL', 'Renewal')], max_length=20)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('monthly_amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('period_start', models.DateTimeField()),
+                ('period_end', models.DateTimeField()),
+                ('paid_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('receipt', models.CharField(max_length=100, unique=True)),
+                ('payment_id', models.CharField(blank=True, max_length=100)),
+                ('owner', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='subscription_payments', to=settings.AUTH_USER_MODEL)),
+                ('plan', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='subscriptions.subscriptionplan')),
+                ('subscription', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='payments', to='subscriptions.ownersubscription')),
+            ],
+            options={
+                'ordering': ['-paid_at'],
+                'indexes': [models.Index(fields=['paid_at'], name='subscriptio_paid_at_ac2592_idx'), models.Index(fields=['period_start', 'period_end'], name='subscriptio_period__aa700a_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_current_periods, migrations.RunPython.noop),
+    ]
@@ -42,8 +42,18 @@ class OwnerSubscription(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='ACTIVE')
     
     auto_renew = models.BooleanField(default=True)
+    # Maintained by SubscriptionLifecycleService
+    renewal_attempts = models.PositiveSmallIntegerField(default=0)
+    last_renewal_attempt = models.DateTimeField(null=True, blank=True)
+    last_payment_id = models.CharField(max_length=100, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Lifecycle passes: ACTIVE subscriptions ending before a cutoff
+            models.Index(fields=['status', 'end_date']),
+        ]
+
     def is_currently_active(self):
         return self.status == 'ACTIVE' and self.end_date > timezone.now()
 
@@ -54,3 +64,40 @@ class OwnerSubscription(models.Model):
         if not self.end_date:
             self.end_date = self.start_date + timezone.timedelta(days=self.plan.duration_days)
         super().save(*args, **kwargs)
+
+
+class SubscriptionPayment(models.Model):
+    """
+    Billing ledger: one row per paid subscription period, written on subscribe and
+    on each renewal. Revenue for a date range is a sum over paid_at, and MRR at a
+    moment is the sum of monthly_amount over the periods covering it.
+    """
+    KIND_CHOICES = [
+        ('ACTIVATION', 'Activation'),
+        ('RENEWAL', 'Renewal'),
+    ]
+
+    # Kept when the subscription or owner is deleted; it is a financial record
+    subscription = models.ForeignKey(OwnerSubscription, on_delete=models.SET_NULL, null=True, related_name='payments')
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, related_name='subscription_payments')
+    plan = models.ForeignKey(SubscriptionPlan, on_delete=models.PROTECT)
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    # amount normalized to a 30-day month
+    monthly_amount = models.DecimalField(max_digits=10, decimal_places=2)
+    period_start = models.DateTimeField()
+    period_end = models.DateTimeField()
+    paid_at = models.DateTimeField(default=timezone.now)
+    # One receipt per subscription period (the payment idempotency key)
+    receipt = models.CharField(max_length=100, unique=True)
+    payment_id = models.CharField(max_length=100, blank=True)
+
+    class Meta:
+        ordering = ['-paid_at']
+        indexes = [
+            models.Index(fields=['paid_at']),
+            models.Index(fields=['period_start', 'period_end']),
+        ]
+
+    def __str__(self):
+        return f"{self.receipt} - {self.amount}"
@@ -0,0 +1,209 @@
+import datetime
+import logging
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from core.utils import get_payment_provider
+from .models import OwnerSubscription, SubscriptionPayment
+from .signals import subscription_changed, ACTIVATED, RENEWED, RENEWAL_FAILED, EXPIRED
+
+logger = logging.getLogger('django')
+
+# Auto-renewals are charged this long before end_date, so failed charges can be retried in time
+RENEWAL_LEAD = datetime.timedelta(days=1)
+RENEWAL_RETRY_INTERVAL = datetime.timedelta(hours=6)
+MAX_RENEWAL_ATTEMPTS = 3
+BATCH_SIZE = 200
+
+
+class SubscriptionLedgerService:
+    """Writes and reads the SubscriptionPayment ledger (one row per paid period)."""
+
+    @staticmethod
+    def receipt(subscription_id, kind, anchor):
+        """Idempotency key of one paid period: the subscription, the kind and when the period was anchored."""
+        return f"sub_{subscription_id}_{kind[0].lower()}{anchor:%Y%m%d%H%M%S%f}"
+
+    @staticmethod
+    def entry(subscription, kind, period_start, receipt, payment_id='', paid_at=None):
+        """An unsaved ledger row for the period period_start .. subscription.end_date."""
+        plan = subscription.plan
+        return SubscriptionPayment(
+            subscription=subscription,
+            owner_id=subscription.owner_id,
+            plan=plan,
+            kind=kind,
+            amount=plan.price,
+            monthly_amount=(plan.price * 30 / max(plan.duration_days, 1)).quantize(Decimal('0.01')),
+            period_start=period_start,
+            period_end=subscription.end_date,
+            paid_at=paid_at or timezone.now(),
+            receipt=receipt,
+            payment_id=payment_id or '',
+        )
+
+    @staticmethod
+    def revenue(start, end):
+        """Subscription revenue collected between start and end (inclusive)."""
+        total = SubscriptionPayment.objects.filter(paid_at__range=(start, end)).aggregate(total=Sum('amount'))['total']
+        return total or Decimal('0.00')
+
+    @staticmethod
+    def mrr(at=None):
+        """Monthly recurring revenue: the monthly value of every paid period running at `at`."""
+        at = at or timezone.now()
+        total = SubscriptionPayment.objects.filter(
+            period_start__lte=at, period_end__gt=at
+        ).aggregate(total=Sum('monthly_amount'))['total']
+        return total or Decimal('0.00')
+
+
+class SubscriptionLifecycleService:
+    """
+    Moves subscriptions through ACTIVE -> (renewed) -> EXPIRED so that `status`
+    alone says whether a subscription is live. `manage.py process_subscriptions`
+    runs renew_due() and expire_lapsed() on a schedule; every transition is
+    announced through subscriptions.signals.subscription_changed.
+    """
+
+    @staticmethod
+    def notify(event, subscriptions):
+        """Sends subscription_changed once the current transaction commits."""
+        subscription_ids = [s.pk for s in subscriptions]
+        owner_ids = [s.owner_id for s in subscriptions]
+        if subscription_ids:
+            transaction.on_commit(lambda: subscription_changed.send(
+                sender=OwnerSubscription, event=event, subscription_ids=subscription_ids, owner_ids=owner_ids,
+            ))
+
+    @staticmethod
+    def activate(owner, plan, now=None):
+        """Starts (or restarts) the owner's subscription on `plan` for one paid plan period."""
+        now = now or timezone.now()
+        with transaction.atomic():
+            subscription, created = OwnerSubscription.objects.select_for_update().get_or_create(
+                owner=owner, defaults={'plan': plan, 'start_date': now}
+            )
+            if not created:
+                subscription.plan = plan
+                subscription.start_date = now
+                subscription.status = 'ACTIVE'
+                # Reset end_date so save() recalculates it
+                subscription.end_date = None
+                subscription.renewal_attempts = 0
+                subscription.last_renewal_attempt = None
+                subscription.save()
+            # A plan change replaces the rest of the current paid period
+            SubscriptionPayment.objects.filter(subscription=subscription, period_end__gt=now).update(period_end=now)
+            SubscriptionLedgerService.entry(
+                subscription, 'ACTIVATION', now,
+                receipt=SubscriptionLedgerService.receipt(subscription.pk, 'ACTIVATION', now), paid_at=now,
+            ).save()
+            SubscriptionLifecycleService.notify(ACTIVATED, [subscription])
+        return subscription
+
+    @staticmethod
+    def renewals_due(now):
+        retry_before = now - RENEWAL_RETRY_INTERVAL
+        # Only subscriptions that have not ended yet; lapsed ones are expired, never charged
+        return OwnerSubscription.objects.filter(
+            status='ACTIVE', auto_renew=True, plan__is_active=True,
+            end_date__gt=now, end_date__lte=now + RENEWAL_LEAD, renewal_attempts__lt=MAX_RENEWAL_ATTEMPTS,
+        ).exclude(last_renewal_attempt__gt=retry_before)
+
+    @staticmethod
+    def renew_due(now=None, batch_size=BATCH_SIZE):
+        """
+        Charges auto-renewing subscriptions that end within the next RENEWAL_LEAD through the
+        payment provider, batch_size at a time. A paid renewal extends end_date by
+        one plan period; a failed one is retried after RENEWAL_RETRY_INTERVAL, up to
+        MAX_RENEWAL_ATTEMPTS, after which the subscription is left to expire.
+        Returns (renewed, failed).
+        """
+        now = now or timezone.now()
+        provider = get_payment_provider()
+        renewed = failed = 0
+        due_ids = list(SubscriptionLifecycleService.renewals_due(now).order_by('end_date').values_list('pk', flat=True))
+        for start in range(0, len(due_ids), batch_size):
+            # Claim the batch by stamping the attempt, so an overlapping run skips these rows
+            claimed = SubscriptionLifecycleService.renewals_due(now).filter(
+                pk__in=due_ids[start:start + batch_size]
+            ).update(last_renewal_attempt=now)
+            if not claimed:
+                continue
+            batch = list(
+                OwnerSubscription.objects.filter(pk__in=due_ids[start:start + batch_size], last_renewal_attempt=now)
+                .select_related('plan')
+            )
+            charges = [{
+                'amount': s.plan.price,
+                'currency': 'INR',
+                # One receipt per subscription period, so a retried charge is never billed twice
+                'receipt': SubscriptionLedgerService.receipt(s.pk, 'RENEWAL', s.end_date),
+                'customer': str(s.owner_id),
+            } for s in batch]
+            try:
+                results = provider.charge_batch(charges)
+            except Exception as e:
+                logger.warning("Renewal charge batch of %d failed: %s", len(batch), e)
+                results = [{'status': 'failed', 'error': str(e)}] * len(batch)
+
+            paid, unpaid, ledger = [], [], []
+            for subscription, charge, result in zip(batch, charges, results):
+                if result.get('status') == 'captured':
+                    # The new period follows on from the current one
+                    period_start = subscription.end_date
+                    subscription.end_date = period_start + datetime.timedelta(days=subscription.plan.duration_days)
+                    subscription.status = 'ACTIVE'
+                    subscription.renewal_attempts = 0
+                    subscription.last_payment_id = result.get('id') or ''
+                    paid.append(subscription)
+                    ledger.append(SubscriptionLedgerService.entry(
+                        subscription, 'RENEWAL', period_start,
+                        receipt=charge['receipt'], payment_id=subscription.last_payment_id, paid_at=now,
+                    ))
+                else:
+                    subscription.renewal_attempts += 1
+                    unpaid.append(subscription)
+                    logger.warning("Renewal of subscription %s failed: %s", subscription.pk, result.get('error'))
+            with transaction.atomic():
+                if paid:
+                    OwnerSubscription.objects.bulk_update(paid, ['end_date', 'status', 'renewal_attempts', 'last_payment_id'])
+                if unpaid:
+                    OwnerSubscription.objects.bulk_update(unpaid, ['renewal_attempts'])
+                SubscriptionPayment.objects.bulk_create(ledger, ignore_conflicts=True)
+                SubscriptionLifecycleService.notify(RENEWED, paid)
+                SubscriptionLifecycleService.notify(RENEWAL_FAILED, unpaid)
+            renewed += len(paid)
+            failed += len(unpaid)
+        return renewed, failed
+
+    @staticmethod
+    def expire_lapsed(now=None, batch_size=BATCH_SIZE):
+        """Marks ACTIVE subscriptions whose end_date has passed as EXPIRED. Returns the number expired."""
+        now = now or timezone.now()
+        lapsed = OwnerSubscription.objects.filter(status='ACTIVE', end_date__lte=now)
+        expired = 0
+        while True:
+            batch = list(lapsed.order_by('end_date').only('pk', 'owner_id')[:batch_size])
+            if not batch:
+                return expired
+            with transaction.atomic():
+                # Re-check in the UPDATE: a renewal may have landed in between
+                lapsed.filter(pk__in=[s.pk for s in batch]).update(status='EXPIRED')
+                still_expired = list(
+                    OwnerSubscription.objects.filter(pk__in=[s.pk for s in batch], status='EXPIRED').only('pk', 'owner_id')
+                )
+                SubscriptionLifecycleService.notify(EXPIRED, still_expired)
+            expired += len(still_expired)
+
+    @staticmethod
+    def run(now=None, batch_size=BATCH_SIZE):
+        """One scheduled pass: renewals first, so paid subscriptions never expire. Returns counts."""
+        now = now or timezone.now()
+        renewed, failed = SubscriptionLifecycleService.renew_due(now, batch_size)
+        expired = SubscriptionLifecycleService.expire_lapsed(now, batch_size)
+        return {'renewed': renewed, 'renewal_failed': failed, 'expired': expired}
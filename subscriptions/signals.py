@@ -0,0 +1,37 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import Signal, receiver
+
+from turfs.services import RankingService
+from .models import OwnerSubscription, SubscriptionPlan
+
+# Sent by SubscriptionLifecycleService after each transition commits, with
+# event (one of the names below), subscription_ids and owner_ids. Bulk
+# transitions skip post_save, so caches derived from subscriptions listen here.
+subscription_changed = Signal()
+
+ACTIVATED = 'activated'
+RENEWED = 'renewed'
+RENEWAL_FAILED = 'renewal_failed'
+EXPIRED = 'expired'
+
+# --- Denormalized Turf.ranking_tier ---
+
+@receiver(post_save, sender=OwnerSubscription)
+@receiver(post_delete, sender=OwnerSubscription)
+def sync_owner_ranking_tier(sender, instance, raw=False, **kwargs):
+    if not raw:
+        RankingService.sync_owner(instance.owner_id)
+
+@receiver(post_save, sender=SubscriptionPlan)
+def sync_plan_ranking_tiers(sender, instance, created, raw=False, **kwargs):
+    if created or raw:
+        return
+    for owner_id in instance.ownersubscription_set.values_list('owner_id', flat=True):
+        RankingService.sync_owner(owner_id)
+
+@receiver(subscription_changed)
+def sync_changed_ranking_tiers(sender, event, owner_ids, **kwargs):
+    # Activation saves the instance, which post_save already handled
+    if event in (EXPIRED, RENEWED):
+        for owner_id in set(owner_ids):
+            RankingService.sync_owner(owner_id)
@@ -2,6 +2,7 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from .models import SubscriptionPlan, OwnerSubscription
+from .services import SubscriptionLifecycleService
 from django.utils import timezone
 
 @login_required
@@ -33,18 +34,7 @@ def subscribe(request, plan_id):
     # In a real app, integrate payment gateway here.
     # For this demo, we auto-activate the plan.
     
-    subscription, created = OwnerSubscription.objects.get_or_create(
-        owner=request.user,
-        defaults={'plan': plan, 'start_date': timezone.now()}
-    )
-    
-    if not created:
-        subscription.plan = plan
-        subscription.start_date = timezone.now()
-        subscription.status = 'ACTIVE'
-        # Reset end_date so save() recalculates it
-        subscription.end_date = None 
-        subscription.save()
+    SubscriptionLifecycleService.activate(request.user, plan)
         
     messages.success(request, f"Successfully upgraded to {plan.name} plan!")
     return redirect('subscriptions:plan_list')
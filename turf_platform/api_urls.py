@@ -1,11 +1,12 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from turfs.api_views import TurfViewSet
-from users.api_views import LoginAPIView, VerifyOTPAPIView
+from turfs.api_views import TurfViewSet, AutocompleteAPIView
+from users.api_views import LoginAPIView, VerifyOTPAPIView, TokenRefreshAPIView
 
 from core.api_views import AppConfigAPIView
 
 from turfs.api_partner_views import PartnerRegistrationView
+from turfs.api_upload_views import MediaUploadListView, MediaUploadDetailView, MediaUploadFinalizeView
 
 router = DefaultRouter()
 router.register(r'turfs', TurfViewSet, basename='turfs')
@@ -13,7 +14,12 @@ router.register(r'turfs', TurfViewSet, basename='turfs')
 urlpatterns = [
     path('auth/login/', LoginAPIView.as_view(), name='api_login'),
     path('auth/verify/', VerifyOTPAPIView.as_view(), name='api_verify'),
+    path('auth/refresh/', TokenRefreshAPIView.as_view(), name='api_token_refresh'),
     path('config/', AppConfigAPIView.as_view(), name='api_config'),
+    path('autocomplete/', AutocompleteAPIView.as_view(), name='api_autocomplete'),
     path('partner/register/', PartnerRegistrationView.as_view(), name='api_partner_register'),
+    path('uploads/', MediaUploadListView.as_view(), name='api_uploads'),
+    path('uploads/<uuid:upload_id>/', MediaUploadDetailView.as_view(), name='api_upload_detail'),
+    path('uploads/<uuid:upload_id>/finalize/', MediaUploadFinalizeView.as_view(), name='api_upload_finalize'),
     path('', include(router.urls)),
 ]
@@ -73,12 +73,16 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.ClaimsJWTAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend'
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.api_renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10
 }
@@ -99,6 +103,26 @@ DATABASES = {
     }
 }
 
+# Rate limits, pending OTPs, change counters (ETags, token revocation) and the
+# autocomplete version live in the cache, so every worker process must share it.
+# Set REDIS_URL in production (needs the `redis` package). Without it the
+# local-memory cache is per process, which is only correct with a single worker
+# process (runserver, or gunicorn --workers 1 with threads).
+REDIS_URL = os.environ.get('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -139,6 +163,8 @@ STATICFILES_DIRS = [
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+# Partial files of resumable uploads (turfs.uploads); keep off the public media root
+CHUNKED_UPLOAD_DIR = BASE_DIR / 'tmp_uploads'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -150,7 +176,31 @@ DEMO_MODE = True
 
 # Service Providers (Swappable)
 SMS_PROVIDER = 'core.services.sms.ConsoleSMSProvider'
+# For core.services.sms.HttpGatewaySMSProvider (try it with `manage.py run_fake_sms_gateway`)
+SMS_GATEWAY = {'URL': 'http://127.0.0.1:8025/messages', 'API_KEY': '', 'POOL_SIZE': 4, 'TIMEOUT': 5}
 PAYMENT_PROVIDER = 'core.services.payment.DemoPaymentProvider'
+# Rate limits, "<burst>/<period>" (see core/utils/ratelimit.py)
+RATE_LIMITS = {
+    'otp_request_phone': '3/10m',   # OTPs sent to one number
+    'otp_request_ip': '20/h',
+    'otp_verify_phone': '10/10m',
+    'otp_verify_ip': '60/h',
+    'booking_user': '10/10m',       # slot reservations per user
+    'booking_ip': '30/10m',
+}
+RATE_LIMIT_PROXIES = 0  # Set to the number of trusted reverse proxies to use X-Forwarded-For
+
+# Where issued OTPs are sent (in the background). Add 'core.services.otp.DevFileSink'
+# to also write the latest OTP to OTP_ACTUAL.txt while developing.
+OTP_DELIVERY_SINKS = ['core.services.otp.SMSProviderSink']
+MAPS_LINK_RESOLVER = 'core.services.maps.HttpRedirectResolver'
+MAPS_RESOLVER_TIMEOUT = 5  # seconds; resolution runs in the background, never in a request
+
+# Sessions are read from the cache and only written to the database when they
+# change (login/logout); flash messages live in a cookie instead of the session.
+# Expired rows are removed by `python manage.py clearsessions` (run it daily).
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+MESSAGE_STORAGE = 'django.contrib.messages.storage.cookie.CookieStorage'
 
 # Authentication URLs
 LOGIN_URL = 'users:login'
@@ -1,5 +1,6 @@
 from django.contrib import admin
 from .models import Turf, TurfImage, SportType
+from .services import TurfVisibilityService
 from core.admin_site import admin_site
 
 class TurfImageInline(admin.TabularInline):
@@ -14,11 +15,11 @@ class TurfAdmin(admin.ModelAdmin):
     actions = ['approve_turfs', 'deactivate_turfs']
 
     def approve_turfs(self, request, queryset):
-        queryset.update(is_active=True)
+        TurfVisibilityService.set_active(queryset, True)
     approve_turfs.short_description = "Approve selected turfs"
 
     def deactivate_turfs(self, request, queryset):
-        queryset.update(is_active=False)
+        TurfVisibilityService.set_active(queryset, False)
     deactivate_turfs.short_description = "Deactivate selected turfs"
 
 class SportTypeAdmin(admin.ModelAdmin):
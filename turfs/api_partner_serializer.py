@@ -1,8 +1,10 @@
 from rest_framework import serializers
-from .models import Turf, TurfImage, TurfVideo, SportType
+from .models import Turf, TurfImage, TurfVideo, SportType, MediaUpload
+from .uploads import ChunkedUploadService
 from django.db import transaction
 
 from core.utils.geo import GoogleMapsParser
+from core.services.maps import MapLinkService, INVALID
 
 class PartnerRegistrationSerializer(serializers.ModelSerializer):
     images = serializers.ListField(
@@ -11,6 +13,12 @@ class PartnerRegistrationSerializer(serializers.ModelSerializer):
         required=False
     )
     video = serializers.FileField(write_only=True, required=False)
+    # Finalized resumable uploads (see turfs/uploads.py), used instead of inline files
+    upload_ids = serializers.ListField(
+        child=serializers.UUIDField(),
+        write_only=True,
+        required=False
+    )
     sports_ids = serializers.ListField(
         child=serializers.IntegerField(),
         write_only=True
@@ -22,7 +30,7 @@ class PartnerRegistrationSerializer(serializers.ModelSerializer):
             'name', 'description', 'address', 'city', 
             'latitude', 'longitude', 'map_share_url',
             'price_per_hour', 'amenities', 'sports_ids', 
-            'images', 'video'
+            'images', 'video', 'upload_ids'
         ]
         read_only_fields = ['latitude', 'longitude']
 
@@ -34,8 +42,9 @@ class PartnerRegistrationSerializer(serializers.ModelSerializer):
         if not GoogleMapsParser.is_valid_link(map_url):
             raise serializers.ValidationError({"map_share_url": "Invalid Google Maps link format."})
         
-        lat, lon = GoogleMapsParser.extract_lat_lon(map_url)
-        if lat is None or lon is None:
+        # Unresolved short links are accepted; create() queues their resolution
+        lat, lon, outcome = MapLinkService.locate(map_url)
+        if outcome == INVALID:
             raise serializers.ValidationError({"map_share_url": "Could not extract location from this link. Drop a pin before sharing."})
         
         # Inject extracted coordinates into the data
@@ -43,6 +52,15 @@ class PartnerRegistrationSerializer(serializers.ModelSerializer):
         attrs['longitude'] = lon
         return attrs
 
+    def validate_upload_ids(self, value):
+        uploads = list(MediaUpload.objects.filter(
+            pk__in=value, owner=self.context['request'].user, status='COMPLETE'
+        ))
+        if len(uploads) != len(set(value)):
+            raise serializers.ValidationError("Unknown, unfinished or already used upload.")
+        order = {pk: i for i, pk in enumerate(value)}
+        return sorted(uploads, key=lambda u: order[u.pk])
+
     def validate_video(self, value):
         if value:
             if value.size > 20 * 1024 * 1024:
@@ -54,9 +72,12 @@ class PartnerRegistrationSerializer(serializers.ModelSerializer):
         images_data = validated_data.pop('images', [])
         video_data = validated_data.pop('video', None)
         sports_ids = validated_data.pop('sports_ids', [])
+        uploads = validated_data.pop('upload_ids', [])
         
         owner = self.context['request'].user
         turf = Turf.objects.create(owner=owner, **validated_data)
+        if turf.latitude is None and turf.map_share_url:
+            transaction.on_commit(lambda: MapLinkService.resolve_async(turf.map_share_url))
         turf.sports.set(sports_ids)
         
         for image_data in images_data:
@@ -64,5 +85,11 @@ class PartnerRegistrationSerializer(serializers.ModelSerializer):
             
         if video_data:
             TurfVideo.objects.create(turf=turf, video=video_data)
+
+        has_cover = bool(images_data)
+        for upload in uploads:
+            is_cover = upload.kind == 'IMAGE' and not has_cover
+            ChunkedUploadService.attach(upload, turf, is_cover=is_cover)
+            has_cover = has_cover or is_cover
             
         return turf
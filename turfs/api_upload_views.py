@@ -0,0 +1,123 @@
+from django.shortcuts import get_object_or_404
+from rest_framework import views, status, response, permissions, serializers
+
+from .models import MediaUpload, Turf
+from .uploads import ChunkedUploadService, UploadError, CHUNK_SIZE
+
+
+class MediaUploadCreateSerializer(serializers.Serializer):
+    kind = serializers.ChoiceField(choices=MediaUpload.KIND_CHOICES)
+    filename = serializers.CharField(max_length=255)
+    size = serializers.IntegerField(min_value=1)
+
+
+class MediaUploadFinalizeSerializer(serializers.Serializer):
+    turf = serializers.IntegerField(required=False)
+    is_cover = serializers.BooleanField(default=False)
+
+
+def upload_payload(upload):
+    return {
+        "id": str(upload.id),
+        "kind": upload.kind,
+        "filename": upload.filename,
+        "size": upload.size,
+        "offset": upload.offset,
+        "status": upload.status,
+        "chunk_size": CHUNK_SIZE,
+        "expires_at": upload.expires_at,
+    }
+
+
+def error_response(error):
+    return response.Response({"error": str(error)}, status=error.status)
+
+
+class MediaUploadListView(views.APIView):
+    """
+    Starts a resumable upload for a turf image or video.
+    Endpoint: /api/v1/uploads/
+    Method: POST {"kind": "IMAGE" | "VIDEO", "filename": "...", "size": <bytes>}
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, format=None):
+        serializer = MediaUploadCreateSerializer(data=request.data)
+        if not serializer.is_valid():
+            return response.Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            upload = ChunkedUploadService.start(request.user, **serializer.validated_data)
+        except UploadError as e:
+            return error_response(e)
+        resp = response.Response(upload_payload(upload), status=status.HTTP_201_CREATED)
+        resp['Location'] = request.build_absolute_uri(f'{upload.id}/')
+        return resp
+
+
+class MediaUploadDetailView(views.APIView):
+    """
+    Endpoint: /api/v1/uploads/<id>/
+    GET: upload state; `offset` is where the next chunk must start.
+    PATCH: raw chunk bytes (any content type) with header Upload-Offset: <offset>.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_upload(self, request, upload_id):
+        return get_object_or_404(MediaUpload, pk=upload_id, owner_id=request.user.pk)
+
+    def get(self, request, upload_id, format=None):
+        upload = self.get_upload(request, upload_id)
+        resp = response.Response(upload_payload(upload))
+        resp['Upload-Offset'] = str(upload.offset)
+        return resp
+
+    def patch(self, request, upload_id, format=None):
+        upload = self.get_upload(request, upload_id)
+        try:
+            offset = int(request.headers.get('Upload-Offset', ''))
+            length = int(request.META.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            return response.Response(
+                {"error": "Upload-Offset and Content-Length headers are required."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if length <= 0:
+            return response.Response({"error": "Empty chunk."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            # Read the body straight from the socket; request.data would buffer it all
+            ChunkedUploadService.append(upload, offset, request.stream, length)
+        except UploadError as e:
+            resp = error_response(e)
+            resp['Upload-Offset'] = str(upload.offset)
+            return resp
+        resp = response.Response(upload_payload(upload))
+        resp['Upload-Offset'] = str(upload.offset)
+        return resp
+
+
+class MediaUploadFinalizeView(views.APIView):
+    """
+    Completes an upload. With `turf`, the file is attached to that turf (which the
+    caller must own) as a TurfImage/TurfVideo; without it the upload can be passed
+    to /api/v1/partner/register/ as one of `upload_ids`.
+    Endpoint: /api/v1/uploads/<id>/finalize/
+    Method: POST {"turf": <id>, "is_cover": false}
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, upload_id, format=None):
+        upload = get_object_or_404(MediaUpload, pk=upload_id, owner_id=request.user.pk)
+        serializer = MediaUploadFinalizeSerializer(data=request.data)
+        if not serializer.is_valid():
+            return response.Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        turf_id = serializer.validated_data.get('turf')
+        turf = get_object_or_404(Turf, pk=turf_id, owner_id=request.user.pk) if turf_id else None
+        try:
+            ChunkedUploadService.finalize(upload)
+            if turf is not None:
+                ChunkedUploadService.attach(upload, turf, is_cover=serializer.validated_data['is_cover'])
+        except UploadError as e:
+            return error_response(e)
+        return response.Response(upload_payload(upload))
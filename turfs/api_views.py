@@ -1,8 +1,25 @@
-from rest_framework import viewsets, filters
+from rest_framework import viewsets, filters, views
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.exceptions import NotFound, ValidationError
 from django_filters.rest_framework import DjangoFilterBackend
 from .models import Turf
-from .serializers import TurfListSerializer, TurfDetailSerializer
+from .serializers import TurfListSerializer, TurfDetailSerializer, TurfListProjection, parse_field_list
+from .services import TurfDetailService
+from .search import TurfSearchService
+from .autocomplete import TurfAutocomplete
+from core.api_pagination import KeysetCursorPagination
 from core.services.location import LocationService
+from core.services.versioning import VersionService, turf_key
+from core.utils.conditional import make_etag, not_modified_response, request_variant, set_validators
+
+class TurfSearchFilter(filters.SearchFilter):
+    """?search= backed by the full-text index: ranked, prefix matching, covers sports and amenities."""
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '')
+        if not query.strip():
+            return queryset
+        return TurfSearchService.filter(queryset, query)
 
 class TurfViewSet(viewsets.ReadOnlyModelViewSet):
     """
@@ -10,11 +27,14 @@ class TurfViewSet(viewsets.ReadOnlyModelViewSet):
     Supports:
     - Nearby filtering (?lat=x&long=y&radius=5)
     - Standard filtering (?city=x&sports__name=y&min_price=0&max_price=1000)
+    - Cursor pagination (?cursor=...) ranked by subscription tier, or by distance for nearby queries
+    - Sparse fieldsets (?fields=id,name,price_per_hour,cover_image&expand=sports)
     """
     queryset = Turf.objects.filter(is_active=True)
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    pagination_class = KeysetCursorPagination
+    filter_backends = [DjangoFilterBackend, TurfSearchFilter, filters.OrderingFilter]
     filterset_fields = ['city', 'sports__name']
-    search_fields = ['name', 'address', 'city']
+    search_fields = ['name', 'city', 'address', 'amenities', 'sports__name']
     ordering_fields = ['price_per_hour', 'created_at', 'distance']
 
     def get_queryset(self):
@@ -44,7 +64,103 @@ class TurfViewSet(viewsets.ReadOnlyModelViewSet):
                 
         return queryset
 
+    def get_keyset_ordering(self, queryset):
+        """
+        Sort key for cursor pagination: an explicit ?ordering=, else distance for
+        nearby queries, else search relevance, else subscription tier then recency.
+        `id` breaks ties.
+        """
+        has_distance = 'distance' in queryset.query.annotations
+        ordering = []
+        if self.request.query_params.get('ordering'):
+            ordering = filters.OrderingFilter().get_ordering(self.request, queryset, self) or []
+            ordering = [f for f in ordering if has_distance or f.lstrip('-') != 'distance']
+        if not ordering:
+            if has_distance:
+                ordering = ['distance']
+            elif 'search_rank' in queryset.query.annotations:
+                ordering = ['-search_rank', '-ranking_tier', '-created_at']
+            else:
+                ordering = ['-ranking_tier', '-created_at']
+        return [*ordering, '-id']
+
+    def list(self, request, *args, **kwargs):
+        """
+        Same payload as TurfListSerializer, built from .values() rows (see TurfListProjection).
+        ?fields=id,name,cover_image limits the output and what is fetched; relations
+        then render as ids unless listed in ?expand=.
+        """
+        fields, expand = TurfListProjection.plan(request.query_params.get('fields'), request.query_params.get('expand'))
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = TurfListProjection.values(queryset, fields, ordering=self.get_keyset_ordering(queryset))
+        page = self.paginate_queryset(rows)
+        if page is None:
+            return Response(TurfListProjection.serialize(rows, request, fields, expand))
+        return self.get_paginated_response(TurfListProjection.serialize(page, request, fields, expand))
+
+    # Query params that make get_queryset() filter or annotate the detail lookup
+    DETAIL_QUERY_PARAMS = ('lat', 'long', 'min_price', 'max_price', 'city', 'sports__name', 'search')
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Turf detail with ETag / Last-Modified validators driven by the turf's change
+        counter, so an unchanged turf costs one version lookup and a 304.
+        The body comes from the per-version cached representation.
+        """
+        turf_id = kwargs[self.lookup_url_kwarg or self.lookup_field]
+        key = turf_key(turf_id)
+        state = VersionService.get(key, create=False)
+        if state is None and str(turf_id).isdigit() and Turf.objects.filter(pk=turf_id).exists():
+            # First request since the counter was introduced
+            state = VersionService.get(key)
+        if state is None:
+            return super().retrieve(request, *args, **kwargs)
+
+        # Read before serializing: a concurrent change then yields a stale ETag, never stale content
+        version, modified = state
+        etag = make_etag('turf', turf_id, version, request.accepted_renderer.format, request_variant(request))
+        not_modified = not_modified_response(request, etag, modified)
+        if not_modified is not None:
+            return not_modified
+
+        distance = None
+        if any(p in request.query_params for p in self.DETAIL_QUERY_PARAMS):
+            # Filters (and the nearby radius) still apply to the lookup itself
+            instance = self.get_object()
+            distance = getattr(instance, 'distance', None)
+            data = TurfDetailService.get_representation(instance.pk, version)
+        else:
+            data = TurfDetailService.get_representation(turf_id, version)
+        if data is None:
+            raise NotFound()
+
+        data = TurfDetailService.localize(data, request, distance=distance)
+        fields = parse_field_list(request.query_params.get('fields'))
+        if fields:
+            unknown = [name for name in fields if name not in TurfDetailSerializer.Meta.fields]
+            if unknown:
+                raise ValidationError({'fields': [f"Unknown field(s): {', '.join(unknown)}."]})
+            data = {name: value for name, value in data.items() if name in fields}
+        response = Response(data)
+        return set_validators(response, etag, modified)
+
     def get_serializer_class(self):
         if self.action == 'retrieve':
             return TurfDetailSerializer
         return TurfListSerializer
+
+class AutocompleteAPIView(views.APIView):
+    """
+    Search-as-you-type suggestions for cities, turf names and sports.
+    Endpoint: /api/v1/autocomplete/?q=che&limit=5
+    Served from an in-memory prefix index; no database access per keystroke.
+    """
+    permission_classes = [AllowAny]
+    authentication_classes = []
+
+    def get(self, request):
+        try:
+            limit = min(max(int(request.query_params.get('limit', 5)), 1), 20)
+        except ValueError:
+            limit = 5
+        return Response(TurfAutocomplete.suggest(request.query_params.get('q', ''), limit=limit))
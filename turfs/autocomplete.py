@@ -0,0 +1,254 @@
+"""
+In-memory prefix index for search-as-you-type.
+
+Holds cities, active turf names and sport names in a sorted list and answers
+prefix lookups with bisect, so keystrokes never reach the database. The index is
+built lazily once per process and patched incrementally by the signals in
+turfs/signals.py once the writing transaction commits. Rebuilds query the
+database without holding the lock, so lookups keep being served from the old
+index meanwhile. Every change also bumps a version in the Django cache; other
+processes sharing that cache notice the bump and rebuild on their next lookup.
+Writes that bypass signals (queryset.update) should call invalidate(); bulk
+is_active changes go through TurfVisibilityService.set_active(), which does.
+"""
+import bisect
+import threading
+import time
+import unicodedata
+from collections import Counter
+
+from django.core.cache import cache
+
+VERSION_CACHE_KEY = 'turfs:autocomplete:version'
+# Safety net for changes made outside signals in other processes with a per-process cache
+MAX_AGE_SECONDS = 300
+# Upper bound on index entries examined per lookup, keeps 1-letter queries O(1)
+MAX_SCAN = 500
+
+KIND_CITY = 'city'
+KIND_TURF = 'turf'
+KIND_SPORT = 'sport'
+
+
+def normalize(text):
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    return ' '.join(text.casefold().split())
+
+
+def word_starts(text):
+    """'green park arena' -> ['green park arena', 'park arena', 'arena']"""
+    words = text.split(' ')
+    return [' '.join(words[i:]) for i in range(len(words)) if words[i]]
+
+
+class PrefixIndex:
+    """Sorted (key, kind, ref) tuples; one key per word start so 'are' finds 'Green Arena'."""
+    def __init__(self):
+        self._keys = []
+
+    def add(self, text, kind, ref):
+        for key in word_starts(normalize(text)):
+            bisect.insort(self._keys, (key, kind, ref))
+
+    def remove(self, text, kind, ref):
+        for key in word_starts(normalize(text)):
+            i = bisect.bisect_left(self._keys, (key, kind, ref))
+            if i < len(self._keys) and self._keys[i] == (key, kind, ref):
+                del self._keys[i]
+
+    def search(self, prefix):
+        """Yields (kind, ref) for keys starting with `prefix`, in key order."""
+        i = bisect.bisect_left(self._keys, (prefix,))
+        end = min(len(self._keys), i + MAX_SCAN)
+        while i < end and self._keys[i][0].startswith(prefix):
+            yield self._keys[i][1], self._keys[i][2]
+            i += 1
+
+    def __len__(self):
+        return len(self._keys)
+
+
+class TurfAutocomplete:
+    _lock = threading.RLock()
+    _rebuild_lock = threading.Lock()
+    _index = None
+    _turfs = {}           # turf id -> (name, city)
+    _sports = {}          # sport id -> (name, icon)
+    _city_counts = Counter()  # normalized city -> number of active turfs
+    _city_labels = {}     # normalized city -> display label
+    _version = None
+    _built_at = 0.0
+
+    # --- Lookups ---
+
+    @classmethod
+    def suggest(cls, query, limit=5):
+        prefix = normalize(query)
+        result = {'cities': [], 'turfs': [], 'sports': []}
+        if not prefix:
+            return result
+        seen = set()
+        cls._ensure_fresh()
+        with cls._lock:
+            for kind, ref in cls._index.search(prefix):
+                if (kind, ref) in seen:
+                    continue
+                seen.add((kind, ref))
+                if kind == KIND_CITY and len(result['cities']) < limit:
+                    result['cities'].append(cls._city_labels[ref])
+                elif kind == KIND_TURF and len(result['turfs']) < limit:
+                    name, city = cls._turfs[ref]
+                    result['turfs'].append({'id': ref, 'name': name, 'city': city})
+                elif kind == KIND_SPORT and len(result['sports']) < limit:
+                    result['sports'].append({'id': ref, 'name': cls._sports[ref][0]})
+        return result
+
+    @classmethod
+    def cities(cls):
+        """Distinct cities with at least one active turf, alphabetically."""
+        cls._ensure_fresh()
+        with cls._lock:
+            return sorted(cls._city_labels.values(), key=normalize)
+
+    @classmethod
+    def sports(cls):
+        cls._ensure_fresh()
+        with cls._lock:
+            return [{'id': pk, 'name': name, 'icon': icon} for pk, (name, icon) in sorted(cls._sports.items())]
+
+    # --- Maintenance ---
+
+    @classmethod
+    def rebuild(cls):
+        from .models import Turf, SportType
+        # Read before querying: a change committed meanwhile bumps it and forces another rebuild
+        version = cache.get(VERSION_CACHE_KEY)
+        turfs = list(Turf.objects.filter(is_active=True).values_list('id', 'name', 'city'))
+        sports = list(SportType.objects.values_list('id', 'name', 'icon'))
+        with cls._lock:
+            cls._index = PrefixIndex()
+            cls._turfs, cls._sports = {}, {}
+            cls._city_counts, cls._city_labels = Counter(), {}
+            for pk, name, city in turfs:
+                cls._add_turf(pk, name, city)
+            for pk, name, icon in sports:
+                cls._add_sport(pk, name, icon)
+            cls._version = version
+            cls._built_at = time.monotonic()
+
+    @classmethod
+    def invalidate(cls):
+        """Forces every process to rebuild on its next lookup."""
+        cls._bump_version()
+        with cls._lock:
+            cls._built_at = float('-inf')
+
+    @classmethod
+    def turf_changed(cls, turf):
+        with cls._lock:
+            if cls._index is not None:
+                cls._remove_turf(turf.pk)
+                if turf.is_active:
+                    cls._add_turf(turf.pk, turf.name, turf.city)
+            cls._sync_version()
+
+    @classmethod
+    def turf_deleted(cls, turf_id):
+        with cls._lock:
+            if cls._index is not None:
+                cls._remove_turf(turf_id)
+            cls._sync_version()
+
+    @classmethod
+    def sport_changed(cls, sport):
+        with cls._lock:
+            if cls._index is not None:
+                cls._remove_sport(sport.pk)
+                cls._add_sport(sport.pk, sport.name, sport.icon)
+            cls._sync_version()
+
+    @classmethod
+    def sport_deleted(cls, sport_id):
+        with cls._lock:
+            if cls._index is not None:
+                cls._remove_sport(sport_id)
+            cls._sync_version()
+
+    @classmethod
+    def _ensure_fresh(cls):
+        with cls._lock:
+            if not cls._is_stale():
+                return
+            first_build = cls._index is None
+        # One thread rebuilds; the others keep answering from the old index, if there is one
+        if not cls._rebuild_lock.acquire(blocking=first_build):
+            return
+        try:
+            with cls._lock:
+                stale = cls._is_stale()
+            if stale:
+                cls.rebuild()
+        finally:
+            cls._rebuild_lock.release()
+
+    # --- Internals (callers hold the lock) ---
+
+    @classmethod
+    def _is_stale(cls):
+        return (
+            cls._index is None
+            or time.monotonic() - cls._built_at > MAX_AGE_SECONDS
+            or cache.get(VERSION_CACHE_KEY) != cls._version
+        )
+
+    @classmethod
+    def _bump_version(cls):
+        try:
+            return cache.incr(VERSION_CACHE_KEY)
+        except ValueError:
+            cache.add(VERSION_CACHE_KEY, 1, timeout=None)
+            return cache.get(VERSION_CACHE_KEY)
+
+    @classmethod
+    def _sync_version(cls):
+        # Our copy already reflects this change, so only other processes need to rebuild
+        previous = cache.get(VERSION_CACHE_KEY)
+        version = cls._bump_version()
+        if cls._index is not None and previous == cls._version:
+            cls._version = version
+
+    @classmethod
+    def _add_turf(cls, pk, name, city):
+        cls._turfs[pk] = (name, city)
+        cls._index.add(name, KIND_TURF, pk)
+        key = normalize(city)
+        if key:
+            if cls._city_counts[key] == 0:
+                cls._city_labels[key] = city.strip()
+                cls._index.add(city, KIND_CITY, key)
+            cls._city_counts[key] += 1
+
+    @classmethod
+    def _remove_turf(cls, pk):
+        if pk not in cls._turfs:
+            return
+        name, city = cls._turfs.pop(pk)
+        cls._index.remove(name, KIND_TURF, pk)
+        key = normalize(city)
+        if key and cls._city_counts[key] > 0:
+            cls._city_counts[key] -= 1
+            if cls._city_counts[key] == 0:
+                del cls._city_counts[key]
+                cls._index.remove(cls._city_labels.pop(key), KIND_CITY, key)
+
+    @classmethod
+    def _add_sport(cls, pk, name, icon):
+        cls._sports[pk] = (name, icon)
+        cls._index.add(name, KIND_SPORT, pk)
+
+    @classmethod
+    def _remove_sport(cls, pk):
+        if pk in cls._sports:
+            name, _ = cls._sports.pop(pk)
+            cls._index.remove(name, KIND_SPORT, pk)
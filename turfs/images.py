@@ -0,0 +1,160 @@
+"""
+Resized derivatives for turf photos.
+
+Owners upload full-size phone photos; list cards and thumbnails only need a
+fraction of those pixels. For every TurfImage we write a thumbnail and a card
+size, each as JPEG and WebP, next to the original (turf_images/abc.jpg ->
+turf_images/abc.card.webp) and record them in TurfImage.derivatives:
+
+    {"v": 1, "source": "turf_images/abc.jpg", "width": 4032, "height": 3024,
+     "items": {"card": {"name": "turf_images/abc.card.jpg", "width": 800,
+                        "height": 600, "format": "JPEG", "bytes": 61234}, ...}}
+
+Generation runs on a small background pool after the upload commits (see the
+signals in turfs/signals.py), so requests never pay for it. A manifest whose
+source no longer matches the image is treated as missing.
+
+Originals live in the content-addressed storage (core.storage), so identical
+uploads share one original; their derivatives are plain files in the default
+storage named after it, and are shared the same way.
+"""
+import io
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection
+from PIL import Image, ImageOps
+
+logger = logging.getLogger('django')
+
+MANIFEST_VERSION = 1
+
+# name -> (max width, max height, crop to exactly that box)
+SIZES = {
+    'thumb': (320, 240, True),
+    'card': (800, 600, False),
+}
+FORMATS = {
+    '': ('JPEG', 'jpg', {'quality': 82, 'optimize': True, 'progressive': True}),
+    '_webp': ('WEBP', 'webp', {'quality': 80, 'method': 4}),
+}
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='turf-image-derivatives')
+
+
+def derivative_name(manifest, source, size):
+    """Storage name of the `size` derivative from `manifest`, or None if it isn't current."""
+    return current_items(manifest, source).get(size)
+
+
+def current_items(manifest, source):
+    """{size: storage name} of the derivatives in `manifest`, empty if it isn't current."""
+    if not manifest or manifest.get('v') != MANIFEST_VERSION or manifest.get('source') != source:
+        return {}
+    return {size: item['name'] for size, item in manifest.get('items', {}).items()}
+
+
+def derivative_names(manifest):
+    return [item['name'] for item in (manifest or {}).get('items', {}).values()]
+
+
+class ImageDerivativeService:
+    @staticmethod
+    def is_current(image):
+        return derivative_name(image.derivatives, image.image.name, 'card') is not None
+
+    @staticmethod
+    def render(original, width, height, crop, fmt, options):
+        img = original.copy()
+        if crop:
+            img = ImageOps.fit(img, (width, height), Image.Resampling.LANCZOS)
+        else:
+            img.thumbnail((width, height), Image.Resampling.LANCZOS)
+        buffer = io.BytesIO()
+        img.save(buffer, fmt, **options)
+        return img.size, buffer.getvalue()
+
+    @staticmethod
+    def generate(image):
+        """
+        Writes every derivative for a TurfImage and stores the manifest.
+        Returns the manifest. Saved with update() so no save signals fire.
+        """
+        from .models import TurfImage
+
+        field = image.image
+        storage = default_storage
+        stem = os.path.splitext(field.name)[0]
+
+        sibling = TurfImage.objects.filter(image=field.name).exclude(pk=image.pk).exclude(derivatives={}).first()
+        if sibling is not None and ImageDerivativeService.is_current(sibling):
+            # Same original uploaded before: reuse its derivatives
+            return ImageDerivativeService.save_manifest(image, sibling.derivatives)
+        largest = max(w for w, _, _ in SIZES.values()), max(h for _, h, _ in SIZES.values())
+
+        with field.storage.open(field.name, 'rb') as fh:
+            original = Image.open(fh)
+            width, height = original.size
+            # Lets the JPEG decoder downscale by 1/2..1/8 while decoding phone photos
+            original.draft('RGB', largest)
+            original = ImageOps.exif_transpose(original)
+            if original.mode != 'RGB':
+                original = original.convert('RGB')
+            original.load()
+
+        old_names = derivative_names(image.derivatives)
+        items = {}
+        for size, (max_w, max_h, crop) in SIZES.items():
+            for suffix, (fmt, ext, options) in FORMATS.items():
+                (w, h), data = ImageDerivativeService.render(original, max_w, max_h, crop, fmt, options)
+                name = f'{stem}.{size}.{ext}'
+                if storage.exists(name):
+                    storage.delete(name)
+                saved = storage.save(name, ContentFile(data))
+                items[f'{size}{suffix}'] = {'name': saved, 'width': w, 'height': h, 'format': fmt, 'bytes': len(data)}
+
+        manifest = {'v': MANIFEST_VERSION, 'source': field.name, 'width': width, 'height': height, 'items': items}
+        ImageDerivativeService.save_manifest(image, manifest)
+        ImageDerivativeService.delete_files([n for n in old_names if n not in derivative_names(manifest)])
+        return manifest
+
+    @staticmethod
+    def save_manifest(image, manifest):
+        from core.services.versioning import VersionService, turf_key
+        from .models import TurfImage
+        TurfImage.objects.filter(pk=image.pk).update(derivatives=manifest)
+        image.derivatives = manifest
+        VersionService.bump(turf_key(image.turf_id))
+        return manifest
+
+    @staticmethod
+    def generate_by_id(image_id):
+        from .models import TurfImage
+        image = TurfImage.objects.filter(pk=image_id).first()
+        if image is None or not image.image or ImageDerivativeService.is_current(image):
+            return None
+        return ImageDerivativeService.generate(image)
+
+    @staticmethod
+    def generate_async(image_id):
+        """Queues generation on the background pool."""
+        def _run():
+            try:
+                ImageDerivativeService.generate_by_id(image_id)
+            except Exception:
+                logger.exception("Generating derivatives for turf image %s failed", image_id)
+            finally:
+                connection.close()
+
+        _executor.submit(_run)
+
+    @staticmethod
+    def delete_files(names):
+        for name in names:
+            try:
+                default_storage.delete(name)
+            except Exception:
+                logger.warning("Could not delete image derivative %s", name)
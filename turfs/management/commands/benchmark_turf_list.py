@@ -0,0 +1,71 @@
+"""
+Django management command to benchmark the turf list read path.
+
+Serializes the same active turfs with TurfListSerializer + JSONRenderer and with
+TurfListProjection + FastJSONRenderer, checks that both produce the same bytes
+on the real data and reports throughput in rows/sec. Equivalence is guarded by
+TurfListProjectionTests in turfs/tests.py.
+
+Usage:
+    python manage.py benchmark_turf_list
+    python manage.py benchmark_turf_list --rows 500 --repeat 20
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from core.api_renderers import FastJSONRenderer, orjson
+from turfs.models import Turf
+from turfs.serializers import TurfListSerializer, TurfListProjection
+
+
+class Command(BaseCommand):
+    help = 'Compares TurfListSerializer with the lean TurfListProjection path'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=200, help='Number of turfs per run')
+        parser.add_argument('--repeat', type=int, default=10, help='Timed runs per path (best one is reported)')
+
+    def handle(self, *args, **options):
+        request = Request(RequestFactory().get('/api/v1/turfs/', SERVER_NAME='bench.local'))
+        queryset = Turf.objects.filter(is_active=True).order_by('-id')
+        queryset = queryset[:options['rows']]
+
+        def serializer_path():
+            data = TurfListSerializer(queryset, many=True, context={'request': request}).data
+            return JSONRenderer().render(data)
+
+        def lean_path():
+            data = TurfListProjection.serialize(TurfListProjection.values(queryset), request)
+            return FastJSONRenderer().render(data)
+
+        rows = queryset.count()
+        if not rows:
+            raise CommandError('No active turfs to benchmark.')
+        if serializer_path() != lean_path():
+            raise CommandError('Lean output differs from TurfListSerializer output.')
+
+        self.stdout.write(f'{rows} rows, {options["repeat"]} runs each, orjson {"on" if orjson else "off"}')
+        results = {}
+        for label, run in (('serializer', serializer_path), ('lean', lean_path)):
+            best = None
+            for _ in range(max(options['repeat'], 1)):
+                with CaptureQueriesContext(connection) as ctx:
+                    start = time.perf_counter()
+                    run()
+                    elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            results[label] = rows / best
+            self.stdout.write(
+                f'  {label:<10} {rows / best:>10.0f} rows/sec  {best * 1000:>8.1f} ms  {len(ctx.captured_queries)} queries'
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Output identical. Lean path is {results["lean"] / results["serializer"]:.1f}x faster.'
+        ))
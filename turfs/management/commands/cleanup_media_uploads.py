@@ -0,0 +1,24 @@
+"""
+Django management command to remove expired resumable uploads.
+
+Deletes upload sessions past their expiry that were never attached to a turf,
+together with their partial temp files. Finalized-but-unused files are then
+unreferenced and get reclaimed by gc_media_blobs.
+
+Usage:
+    python manage.py cleanup_media_uploads
+
+Recommended: Run this hourly via cron or Celery Beat
+    0 * * * * cd /path/to/project && python manage.py cleanup_media_uploads
+"""
+
+from django.core.management.base import BaseCommand
+from turfs.uploads import ChunkedUploadService
+
+
+class Command(BaseCommand):
+    help = 'Deletes expired, unattached media upload sessions and their files'
+
+    def handle(self, *args, **options):
+        count = ChunkedUploadService.cleanup()
+        self.stdout.write(self.style.SUCCESS(f'Removed {count} expired upload(s).'))
@@ -0,0 +1,51 @@
+"""
+Django management command to generate thumbnail/card derivatives for turf images.
+
+New uploads are processed in the background automatically; run this once to
+backfill existing images, or with --force after changing the sizes in turfs/images.py.
+
+Usage:
+    python manage.py generate_image_derivatives
+    python manage.py generate_image_derivatives --force
+    python manage.py generate_image_derivatives --turf 12
+"""
+
+from django.core.management.base import BaseCommand
+from turfs.images import ImageDerivativeService
+from turfs.models import TurfImage
+
+
+class Command(BaseCommand):
+    help = 'Generates resized JPEG/WebP derivatives for turf images'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Regenerate images that already have derivatives')
+        parser.add_argument('--turf', type=int, help='Only process images of this turf')
+
+    def handle(self, *args, **options):
+        images = TurfImage.objects.exclude(image='').order_by('pk')
+        if options['turf']:
+            images = images.filter(turf_id=options['turf'])
+
+        generated = skipped = failed = 0
+        saved_bytes = 0
+        for image in images.iterator(chunk_size=200):
+            if not options['force'] and ImageDerivativeService.is_current(image):
+                skipped += 1
+                continue
+            try:
+                manifest = ImageDerivativeService.generate(image)
+            except Exception as e:
+                failed += 1
+                self.stdout.write(self.style.ERROR(f'Image #{image.pk} ({image.image.name}): {e}'))
+                continue
+            generated += 1
+            try:
+                saved_bytes += image.image.size - manifest['items']['card']['bytes']
+            except OSError:
+                pass
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Generated {generated}, skipped {skipped}, failed {failed}. '
+            f'Card images are {saved_bytes / 1024:.0f} KB smaller than the originals in total.'
+        ))
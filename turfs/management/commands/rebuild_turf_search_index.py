@@ -0,0 +1,26 @@
+"""
+Django management command to rebuild the turf full-text search index.
+
+The index is normally kept in sync by signals; run this after bulk imports
+that bypass save() (e.g. bulk_create, raw SQL) or after restoring a backup.
+
+Usage:
+    python manage.py rebuild_turf_search_index
+"""
+
+from django.core.management.base import BaseCommand
+from turfs.search import TurfSearchService
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the full-text search index for all turfs'
+
+    def handle(self, *args, **options):
+        if not TurfSearchService.is_supported():
+            self.stdout.write(self.style.WARNING(
+                'This database has no search index (requires SQLite FTS5 or PostgreSQL). Search uses icontains.'
+            ))
+            return
+
+        count = TurfSearchService.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Indexed {count} turf(s).'))
@@ -0,0 +1,29 @@
+"""
+Django management command to keep Turf.ranking_tier in line with subscriptions.
+
+Subscription changes update ranking_tier immediately, but nothing happens when a
+subscription's end_date simply passes. This drops the turfs of lapsed
+subscriptions back to tier 0 (and repairs any other drift, e.g. after bulk
+imports) so listings stop ranking them as featured.
+
+Usage:
+    python manage.py refresh_ranking_tiers
+
+Recommended: Run this every 5 minutes via cron or Celery Beat
+    */5 * * * * cd /path/to/project && python manage.py refresh_ranking_tiers
+"""
+
+from django.core.management.base import BaseCommand
+
+from turfs.services import RankingService
+
+
+class Command(BaseCommand):
+    help = 'Resets ranking_tier for turfs whose owner subscription has ended or changed'
+
+    def handle(self, *args, **options):
+        changed = RankingService.refresh_all()
+        if changed:
+            self.stdout.write(self.style.SUCCESS(f'Updated ranking tier of {changed} turf(s).'))
+        else:
+            self.stdout.write(self.style.SUCCESS('All ranking tiers are current.'))
@@ -0,0 +1,171 @@
+"""
+Django management command to fill in coordinates for turfs that have a Google
+Maps link but no latitude/longitude (added via the owner form, the admin or
+populate_data.py). Such turfs never show up in nearby searches.
+
+Full links are parsed directly. Short links are served from the resolution cache
+where possible, and the rest are resolved concurrently on a bounded thread pool,
+rate limited across all workers and retried with backoff. Coordinates are written
+back in bulk. Links are also resolved in the background right after
+registration; this picks up anything that was lost (e.g. a restart), imported,
+or is due for a retry.
+
+Usage:
+    python manage.py resolve_map_links
+    python manage.py resolve_map_links --workers 16 --rate 20 --retries 3
+    python manage.py resolve_map_links --force   # ignore cached failures
+
+Recommended: Run this hourly via cron or Celery Beat
+    15 * * * * cd /path/to/project && python manage.py resolve_map_links
+"""
+
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.services.maps import MapLinkService
+from core.services.versioning import VersionService, APP_CONFIG_KEY, turf_key
+from core.utils import get_map_link_resolver
+from core.utils.geo import GoogleMapsParser
+from turfs.models import Turf
+
+WRITE_BATCH_SIZE = 500
+
+
+class RequestPacer:
+    """Spaces requests at least 1/rate seconds apart across all worker threads."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate > 0 else 0
+        self.next_slot = time.monotonic()
+        self.lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class Command(BaseCommand):
+    help = 'Fills in coordinates for turfs whose Google Maps link has not been resolved'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=8, help='Concurrent requests (default 8)')
+        parser.add_argument('--rate', type=float, default=10, help='Max requests per second over all workers, 0 for no limit (default 10)')
+        parser.add_argument('--retries', type=int, default=2, help='Retries per link after a network error (default 2)')
+        parser.add_argument('--force', action='store_true', help='Retry links whose failure is still negative-cached')
+
+    def handle(self, *args, **options):
+        turfs_by_url = defaultdict(list)
+        pending = (
+            Turf.objects.filter(latitude__isnull=True)
+            .exclude(map_share_url__isnull=True).exclude(map_share_url='')
+            .values_list('pk', 'map_share_url')
+        )
+        for pk, url in pending.iterator():
+            turfs_by_url[url].append(pk)
+        if not turfs_by_url:
+            self.stdout.write(self.style.SUCCESS('No turfs are missing coordinates.'))
+            return
+
+        coordinates = {}   # url -> (lat, lon)
+        counts = {'RESOLVED': 0, 'NO_COORDINATES': 0, 'FAILED': 0, 'CACHED': 0, 'SKIPPED': 0}
+        to_fetch = {}      # url -> cached MapLinkResolution or None
+        for url in turfs_by_url:
+            if not GoogleMapsParser.is_short_link(url):
+                lat, lon = GoogleMapsParser.parse_coordinates(url)
+                if lat is None:
+                    counts['NO_COORDINATES'] += 1
+                else:
+                    coordinates[url] = (lat, lon)
+                    counts['RESOLVED'] += 1
+                continue
+            cached = MapLinkService.lookup(url)
+            if cached is not None and cached.status == 'RESOLVED':
+                coordinates[url] = (cached.latitude, cached.longitude)
+                counts['CACHED'] += 1
+            elif options['force'] or MapLinkService.is_due(cached):
+                to_fetch[url] = cached
+            else:
+                counts['SKIPPED'] += 1
+
+        self.stdout.write(
+            f'{sum(len(ids) for ids in turfs_by_url.values())} turf(s) with {len(turfs_by_url)} distinct link(s); '
+            f'{len(to_fetch)} to resolve over the network.'
+        )
+        if to_fetch:
+            self.fetch_all(to_fetch, coordinates, counts, options)
+
+        updated = self.write_coordinates(turfs_by_url, coordinates)
+        self.stdout.write(self.style.SUCCESS(
+            f"Updated {updated} turf(s). Links: {counts['RESOLVED']} resolved, {counts['CACHED']} from cache, "
+            f"{counts['NO_COORDINATES']} without coordinates, {counts['FAILED']} failed, "
+            f"{counts['SKIPPED']} waiting for retry."
+        ))
+
+    def fetch_all(self, to_fetch, coordinates, counts, options):
+        resolver = get_map_link_resolver()
+        pacer = RequestPacer(options['rate'])
+        retries = max(options['retries'], 0)
+
+        def fetch(url):
+            # Network only; all database writes happen on the main thread
+            for attempt in range(retries + 1):
+                if attempt:
+                    time.sleep(min(0.5 * 2 ** (attempt - 1), 8))
+                pacer.wait()
+                outcome = MapLinkService.fetch(url, resolver=resolver)
+                if outcome['status'] != 'FAILED':
+                    break
+            return outcome
+
+        started = time.monotonic()
+        total = len(to_fetch)
+        report_every = max(total // 20, 1)
+        with ThreadPoolExecutor(max_workers=max(options['workers'], 1), thread_name_prefix='resolve-map-links') as pool:
+            futures = {pool.submit(fetch, url): url for url in to_fetch}
+            for done, future in enumerate(as_completed(futures), start=1):
+                url = futures[future]
+                cached = to_fetch[url]
+                row = MapLinkService.record(url, future.result(), cached)
+                counts[row.status] += 1
+                if row.status == 'RESOLVED':
+                    coordinates[url] = (row.latitude, row.longitude)
+                elif row.status == 'NO_COORDINATES' and (cached is None or cached.status != 'NO_COORDINATES'):
+                    MapLinkService.report_missing(url)
+                elif row.status == 'FAILED':
+                    self.stdout.write(self.style.WARNING(f'  {url}: {row.error}'))
+                if done % report_every == 0 or done == total:
+                    elapsed = time.monotonic() - started
+                    self.stdout.write(f'  {done}/{total} links ({done / elapsed if elapsed else 0:.1f}/s)')
+
+    def write_coordinates(self, turfs_by_url, coordinates):
+        updates = [
+            Turf(pk=pk, latitude=lat, longitude=lon)
+            for url, (lat, lon) in coordinates.items()
+            for pk in turfs_by_url[url]
+        ]
+        updated = 0
+        for start in range(0, len(updates), WRITE_BATCH_SIZE):
+            batch = updates[start:start + WRITE_BATCH_SIZE]
+            with transaction.atomic():
+                # Skip turfs whose coordinates were set while we were resolving
+                still_missing = set(
+                    Turf.objects.filter(pk__in=[t.pk for t in batch], latitude__isnull=True)
+                    .select_for_update().values_list('pk', flat=True)
+                )
+                batch = [t for t in batch if t.pk in still_missing]
+                if batch:
+                    Turf.objects.bulk_update(batch, ['latitude', 'longitude'])
+                    VersionService.bump(APP_CONFIG_KEY, *[turf_key(t.pk) for t in batch])
+            updated += len(batch)
+        return updated
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:17
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('turfs', '0008_turf_rules'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='turf',
+            index=models.Index(fields=['is_active', 'created_at', 'id'], name='turfs_turf_is_acti_dc46ee_idx'),
+        ),
+    ]
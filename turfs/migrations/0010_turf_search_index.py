@@ -0,0 +1,75 @@
+from django.db import migrations
+
+# A frozen copy of the index layout at the time of this migration; later changes
+# to turfs/search.py need a migration of their own.
+FTS_TABLE = 'turfs_turf_fts'
+PG_TABLE = 'turfs_turf_search'
+COLUMNS = ('name', 'city', 'sports', 'address', 'amenities')
+PG_WEIGHTS = {'name': 'A', 'city': 'B', 'sports': 'C', 'address': 'D', 'amenities': 'D'}
+
+
+def create_index(schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        try:
+            schema_editor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+                f"{', '.join(COLUMNS)}, tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+            )
+        except Exception:
+            # SQLite compiled without FTS5: search keeps using icontains
+            return False
+    elif vendor == 'postgresql':
+        schema_editor.execute(
+            f"CREATE TABLE IF NOT EXISTS {PG_TABLE} ("
+            "turf_id bigint PRIMARY KEY REFERENCES turfs_turf(id) ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED, "
+            "document tsvector NOT NULL)"
+        )
+        schema_editor.execute(f"CREATE INDEX IF NOT EXISTS {PG_TABLE}_document_idx ON {PG_TABLE} USING GIN (document)")
+    else:
+        return False
+    return True
+
+
+def index_existing_turfs(apps, schema_editor):
+    Turf = apps.get_model('turfs', 'Turf')
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        sql = f"INSERT INTO {FTS_TABLE} (rowid, {', '.join(COLUMNS)}) VALUES (%s, {', '.join(['%s'] * len(COLUMNS))})"
+    else:
+        vector = ' || '.join(f"setweight(to_tsvector('simple', %s), '{PG_WEIGHTS[c]}')" for c in COLUMNS)
+        sql = f"INSERT INTO {PG_TABLE} (turf_id, document) VALUES (%s, {vector})"
+    with schema_editor.connection.cursor() as cursor:
+        for turf in Turf.objects.prefetch_related('sports').iterator(chunk_size=500):
+            cursor.execute(sql, [
+                turf.pk,
+                turf.name or '',
+                turf.city or '',
+                ' '.join(sport.name for sport in turf.sports.all()),
+                turf.address or '',
+                (turf.amenities or '').replace(',', ' '),
+            ])
+
+
+def forwards(apps, schema_editor):
+    if create_index(schema_editor):
+        index_existing_turfs(apps, schema_editor)
+
+
+def backwards(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+    elif vendor == 'postgresql':
+        schema_editor.execute(f"DROP TABLE IF EXISTS {PG_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('turfs', '0009_turf_turfs_turf_is_acti_dc46ee_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('turfs', '0010_turf_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='turfimage',
+            name='derivatives',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
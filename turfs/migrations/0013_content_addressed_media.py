@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:34
+
+import core.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('turfs', '0012_mediaupload'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='turfimage',
+            name='image',
+            field=models.ImageField(max_length=500, storage=core.storage.content_addressed_storage, upload_to='turf_images/'),
+        ),
+        migrations.AlterField(
+            model_name='turfvideo',
+            name='video',
+            field=models.FileField(help_text='Small promo video (max 15s)', max_length=500, storage=core.storage.content_addressed_storage, upload_to='turf_videos/'),
+        ),
+    ]
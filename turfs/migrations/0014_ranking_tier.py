@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:51
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def fill_ranking_tier(apps, schema_editor):
+    OwnerSubscription = apps.get_model('subscriptions', 'OwnerSubscription')
+    Turf = apps.get_model('turfs', 'Turf')
+    live = OwnerSubscription.objects.filter(status='ACTIVE', end_date__gt=timezone.now())
+    for owner_id, tier in live.values_list('owner_id', 'plan__tier'):
+        Turf.objects.filter(owner_id=owner_id).update(ranking_tier=tier)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('turfs', '0013_content_addressed_media'),
+        ('subscriptions', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='turf',
+            name='ranking_tier',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='turf',
+            index=models.Index(fields=['is_active', 'ranking_tier', 'created_at', 'id'], name='turfs_turf_is_acti_4cae17_idx'),
+        ),
+        migrations.RunPython(fill_ranking_tier, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 19:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('turfs', '0014_ranking_tier'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mediaupload',
+            name='locked_until',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
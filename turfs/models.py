@@ -1,6 +1,8 @@
+import uuid
 from django.db import models
 from django.conf import settings
 from django.utils.translation import gettext_lazy as _
+from core.storage import content_addressed_storage
 
 class SportType(models.Model):
     name = models.CharField(max_length=50)
@@ -27,24 +29,53 @@ class Turf(models.Model):
     is_active = models.BooleanField(default=True)
     is_open_today = models.BooleanField(default=True, help_text="Manual toggle for today's status")
     closed_reason = models.CharField(max_length=255, blank=True, null=True, help_text="Public reason for today's closure")
+    # Plan tier of the owner's live subscription, kept current by RankingService
+    ranking_tier = models.PositiveSmallIntegerField(default=0, editable=False)
     
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Keyset pagination order for listings and the venue directory
+            models.Index(fields=['is_active', 'created_at', 'id']),
+            # Default listing order: subscription tier, then recency
+            models.Index(fields=['is_active', 'ranking_tier', 'created_at', 'id']),
+        ]
+
     def __str__(self):
         return self.name
 
 class TurfImage(models.Model):
     turf = models.ForeignKey(Turf, on_delete=models.CASCADE, related_name='images')
-    image = models.ImageField(upload_to='turf_images/', max_length=500)
+    image = models.ImageField(upload_to='turf_images/', max_length=500, storage=content_addressed_storage)
     is_cover = models.BooleanField(default=False)
+    # Resized copies written by turfs.images; empty until they have been generated
+    derivatives = models.JSONField(default=dict, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
         return f"Image for {self.turf.name}"
 
+    def derivative_url(self, size):
+        """URL of the `size` derivative (e.g. 'card', 'thumb_webp'), falling back to the original."""
+        from .images import derivative_name
+        name = derivative_name(self.derivatives, self.image.name, size)
+        return self.image.storage.url(name) if name else self.image.url
+
+    @property
+    def thumbnail_url(self):
+        return self.derivative_url('thumb')
+
+    @property
+    def card_url(self):
+        return self.derivative_url('card')
+
 class TurfVideo(models.Model):
     turf = models.ForeignKey(Turf, on_delete=models.CASCADE, related_name='videos')
-    video = models.FileField(upload_to='turf_videos/', help_text="Small promo video (max 15s)", max_length=500)
+    video = models.FileField(
+        upload_to='turf_videos/', help_text="Small promo video (max 15s)", max_length=500,
+        storage=content_addressed_storage
+    )
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
@@ -121,3 +152,38 @@ class EmergencyBlock(models.Model):
 
     def __str__(self):
         return f"Emergency Block for {self.turf.name}: {'ACTIVE' if self.is_blocked else 'OFF'}"
+
+class MediaUpload(models.Model):
+    """
+    Resumable chunked upload of a turf image or video.
+    Chunks are appended to a temp file (turfs.uploads); finalizing moves the file
+    into media storage, where it can be attached to a turf as TurfImage/TurfVideo.
+    """
+    KIND_CHOICES = [
+        ('IMAGE', 'Image'),
+        ('VIDEO', 'Video'),
+    ]
+    STATUS_CHOICES = [
+        ('UPLOADING', 'Uploading'),
+        ('COMPLETE', 'Complete'),
+        ('ATTACHED', 'Attached'),
+        ('FAILED', 'Failed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='media_uploads')
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField(help_text="Declared total size in bytes")
+    offset = models.PositiveBigIntegerField(default=0, help_text="Bytes received so far")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='UPLOADING')
+    error = models.CharField(max_length=255, blank=True)
+    stored_name = models.CharField(max_length=500, blank=True, help_text="Media storage path once finalized")
+    # Set while a request is writing or finalizing (turfs.uploads.session_lock)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"{self.get_kind_display()} upload {self.filename} ({self.offset}/{self.size})"
@@ -0,0 +1,168 @@
+"""
+Full-text search index for turfs.
+
+SQLite uses an FTS5 virtual table keyed by turf id; PostgreSQL uses a side table
+holding a weighted tsvector with a GIN index. Both are created by migration
+0010_turf_search_index (which keeps its own frozen copy of the layout) and kept
+in sync by the signals in turfs/signals.py.
+On other backends (or SQLite builds without FTS5) search falls back to icontains.
+"""
+import re
+
+from django.db import connection, models
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = 'turfs_turf_fts'
+PG_TABLE = 'turfs_turf_search'
+
+# Indexed columns, in FTS5 column order, with their PostgreSQL weight labels
+COLUMNS = ('name', 'city', 'sports', 'address', 'amenities')
+PG_WEIGHTS = {'name': 'A', 'city': 'B', 'sports': 'C', 'address': 'D', 'amenities': 'D'}
+# bm25() column weights for FTS5, same relative importance as the PostgreSQL labels
+FTS_WEIGHTS = '10.0, 5.0, 3.0, 1.0, 1.0'
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+_supported = {}
+
+
+class SearchRank(models.Expression):
+    """
+    Correlated rank subquery. `sql` takes the match string as its only %s and
+    {turf_id} for the outer turf's id, which is compiled from F('pk') so it
+    follows whatever alias the outer query gives turfs_turf.
+    """
+    output_field = models.FloatField()
+
+    def __init__(self, sql, match, turf_id=None):
+        super().__init__()
+        self.sql, self.match = sql, match
+        self.turf_id = turf_id if turf_id is not None else models.F('pk')
+
+    def get_source_expressions(self):
+        return [self.turf_id]
+
+    def set_source_expressions(self, exprs):
+        self.turf_id, = exprs
+
+    def as_sql(self, compiler, connection):
+        turf_id_sql, turf_id_params = compiler.compile(self.turf_id)
+        return f'({self.sql.format(turf_id=turf_id_sql)})', [self.match, *turf_id_params]
+
+
+class TurfSearchService:
+    @staticmethod
+    def is_supported():
+        """True when the current database has a search index table (checked once per database)."""
+        key = (connection.vendor, connection.settings_dict['NAME'])
+        if key not in _supported:
+            table = {'sqlite': FTS_TABLE, 'postgresql': PG_TABLE}.get(connection.vendor)
+            _supported[key] = bool(table) and table in connection.introspection.table_names()
+        return _supported[key]
+
+    @staticmethod
+    def reset_support_cache():
+        _supported.clear()
+
+    @staticmethod
+    def tokenize(text):
+        return [t.lower() for t in TOKEN_RE.findall(text or '')]
+
+    @staticmethod
+    def document_for(turf):
+        return {
+            'name': turf.name or '',
+            'city': turf.city or '',
+            'sports': ' '.join(turf.sports.values_list('name', flat=True)),
+            'address': turf.address or '',
+            'amenities': (turf.amenities or '').replace(',', ' '),
+        }
+
+    @staticmethod
+    def index_turf(turf):
+        if not TurfSearchService.is_supported():
+            return
+        doc = TurfSearchService.document_for(turf)
+        with connection.cursor() as cursor:
+            if connection.vendor == 'sqlite':
+                cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [turf.pk])
+                cursor.execute(
+                    f"INSERT INTO {FTS_TABLE} (rowid, {', '.join(COLUMNS)}) VALUES (%s, {', '.join(['%s'] * len(COLUMNS))})",
+                    [turf.pk, *[doc[c] for c in COLUMNS]]
+                )
+            else:
+                vector = ' || '.join(f"setweight(to_tsvector('simple', %s), '{PG_WEIGHTS[c]}')" for c in COLUMNS)
+                cursor.execute(
+                    f"INSERT INTO {PG_TABLE} (turf_id, document) VALUES (%s, {vector}) "
+                    "ON CONFLICT (turf_id) DO UPDATE SET document = EXCLUDED.document",
+                    [turf.pk, *[doc[c] for c in COLUMNS]]
+                )
+
+    @staticmethod
+    def remove_turf(turf_id):
+        if not TurfSearchService.is_supported():
+            return
+        table, key = (FTS_TABLE, 'rowid') if connection.vendor == 'sqlite' else (PG_TABLE, 'turf_id')
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {table} WHERE {key} = %s", [turf_id])
+
+    @staticmethod
+    def rebuild():
+        """Re-indexes every turf. Returns the number of indexed turfs."""
+        from .models import Turf
+        if not TurfSearchService.is_supported():
+            return 0
+        table = FTS_TABLE if connection.vendor == 'sqlite' else PG_TABLE
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {table}")
+        count = 0
+        for turf in Turf.objects.all().iterator(chunk_size=500):
+            TurfSearchService.index_turf(turf)
+            count += 1
+        return count
+
+    @staticmethod
+    def build_match(tokens, column=None):
+        """Prefix query: every token must match the start of a word (in `column` if given)."""
+        if connection.vendor == 'sqlite':
+            expr = ' '.join(f'"{t}"*' for t in tokens)
+            return f'{{{column}}} : ({expr})' if column else expr
+        label = PG_WEIGHTS[column] if column else ''
+        return ' & '.join(f'{t}:*{label}' for t in tokens)
+
+    @staticmethod
+    def filter(queryset, query, column=None):
+        """
+        Restricts a Turf queryset to rows matching `query` and annotates `search_rank`
+        (higher is better). `column` limits matching to one indexed field, e.g. 'city'.
+        """
+        tokens = TurfSearchService.tokenize(query)
+        if not tokens:
+            return queryset.annotate(search_rank=models.Value(0.0, output_field=models.FloatField()))
+
+        if not TurfSearchService.is_supported():
+            fields = [column] if column else ['name', 'city', 'address', 'amenities', 'sports__name']
+            condition = Q()
+            for token in tokens:
+                condition &= Q(*[Q(**{f'{f}__icontains': token}) for f in fields], _connector=Q.OR)
+            ids = queryset.model.objects.filter(condition).values('id')
+            return queryset.filter(id__in=ids).annotate(
+                search_rank=models.Value(0.0, output_field=models.FloatField())
+            )
+
+        match = TurfSearchService.build_match(tokens, column)
+        if connection.vendor == 'sqlite':
+            matches = RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match])
+            rank = SearchRank(
+                f"SELECT -bm25({FTS_TABLE}, {FTS_WEIGHTS}) FROM {FTS_TABLE} "
+                f"WHERE {FTS_TABLE} MATCH %s AND rowid = {{turf_id}}",
+                match
+            )
+        else:
+            matches = RawSQL(f"SELECT turf_id FROM {PG_TABLE} WHERE document @@ to_tsquery('simple', %s)", [match])
+            rank = SearchRank(
+                f"SELECT ts_rank(document, to_tsquery('simple', %s)) FROM {PG_TABLE} WHERE turf_id = {{turf_id}}",
+                match
+            )
+        return queryset.filter(id__in=matches).annotate(search_rank=rank)
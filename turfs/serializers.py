@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from .models import Turf, SportType, TurfImage, TurfVideo
+from .images import current_items, derivative_name
 
 class SportTypeSerializer(serializers.ModelSerializer):
     class Meta:
@@ -7,9 +8,20 @@ class SportTypeSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'icon']
 
 class TurfImageSerializer(serializers.ModelSerializer):
+    sizes = serializers.SerializerMethodField()
+
     class Meta:
         model = TurfImage
-        fields = ['id', 'image', 'is_cover']
+        fields = ['id', 'image', 'is_cover', 'sizes']
+
+    def get_sizes(self, obj):
+        """Derivative URLs by size ('thumb', 'card', 'thumb_webp', 'card_webp'); empty until generated."""
+        request = self.context.get('request')
+        storage = obj.image.storage
+        urls = {size: storage.url(name) for size, name in current_items(obj.derivatives, obj.image.name).items()}
+        if request:
+            urls = {size: request.build_absolute_uri(url) for size, url in urls.items()}
+        return urls
 
 class TurfVideoSerializer(serializers.ModelSerializer):
     class Meta:
@@ -30,8 +42,8 @@ class TurfListSerializer(serializers.ModelSerializer):
         if cover:
             request = self.context.get('request')
             if request:
-                return request.build_absolute_uri(cover.image.url)
-            return cover.image.url
+                return request.build_absolute_uri(cover.card_url)
+            return cover.card_url
         return None
 
 class TurfDetailSerializer(serializers.ModelSerializer):
@@ -56,3 +68,131 @@ class TurfDetailSerializer(serializers.ModelSerializer):
             request.build_absolute_uri(v.video.url) if request else v.video.url 
             for v in obj.videos.all()
         ]
+
+
+def parse_field_list(value):
+    return [name.strip() for name in (value or '').split(',') if name.strip()]
+
+
+class TurfListProjection:
+    """
+    Lean read path producing exactly what TurfListSerializer does.
+
+    Rows come from .values(); sports and cover images are loaded for the whole page
+    in one query each, and plain columns go through the serializer fields'
+    to_representation, looked up once per process instead of per row.
+
+    Sparse fieldsets: `fields` limits the output (and the columns, relations and
+    annotations fetched) to the named fields. With `fields`, relations render as
+    ids unless named in `expand`; without it every relation is expanded as before.
+    """
+    value_fields = ('id', 'name', 'city', 'price_per_hour')
+    relation_fields = ('sports',)
+    all_fields = tuple(TurfListSerializer.Meta.fields)
+    _mappers = None
+
+    @classmethod
+    def mappers(cls):
+        if cls._mappers is None:
+            fields = TurfListSerializer().fields
+            cls._mappers = tuple((name, fields[name].to_representation) for name in cls.value_fields)
+        return cls._mappers
+
+    @classmethod
+    def plan(cls, fields_param=None, expand_param=None):
+        """
+        Parses ?fields= / ?expand= into (fields, expand) name tuples in output order.
+        Raises ValidationError for unknown names.
+        """
+        requested = parse_field_list(fields_param)
+        expanded = parse_field_list(expand_param)
+        errors = {}
+        unknown = [name for name in requested if name not in cls.all_fields]
+        if unknown:
+            errors['fields'] = [f"Unknown field(s): {', '.join(unknown)}. Available: {', '.join(cls.all_fields)}."]
+        unknown = [name for name in expanded if name not in cls.relation_fields]
+        if unknown:
+            errors['expand'] = [f"Cannot expand: {', '.join(unknown)}. Expandable: {', '.join(cls.relation_fields)}."]
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        if not requested:
+            return cls.all_fields, cls.relation_fields
+        fields = tuple(name for name in cls.all_fields if name in requested or name in expanded)
+        return fields, tuple(name for name in cls.relation_fields if name in expanded)
+
+    @classmethod
+    def values(cls, queryset, fields=None, ordering=None):
+        """
+        `queryset` as dict rows carrying the requested columns, the id and every sort key.
+        Without `ordering` all annotations are selected, since any of them may be a sort key.
+        """
+        fields = cls.all_fields if fields is None else fields
+        columns = ['id', *(name for name in cls.value_fields if name in fields)]
+        annotations = queryset.query.annotations
+        if ordering is None:
+            columns += ['created_at', *annotations]
+        else:
+            columns += [name.lstrip('-') for name in ordering]
+            if 'distance' in fields and 'distance' in annotations:
+                columns.append('distance')
+        return queryset.values(*dict.fromkeys(columns))
+
+    @staticmethod
+    def sports_by_turf(turf_ids, expand=True):
+        result = {pk: [] for pk in turf_ids}
+        rows = Turf.sports.through.objects.filter(turf_id__in=turf_ids).order_by('pk')
+        if not expand:
+            for turf_id, pk in rows.values_list('turf_id', 'sporttype_id'):
+                result[turf_id].append(pk)
+            return result
+        for turf_id, pk, name, icon in rows.values_list('turf_id', 'sporttype_id', 'sporttype__name', 'sporttype__icon'):
+            result[turf_id].append({'id': pk, 'name': name, 'icon': icon})
+        return result
+
+    @staticmethod
+    def cover_urls(turf_ids):
+        """Card-size URL of each turf's cover: the first cover image, else the first image."""
+        storage = TurfImage._meta.get_field('image').storage
+        covers = {}
+        rows = TurfImage.objects.filter(turf_id__in=turf_ids).order_by('turf_id', '-is_cover', 'pk').values_list(
+            'turf_id', 'image', 'derivatives'
+        )
+        for turf_id, name, manifest in rows:
+            if turf_id not in covers and name:
+                covers[turf_id] = storage.url(derivative_name(manifest, name, 'card') or name)
+        return covers
+
+    @classmethod
+    def serialize(cls, rows, request=None, fields=None, expand=None):
+        if fields is None:
+            fields, expand = cls.all_fields, cls.relation_fields
+        rows = list(rows)
+        ids = [row['id'] for row in rows]
+        sports = cls.sports_by_turf(ids, expand='sports' in expand) if ids and 'sports' in fields else {}
+        covers = cls.cover_urls(ids) if ids and 'cover_image' in fields else {}
+        mappers = [(name, to_representation) for name, to_representation in cls.mappers() if name in fields]
+        has_distance = 'distance' in fields and bool(rows) and 'distance' in rows[0]
+
+        origin = f'{request.scheme}://{request.get_host()}' if request is not None else ''
+
+        def absolute(url):
+            if request is None or url is None:
+                return url
+            return origin + url if url.startswith('/') and not url.startswith('//') else request.build_absolute_uri(url)
+
+        data = []
+        for row in rows:
+            item = {}
+            for name, to_representation in mappers:
+                value = row[name]
+                item[name] = None if value is None else to_representation(value)
+            if 'sports' in fields:
+                item['sports'] = sports[row['id']]
+            if 'cover_image' in fields:
+                item['cover_image'] = absolute(covers.get(row['id']))
+            if has_distance:
+                distance = row['distance']
+                item['distance'] = None if distance is None else float(distance)
+            data.append(item)
+        return data
@@ -97,3 +97,118 @@ class AvailabilityService:
             })
             
         return slots, is_date_avail, reason
+
+
+class TurfVisibilityService:
+    @staticmethod
+    def set_active(queryset, is_active):
+        """
+        Bulk-activates or deactivates turfs. queryset.update() skips signals, so
+        this bumps the app config (city list) and turf counters and refreshes the
+        autocomplete index once the transaction commits. Returns the number updated.
+        """
+        from django.db import transaction
+        from core.services.versioning import VersionService, APP_CONFIG_KEY, turf_key
+        from .autocomplete import TurfAutocomplete
+        turf_ids = list(queryset.values_list('pk', flat=True))
+        updated = Turf.objects.filter(pk__in=turf_ids).update(is_active=is_active)
+        VersionService.bump(APP_CONFIG_KEY, *[turf_key(pk) for pk in turf_ids])
+        transaction.on_commit(TurfAutocomplete.invalidate)
+        return updated
+
+    @staticmethod
+    def activate_owner_turfs(owner):
+        """Puts all of a newly approved owner's turfs live."""
+        return TurfVisibilityService.set_active(owner.turfs.all(), True)
+
+
+class RankingService:
+    """
+    Turf.ranking_tier mirrors the plan tier of the owner's live (ACTIVE and not
+    yet ended) subscription, so listings can ORDER BY an indexed column. It is
+    synced when a subscription or plan changes (subscriptions/signals.py) and
+    dropped back to 0 after end_date by `manage.py refresh_ranking_tiers`.
+    """
+    @staticmethod
+    def live_subscriptions(now=None):
+        from subscriptions.models import OwnerSubscription
+        return OwnerSubscription.objects.filter(status='ACTIVE', end_date__gt=now or timezone.now())
+
+    @staticmethod
+    def live_tier(owner_id):
+        tier = RankingService.live_subscriptions().filter(owner_id=owner_id).values_list('plan__tier', flat=True).first()
+        return tier or 0
+
+    @staticmethod
+    def sync_owner(owner_id):
+        """Sets ranking_tier on the owner's turfs. Returns the number of turfs changed."""
+        tier = RankingService.live_tier(owner_id)
+        return Turf.objects.filter(owner_id=owner_id).exclude(ranking_tier=tier).update(ranking_tier=tier)
+
+    @staticmethod
+    def refresh_all(now=None):
+        """Brings every turf's ranking_tier in line with live subscriptions. Returns the number changed."""
+        live = RankingService.live_subscriptions(now)
+        changed = Turf.objects.filter(ranking_tier__gt=0).exclude(
+            owner_id__in=live.values('owner_id')
+        ).update(ranking_tier=0)
+        for tier in live.values_list('plan__tier', flat=True).distinct():
+            changed += Turf.objects.filter(
+                owner_id__in=live.filter(plan__tier=tier).values('owner_id')
+            ).exclude(ranking_tier=tier).update(ranking_tier=tier)
+        return changed
+
+
+# Cached detail payloads are keyed by the turf's change counter, so a bump simply
+# makes the old entry unreachable; the TTL only bounds how long orphans linger.
+DETAIL_CACHE_TTL = 60 * 60 * 6
+# Bump when the TurfDetailSerializer payload changes shape
+DETAIL_CACHE_SCHEMA = 2
+
+
+
+class TurfDetailService:
+    @staticmethod
+    def cache_key(turf_id, version):
+        return f'turfs:detail:s{DETAIL_CACHE_SCHEMA}:{turf_id}:v{version}'
+
+    @staticmethod
+    def get_representation(turf_id, version):
+        """
+        Returns the request-independent TurfDetailSerializer payload for an active turf
+        (relative media URLs, no distance), or None if there is no such turf.
+        """
+        from django.core.cache import cache
+        from .serializers import TurfDetailSerializer
+
+        key = TurfDetailService.cache_key(turf_id, version)
+        data = cache.get(key)
+        if data is not None:
+            return data
+
+        queryset = Turf.objects.filter(is_active=True).select_related('owner').prefetch_related('sports', 'images', 'videos')
+        turf = queryset.filter(pk=turf_id).first()
+        if turf is None:
+            return None
+        data = dict(TurfDetailSerializer(turf, context={}).data)
+        data.pop('distance', None)
+        cache.set(key, data, DETAIL_CACHE_TTL)
+        return data
+
+    @staticmethod
+    def localize(data, request, distance=None):
+        """Patches in the request-dependent parts: absolute media URLs and distance."""
+        origin = f'{request.scheme}://{request.get_host()}'
+
+        def absolute(url):
+            return origin + url if url and url.startswith('/') else url
+
+        data = dict(data)
+        data['images'] = [
+            {**item, 'image': absolute(item['image']), 'sizes': {k: absolute(v) for k, v in item['sizes'].items()}}
+            for item in data['images']
+        ]
+        data['videos'] = [absolute(url) for url in data['videos']]
+        if distance is not None:
+            data['distance'] = distance
+        return data
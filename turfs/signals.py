@@ -1,7 +1,21 @@
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_save, pre_save, pre_delete, post_delete, m2m_changed, post_migrate
+from django.db import transaction
 from django.dispatch import receiver
-from .models import Turf, TurfActivityLog
+from .models import Turf, TurfActivityLog, SportType, TurfImage, TurfVideo
+from .search import TurfSearchService
+from .autocomplete import TurfAutocomplete
+from .images import ImageDerivativeService, derivative_names
 from bookings.models import Booking
+from users.models import CustomUser
+from core.services.versioning import VersionService, APP_CONFIG_KEY, turf_key
+from core.services.media import MediaBlobService
+
+@receiver(pre_save, sender=Turf)
+def set_initial_ranking_tier(sender, instance, raw=False, **kwargs):
+    # New turfs of a subscribed owner rank at the owner's tier straight away
+    if instance._state.adding and not raw and instance.owner_id:
+        from .services import RankingService
+        instance.ranking_tier = RankingService.live_tier(instance.owner_id)
 
 @receiver(pre_save, sender=Turf)
 def track_turf_changes(sender, instance, **kwargs):
@@ -54,3 +68,158 @@ def log_booking_cancellation(sender, instance, **kwargs):
                 )
         except Booking.DoesNotExist:
             pass
+
+# --- Search index sync ---
+
+@receiver(post_migrate)
+def reset_search_support(sender, **kwargs):
+    # The index tables may have just been created or dropped
+    TurfSearchService.reset_support_cache()
+
+@receiver(post_save, sender=Turf)
+def index_turf_for_search(sender, instance, raw=False, **kwargs):
+    if not raw:
+        TurfSearchService.index_turf(instance)
+
+@receiver(post_delete, sender=Turf)
+def remove_turf_from_search(sender, instance, **kwargs):
+    TurfSearchService.remove_turf(instance.pk)
+
+@receiver(m2m_changed, sender=Turf.sports.through)
+def reindex_turf_sports(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse and action == 'pre_clear':
+        # sport.turfs.clear() sends no pk_set, so remember who is affected
+        instance._search_cleared_turf_ids = list(instance.turfs.values_list('pk', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if reverse:
+        turf_ids = pk_set if action != 'post_clear' else getattr(instance, '_search_cleared_turf_ids', [])
+        for turf in Turf.objects.filter(pk__in=turf_ids):
+            TurfSearchService.index_turf(turf)
+    else:
+        TurfSearchService.index_turf(instance)
+
+@receiver(post_save, sender=SportType)
+def reindex_sport_turfs(sender, instance, created, raw=False, **kwargs):
+    if created or raw:
+        return
+    for turf in instance.turfs.all():
+        TurfSearchService.index_turf(turf)
+
+@receiver(pre_delete, sender=SportType)
+def remember_sport_turfs(sender, instance, **kwargs):
+    # The Collector drops the through rows without m2m_changed, so remember who is affected
+    instance._deleted_turf_ids = list(instance.turfs.values_list('pk', flat=True))
+
+@receiver(post_delete, sender=SportType)
+def reindex_deleted_sport_turfs(sender, instance, **kwargs):
+    for turf in Turf.objects.filter(pk__in=getattr(instance, '_deleted_turf_ids', [])):
+        TurfSearchService.index_turf(turf)
+
+# --- Autocomplete index sync ---
+
+# The index lives outside the database, so it only learns about committed changes
+
+@receiver(post_save, sender=Turf)
+def update_turf_autocomplete(sender, instance, raw=False, **kwargs):
+    if not raw:
+        transaction.on_commit(lambda: TurfAutocomplete.turf_changed(instance))
+
+@receiver(post_delete, sender=Turf)
+def remove_turf_autocomplete(sender, instance, **kwargs):
+    turf_id = instance.pk
+    transaction.on_commit(lambda: TurfAutocomplete.turf_deleted(turf_id))
+
+@receiver(post_save, sender=SportType)
+def update_sport_autocomplete(sender, instance, raw=False, **kwargs):
+    if not raw:
+        transaction.on_commit(lambda: TurfAutocomplete.sport_changed(instance))
+
+@receiver(post_delete, sender=SportType)
+def remove_sport_autocomplete(sender, instance, **kwargs):
+    sport_id = instance.pk
+    transaction.on_commit(lambda: TurfAutocomplete.sport_deleted(sport_id))
+
+# --- Change counters (ETags / cached representations) ---
+
+@receiver(post_save, sender=Turf)
+@receiver(post_delete, sender=Turf)
+def bump_turf_version(sender, instance, **kwargs):
+    # City and visibility feed the app config's city list
+    VersionService.bump(turf_key(instance.pk), APP_CONFIG_KEY)
+
+@receiver(post_save, sender=TurfImage)
+@receiver(post_delete, sender=TurfImage)
+@receiver(post_save, sender=TurfVideo)
+@receiver(post_delete, sender=TurfVideo)
+def bump_turf_media_version(sender, instance, **kwargs):
+    VersionService.bump(turf_key(instance.turf_id))
+
+@receiver(m2m_changed, sender=Turf.sports.through)
+def bump_turf_sports_version(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if reverse:
+        turf_ids = pk_set if action != 'post_clear' else getattr(instance, '_search_cleared_turf_ids', [])
+        VersionService.bump(*[turf_key(pk) for pk in turf_ids])
+    else:
+        VersionService.bump(turf_key(instance.pk))
+
+@receiver(post_save, sender=SportType)
+def bump_sport_versions(sender, instance, **kwargs):
+    turf_ids = instance.turfs.values_list('pk', flat=True)
+    VersionService.bump(APP_CONFIG_KEY, *[turf_key(pk) for pk in turf_ids])
+
+@receiver(post_delete, sender=SportType)
+def bump_deleted_sport_versions(sender, instance, **kwargs):
+    # The through rows are already gone; remember_sport_turfs collected the turf ids
+    turf_ids = getattr(instance, '_deleted_turf_ids', [])
+    VersionService.bump(APP_CONFIG_KEY, *[turf_key(pk) for pk in turf_ids])
+
+@receiver(post_save, sender=CustomUser)
+def bump_owner_turf_versions(sender, instance, created, **kwargs):
+    # Turf detail shows the owner's phone number
+    if instance.is_turf_owner and not created:
+        VersionService.bump(*[turf_key(pk) for pk in instance.turfs.values_list('pk', flat=True)])
+
+# --- Image derivatives ---
+
+@receiver(post_save, sender=TurfImage)
+def queue_image_derivatives(sender, instance, raw=False, **kwargs):
+    if not raw and instance.image and not ImageDerivativeService.is_current(instance):
+        transaction.on_commit(lambda: ImageDerivativeService.generate_async(instance.pk))
+
+@receiver(post_delete, sender=TurfImage)
+def delete_image_derivatives(sender, instance, **kwargs):
+    names = derivative_names(instance.derivatives)
+    # Identical uploads share one blob, and with it the derivatives
+    if names and not TurfImage.objects.filter(image=instance.image.name).exists():
+        transaction.on_commit(lambda: ImageDerivativeService.delete_files(names))
+
+# --- Media blob reference counts (core.storage) ---
+
+MEDIA_FIELDS = {TurfImage: 'image', TurfVideo: 'video'}
+
+@receiver(pre_save, sender=TurfImage)
+@receiver(pre_save, sender=TurfVideo)
+def remember_media_blob(sender, instance, raw=False, **kwargs):
+    if instance.pk and not raw:
+        field = MEDIA_FIELDS[sender]
+        instance._previous_blob = sender.objects.filter(pk=instance.pk).values_list(field, flat=True).first()
+
+@receiver(post_save, sender=TurfImage)
+@receiver(post_save, sender=TurfVideo)
+def count_media_blob(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    name = getattr(instance, MEDIA_FIELDS[sender]).name
+    previous = None if created else getattr(instance, '_previous_blob', None)
+    if created or name != previous:
+        MediaBlobService.acquire(name)
+        MediaBlobService.release(previous)
+
+@receiver(post_delete, sender=TurfImage)
+@receiver(post_delete, sender=TurfVideo)
+def release_media_blob(sender, instance, **kwargs):
+    MediaBlobService.release(getattr(instance, MEDIA_FIELDS[sender]).name)
@@ -1,3 +1,63 @@
-from django.test import TestCase
+from django.db.models import FloatField, Value
+from django.test import RequestFactory, TestCase
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
 
-# Create your tests here.
+from core.api_renderers import FastJSONRenderer
+from users.models import CustomUser
+from .images import MANIFEST_VERSION
+from .models import Turf, SportType, TurfImage
+from .serializers import TurfListSerializer, TurfListProjection
+
+
+class TurfListProjectionTests(TestCase):
+    """The lean values() read path must render exactly what TurfListSerializer does."""
+
+    @classmethod
+    def setUpTestData(cls):
+        owner = CustomUser.objects.create_user('+910000000001', is_turf_owner=True, is_owner_approved=True)
+        football = SportType.objects.create(name='Football', icon='fa-futbol')
+        cricket = SportType.objects.create(name='Cricket', icon='')
+        turfs = [
+            Turf.objects.create(
+                owner=owner, name=name, description='', address='1 Main Road', city=city, price_per_hour=price,
+            )
+            for name, city, price in (
+                ('Green Arena', 'Chennai', '1200.00'),
+                ('Kick Hub', 'Bengaluru', '999.50'),
+                ('Night Turf', 'Chennai', '800'),
+            )
+        ]
+        turfs[0].sports.add(football, cricket)
+        turfs[1].sports.add(cricket)
+        # A cover image wins over an earlier plain one; without a cover the first image is used
+        TurfImage.objects.create(turf=turfs[0], image='turf_images/plain.jpg')
+        TurfImage.objects.create(
+            turf=turfs[0], image='turf_images/cover.jpg', is_cover=True,
+            derivatives={
+                'v': MANIFEST_VERSION, 'source': 'turf_images/cover.jpg',
+                'items': {'card': {'name': 'turf_images/cover_card.jpg'}},
+            },
+        )
+        TurfImage.objects.create(turf=turfs[1], image='turf_images/only.jpg')
+
+    def setUp(self):
+        self.request = Request(RequestFactory().get('/api/v1/turfs/', SERVER_NAME='testserver'))
+
+    def assertSameOutput(self, queryset):
+        expected = JSONRenderer().render(
+            TurfListSerializer(queryset, many=True, context={'request': self.request}).data
+        )
+        lean = FastJSONRenderer().render(
+            TurfListProjection.serialize(TurfListProjection.values(queryset), self.request)
+        )
+        self.assertEqual(lean, expected)
+
+    def test_matches_serializer(self):
+        self.assertSameOutput(Turf.objects.order_by('-id'))
+
+    def test_matches_serializer_with_distance(self):
+        self.assertSameOutput(Turf.objects.annotate(distance=Value(2.5, output_field=FloatField())).order_by('id'))
+
+    def test_covers_every_serializer_field(self):
+        self.assertEqual(TurfListProjection.all_fields, tuple(TurfListSerializer.Meta.fields))
@@ -0,0 +1,236 @@
+"""
+Resumable chunked uploads for turf images and videos.
+
+Large files are sent in pieces instead of one multipart request, so a dropped
+connection only costs the current chunk and no worker or DB transaction is held
+for the whole transfer. Chunks are streamed to a temp file in fixed-size blocks
+(memory stays bounded) and the file header is checked as soon as it arrives.
+
+Protocol (see turfs/api_upload_views.py):
+    POST  /api/v1/uploads/                {"kind": "VIDEO", "filename": "promo.mp4", "size": 18234567}
+    PATCH /api/v1/uploads/<id>/           raw bytes with an Upload-Offset: <offset> header
+    GET   /api/v1/uploads/<id>/           current offset, to resume after a dropped connection
+    POST  /api/v1/uploads/<id>/finalize/  {"turf": 12, "is_cover": false}   (turf is optional)
+
+Finalized uploads that are not attached to a turf can be passed to the partner
+registration API as upload_ids. Expired sessions are removed by
+`python manage.py cleanup_media_uploads`.
+"""
+import os
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.text import get_valid_filename
+
+UPLOAD_DIR = getattr(settings, 'CHUNKED_UPLOAD_DIR', os.path.join(settings.BASE_DIR, 'tmp_uploads'))
+SESSION_TTL = timedelta(hours=24)
+# Suggested chunk size for clients, and the most a single PATCH may carry
+CHUNK_SIZE = 1024 * 1024
+MAX_CHUNK_SIZE = 8 * 1024 * 1024
+READ_BLOCK = 64 * 1024
+HEADER_BYTES = 12
+LOCK_TTL = timedelta(minutes=2)
+
+KINDS = {
+    'IMAGE': {
+        'max_size': 10 * 1024 * 1024,
+        'extensions': ('.jpg', '.jpeg', '.png', '.webp'),
+        'upload_to': 'turf_images/',
+    },
+    'VIDEO': {
+        'max_size': 20 * 1024 * 1024,
+        'extensions': ('.mp4', '.m4v', '.mov', '.webm'),
+        'upload_to': 'turf_videos/',
+    },
+}
+
+
+class UploadError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def header_matches(kind, head):
+    if kind == 'IMAGE':
+        return (
+            head.startswith(b'\xff\xd8\xff')                      # JPEG
+            or head.startswith(b'\x89PNG\r\n\x1a\n')              # PNG
+            or (head[:4] == b'RIFF' and head[8:12] == b'WEBP')    # WebP
+        )
+    return head[4:8] == b'ftyp' or head.startswith(b'\x1a\x45\xdf\xa3')  # MP4/MOV, WebM
+
+
+@contextmanager
+def session_lock(upload):
+    """
+    One writer per session across all processes; a retry racing the original
+    request gets a 409. The lease is claimed with a conditional UPDATE on the
+    row, so no transaction is held while the chunk streams in, and it lapses
+    after LOCK_TTL if the holder dies.
+    """
+    from .models import MediaUpload
+    now = timezone.now()
+    lease = now + LOCK_TTL
+    claimed = MediaUpload.objects.filter(pk=upload.pk).filter(
+        Q(locked_until__isnull=True) | Q(locked_until__lt=now)
+    ).update(locked_until=lease)
+    if not claimed:
+        raise UploadError("Another request for this upload is in progress.", status=409)
+    try:
+        upload.refresh_from_db()
+        yield
+    finally:
+        # Only release our own lease, not one taken after ours lapsed
+        MediaUpload.objects.filter(pk=upload.pk, locked_until=lease).update(locked_until=None)
+
+
+class ChunkedUploadService:
+    @staticmethod
+    def temp_path(upload):
+        return os.path.join(UPLOAD_DIR, f'{upload.id}.part')
+
+    @staticmethod
+    def start(owner, kind, filename, size):
+        from .models import MediaUpload
+        spec = KINDS[kind]
+        if not filename.lower().endswith(spec['extensions']):
+            raise UploadError(f"Unsupported file type. Allowed: {', '.join(spec['extensions'])}")
+        if size <= 0:
+            raise UploadError("File is empty.")
+        if size > spec['max_size']:
+            raise UploadError(f"File too large (max {spec['max_size'] // (1024 * 1024)}MB).", status=413)
+
+        upload = MediaUpload.objects.create(
+            owner=owner, kind=kind, filename=filename[:255], size=size,
+            expires_at=timezone.now() + SESSION_TTL
+        )
+        os.makedirs(UPLOAD_DIR, exist_ok=True)
+        open(ChunkedUploadService.temp_path(upload), 'wb').close()
+        return upload
+
+    @staticmethod
+    def append(upload, offset, stream, length):
+        """
+        Writes `length` bytes from `stream` at `offset`. A short read (client went
+        away) keeps whatever arrived, so the client resumes from the new offset.
+        Returns the new offset.
+        """
+        from .models import MediaUpload
+        if length > MAX_CHUNK_SIZE:
+            raise UploadError(f"Chunk too large (max {MAX_CHUNK_SIZE} bytes).", status=413)
+
+        with session_lock(upload):
+            if upload.status != 'UPLOADING':
+                raise UploadError(f"Upload is {upload.get_status_display().lower()}.", status=409)
+            if offset != upload.offset:
+                raise UploadError(f"Offset mismatch: expected {upload.offset}.", status=409)
+            if offset + length > upload.size:
+                raise UploadError("Chunk goes past the declared file size.")
+            if offset == 0 and length < min(HEADER_BYTES, upload.size):
+                raise UploadError(f"The first chunk must hold at least {HEADER_BYTES} bytes.")
+
+            received = 0
+            with open(ChunkedUploadService.temp_path(upload), 'r+b') as fh:
+                fh.seek(offset)
+                while received < length:
+                    block = stream.read(min(READ_BLOCK, length - received))
+                    if not block:
+                        break
+                    fh.write(block)
+                    received += len(block)
+                fh.truncate()
+                if offset < HEADER_BYTES <= offset + received or offset + received == upload.size:
+                    fh.seek(0)
+                    if not header_matches(upload.kind, fh.read(HEADER_BYTES)):
+                        ChunkedUploadService.fail(upload, "File content does not match its type.")
+                        raise UploadError("File content does not match its type.", status=415)
+
+            upload.offset = offset + received
+            MediaUpload.objects.filter(pk=upload.pk).update(
+                offset=upload.offset, expires_at=timezone.now() + SESSION_TTL, updated_at=timezone.now()
+            )
+            return upload.offset
+
+    @staticmethod
+    def finalize(upload):
+        """Validates the complete file and moves it into media storage."""
+        from .models import TurfImage
+        with session_lock(upload):
+            if upload.status != 'UPLOADING':
+                raise UploadError(f"Upload is {upload.get_status_display().lower()}.", status=409)
+            if upload.offset != upload.size:
+                raise UploadError(f"Upload incomplete: {upload.offset} of {upload.size} bytes received.", status=409)
+
+            path = ChunkedUploadService.temp_path(upload)
+            if upload.kind == 'IMAGE':
+                from PIL import Image
+                try:
+                    with Image.open(path) as img:
+                        img.verify()
+                except Exception:
+                    ChunkedUploadService.fail(upload, "Not a valid image.")
+                    raise UploadError("Not a valid image.")
+
+            storage = TurfImage._meta.get_field('image').storage
+            name = KINDS[upload.kind]['upload_to'] + get_valid_filename(os.path.basename(upload.filename))
+            with open(path, 'rb') as fh:
+                upload.stored_name = storage.save(name, File(fh))
+            os.remove(path)
+            upload.status = 'COMPLETE'
+            upload.save(update_fields=['stored_name', 'status', 'updated_at'])
+        return upload
+
+    @staticmethod
+    def attach(upload, turf, is_cover=False):
+        """Creates the TurfImage / TurfVideo for a finalized upload."""
+        from .models import MediaUpload, TurfImage, TurfVideo
+        with transaction.atomic():
+            # Claiming the row first makes attaching the same upload twice impossible
+            claimed = MediaUpload.objects.filter(pk=upload.pk, status='COMPLETE').update(
+                status='ATTACHED', updated_at=timezone.now()
+            )
+            if not claimed:
+                raise UploadError("Upload is not finalized or already attached.", status=409)
+            if upload.kind == 'IMAGE':
+                if is_cover:
+                    turf.images.filter(is_cover=True).update(is_cover=False)
+                media = TurfImage.objects.create(turf=turf, image=upload.stored_name, is_cover=is_cover)
+            else:
+                media = TurfVideo.objects.create(turf=turf, video=upload.stored_name)
+        upload.status = 'ATTACHED'
+        return media
+
+    @staticmethod
+    def fail(upload, message):
+        from .models import MediaUpload
+        MediaUpload.objects.filter(pk=upload.pk).update(status='FAILED', error=message[:255], updated_at=timezone.now())
+        upload.status, upload.error = 'FAILED', message
+        ChunkedUploadService.discard_temp(upload)
+
+    @staticmethod
+    def discard_temp(upload):
+        try:
+            os.remove(ChunkedUploadService.temp_path(upload))
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def cleanup(now=None):
+        """
+        Deletes expired sessions that never got attached, with their temp files. Returns the count.
+        Finalized files may be shared blobs, so they are left to gc_media_blobs.
+        """
+        from .models import MediaUpload
+        expired = MediaUpload.objects.filter(expires_at__lt=now or timezone.now()).exclude(status='ATTACHED')
+        count = 0
+        for upload in expired.iterator():
+            ChunkedUploadService.discard_temp(upload)
+            upload.delete()
+            count += 1
+        return count
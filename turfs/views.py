@@ -9,28 +9,11 @@ from django.utils import timezone
 
 from core.services.location import LocationService
 
-from django.db.models import Value
-from django.db.models.functions import Coalesce
-
 def turf_list(request):
-    from subscriptions.models import OwnerSubscription
-    from django.db import models
-    
-    # Optimized query with real-time subscription status check
-    # Only ACTIVE and NON-EXPIRED subscriptions contribute to ranking
-    now = timezone.now()
-    turfs = Turf.objects.filter(is_active=True).annotate(
-        priority_tier=Coalesce(
-            models.Subquery(
-                OwnerSubscription.objects.filter(
-                    owner=models.OuterRef('owner'),
-                    status='ACTIVE',
-                    end_date__gt=now
-                ).values('plan__tier')[:1]
-            ), 
-            Value(0)
-        )
-    ).order_by('-priority_tier', '-created_at').select_related('owner')
+    from .search import TurfSearchService
+
+    # Subscription tier is denormalized onto the turf (see RankingService)
+    turfs = Turf.objects.filter(is_active=True).order_by('-ranking_tier', '-created_at').select_related('owner')
     
     # Location Search
     lat = request.GET.get('lat')
@@ -44,10 +27,10 @@ def turf_list(request):
     elif q_filter == '5v5':
         turfs = turfs.filter(sports__name__icontains='5v5')
     
-    # City Search
+    # City Search (prefix match on the full-text index)
     city = request.GET.get('city')
     if city:
-        turfs = turfs.filter(city__icontains=city)
+        turfs = TurfSearchService.filter(turfs, city, column='city')
         
     # Apply Radius Search if Lat/Long exists
     if lat and lon:
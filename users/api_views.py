@@ -1,26 +1,38 @@
 from rest_framework import status, views
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
 from django.contrib.auth import get_user_model
-from core.utils import get_sms_provider
-from .serializers import LoginRequestSerializer, VerifyOTPRequestSerializer, UserSerializer
+from core.api_throttles import (
+    OTPRequestIPThrottle, OTPRequestPhoneThrottle, OTPVerifyIPThrottle, OTPVerifyPhoneThrottle
+)
+from core.services import otp as otp_service
+from core.services.otp import OTPService
+from .serializers import LoginRequestSerializer, VerifyOTPRequestSerializer, UserSerializer, TokenRefreshRequestSerializer
+from .tokens import ClaimsRefreshToken, CLAIMS_VERSION_CLAIM
+from core.services.versioning import VersionService, user_claims_key
 
 User = get_user_model()
 
+OTP_ERRORS = {
+    otp_service.INVALID: "Invalid OTP",
+    otp_service.EXPIRED: "OTP expired",
+    otp_service.LOCKED: "Too many incorrect attempts, request a new OTP",
+    otp_service.MISSING: "No active OTP, request a new one",
+}
+
 class LoginAPIView(views.APIView):
     permission_classes = [AllowAny]
+    throttle_classes = [OTPRequestIPThrottle, OTPRequestPhoneThrottle]
 
     def post(self, request):
         serializer = LoginRequestSerializer(data=request.data)
         if serializer.is_valid():
             phone = serializer.validated_data['phone_number']
-            user, created = User.objects.get_or_create(phone_number=phone)
-            otp = user.generate_demo_otp()
-            
-            # Use Service Layer
-            sms = get_sms_provider()
-            sms.send_otp(phone, otp)
+            # Delivery (SMS provider etc.) runs in the background; the account
+            # is only created once the OTP is verified
+            otp = OTPService.issue(phone)
             
             response_data = {"message": "OTP sent successfully"}
             from django.conf import settings
@@ -32,6 +44,7 @@ class LoginAPIView(views.APIView):
 
 class VerifyOTPAPIView(views.APIView):
     permission_classes = [AllowAny]
+    throttle_classes = [OTPVerifyIPThrottle, OTPVerifyPhoneThrottle]
 
     def post(self, request):
         serializer = VerifyOTPRequestSerializer(data=request.data)
@@ -39,19 +52,41 @@ class VerifyOTPAPIView(views.APIView):
             phone = serializer.validated_data['phone_number']
             otp_input = serializer.validated_data['otp']
             
-            try:
-                user = User.objects.get(phone_number=phone)
-                if user.otp == otp_input:
-                    user.otp = None
-                    user.save()
-                    
-                    refresh = RefreshToken.for_user(user)
-                    return Response({
-                        'refresh': str(refresh),
-                        'access': str(refresh.access_token),
-                        'user': UserSerializer(user).data
-                    })
-                return Response({"error": "Invalid OTP"}, status=status.HTTP_400_BAD_REQUEST)
-            except User.DoesNotExist:
-                return Response({"error": "User not found"}, status=status.HTTP_404_NOT_FOUND)
+            outcome = OTPService.verify(phone, otp_input)
+            if outcome == otp_service.VERIFIED:
+                user, created = User.objects.get_or_create(phone_number=phone)
+                refresh = ClaimsRefreshToken.for_user(user)
+                return Response({
+                    'refresh': str(refresh),
+                    'access': str(refresh.access_token),
+                    'user': UserSerializer(user).data
+                })
+            return Response({"error": OTP_ERRORS[outcome]}, status=status.HTTP_400_BAD_REQUEST)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+class TokenRefreshAPIView(views.APIView):
+    """
+    Exchanges a refresh token for a new token pair with up-to-date claims.
+    Refresh tokens issued before the user's claims changed are rejected.
+    """
+    permission_classes = [AllowAny]
+    authentication_classes = []
+
+    def post(self, request):
+        serializer = TokenRefreshRequestSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            old = ClaimsRefreshToken(serializer.validated_data['refresh'])
+        except TokenError as e:
+            return Response({"error": str(e)}, status=status.HTTP_401_UNAUTHORIZED)
+
+        user_id = old.get(jwt_settings.USER_ID_CLAIM)
+        current = VersionService.get(user_claims_key(user_id), create=False)
+        issued = old.get(CLAIMS_VERSION_CLAIM)
+        user = User.objects.filter(pk=user_id, is_active=True).first()
+        if user is None or (issued is not None and (current is None or current[0] != issued)):
+            return Response({"error": "Token has been revoked, please sign in again"}, status=status.HTTP_401_UNAUTHORIZED)
+
+        refresh = ClaimsRefreshToken.for_user(user)
+        return Response({'refresh': str(refresh), 'access': str(refresh.access_token)})
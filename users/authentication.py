@@ -0,0 +1,73 @@
+from django.contrib.auth import get_user_model
+from django.utils.functional import SimpleLazyObject, empty
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from core.services.versioning import VersionService, user_claims_key
+from .tokens import CLAIMS_VERSION_CLAIM, USER_CLAIMS
+
+
+def _claim_attribute(name):
+    def getter(self):
+        if self._wrapped is empty:
+            return self._claims[name]
+        return getattr(self._wrapped, name)
+    return property(getter)
+
+
+class TokenClaimsUser(SimpleLazyObject):
+    """
+    request.user for JWT requests. The id and flags come from the token; anything
+    else (related objects, saving, use in ORM lookups) loads the CustomUser row
+    on first access.
+    """
+    pk = id = _claim_attribute('user_id')
+    phone_number = _claim_attribute('phone_number')
+    is_turf_owner = _claim_attribute('is_turf_owner')
+    is_owner_approved = _claim_attribute('is_owner_approved')
+    is_staff = _claim_attribute('is_staff')
+    is_active = True
+    is_authenticated = True
+    is_anonymous = False
+
+    def __bool__(self):
+        # DRF's IsAuthenticated checks `request.user and ...`; don't load for that
+        return True
+
+    def __init__(self, claims):
+        def load():
+            try:
+                return get_user_model().objects.get(pk=claims['user_id'], is_active=True)
+            except get_user_model().DoesNotExist:
+                raise AuthenticationFailed("User not found", code="user_not_found")
+        super().__init__(load)
+        # Bypass LazyObject.__setattr__, which would load the user to set it there
+        self.__dict__['_claims'] = claims
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that trusts the claims in tokens issued by
+    users.tokens.ClaimsRefreshToken instead of loading the user on every request.
+    Tokens are revoked by bumping the user's claims version (users/signals.py).
+    Older tokens without claims fall back to the database lookup.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken("Token contained no recognizable user identification") from e
+
+        issued_version = validated_token.get(CLAIMS_VERSION_CLAIM)
+        if issued_version is None:
+            return super().get_user(validated_token)
+
+        current = VersionService.get(user_claims_key(user_id), create=False)
+        if current is None or current[0] != issued_version:
+            raise AuthenticationFailed("Token has been revoked, please sign in again", code="token_revoked")
+
+        claims = {name: validated_token.get(name) for name in USER_CLAIMS}
+        claims['user_id'] = user_id
+        return TokenClaimsUser(claims)
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_turfownerprofile_owner_name'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OTPChallenge',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('phone_number', models.CharField(max_length=15, unique=True)),
+                ('code_hash', models.CharField(max_length=64)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('expires_at', models.DateTimeField(db_index=True)),
+                ('created_at', models.DateTimeField()),
+            ],
+        ),
+        migrations.RemoveField(
+            model_name='customuser',
+            name='otp',
+        ),
+        migrations.RemoveField(
+            model_name='customuser',
+            name='otp_created_at',
+        ),
+    ]
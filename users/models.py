@@ -1,9 +1,6 @@
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.db import models
 from django.utils.translation import gettext_lazy as _
-import random
-import datetime
-from django.utils import timezone
 
 class CustomUserManager(BaseUserManager):
     def create_user(self, phone_number, password=None, **extra_fields):
@@ -33,10 +30,7 @@ class CustomUser(AbstractUser):
     is_turf_owner = models.BooleanField(default=False)
     is_owner_approved = models.BooleanField(default=False) # Needs admin approval
     owner_application_date = models.DateTimeField(null=True, blank=True)
-    
-    # OTP Fields for Demo
-    otp = models.CharField(max_length=6, blank=True, null=True)
-    otp_created_at = models.DateTimeField(blank=True, null=True)
+
 
     objects = CustomUserManager()
 
@@ -46,40 +40,6 @@ class CustomUser(AbstractUser):
     def __str__(self):
         return self.phone_number
 
-    def generate_demo_otp(self):
-        from django.conf import settings
-        # STATIC OTP FOR DEBUG MODE TO UNBLOCK USER
-        if settings.DEBUG:
-            self.otp = "123456"
-        else:
-            self.otp = str(random.randint(100000, 999999))
-            
-        self.otp_created_at = timezone.now()
-        self.save()
-        
-        # 1. FILE-BASED FAILSAFE (Check root directory for OTP_ACTUAL.txt)
-        try:
-            with open("OTP_ACTUAL.txt", "w") as f:
-                f.write(f"USER: {self.phone_number}\nOTP: {self.otp}\nTIME: {timezone.now()}\n\nDEBUG_MODE: {'ACTIVE' if settings.DEBUG else 'OFF'}")
-        except Exception as e:
-            print(f"FAILED TO WRITE OTP FILE: {e}")
-
-        # 2. ULTRA-LOUD TERMINAL BROADCAST
-        # Using print(..., flush=True) for immediate visibility across all terminal types
-        print("\n" + "="*50)
-        print("🚀🚀🚀 TURFSPOT AUTHENTICATION 🚀🚀🚀")
-        print(f"DEVICE: {self.phone_number}")
-        print(f"OTP:    >>> {self.otp} <<<")
-        print(f"MODE:   {'DEBUG (STATIC)' if settings.DEBUG else 'PRODUCTION (RANDOM)'}")
-        print("="*50 + "\n", flush=True)
-        
-        # 3. LOGGING CHANNEL
-        import logging
-        logger = logging.getLogger('django')
-        logger.error(f"OTP_SENT: {self.phone_number} -> {self.otp}")
-        
-        return self.otp
-
 class TurfOwnerProfile(models.Model):
     user = models.OneToOneField(CustomUser, on_delete=models.CASCADE, related_name='owner_profile')
     owner_name = models.CharField(max_length=100, blank=True, help_text="Full name of the owner")
@@ -94,3 +54,18 @@ class TurfOwnerProfile(models.Model):
 
     def __str__(self):
         return f"Profile: {self.business_name} ({self.user.phone_number})"
+
+
+class OTPChallenge(models.Model):
+    """
+    Pending login OTP for a phone number (core.services.otp.OTPService).
+    Durable copy of the cached challenge; the code itself is only stored as a keyed hash.
+    """
+    phone_number = models.CharField(max_length=15, unique=True)
+    code_hash = models.CharField(max_length=64)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    expires_at = models.DateTimeField(db_index=True)
+    created_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"OTP for {self.phone_number} (expires {self.expires_at})"
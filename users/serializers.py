@@ -14,3 +14,6 @@ class LoginRequestSerializer(serializers.Serializer):
 class VerifyOTPRequestSerializer(serializers.Serializer):
     phone_number = serializers.CharField(max_length=15)
     otp = serializers.CharField(max_length=6)
+
+class TokenRefreshRequestSerializer(serializers.Serializer):
+    refresh = serializers.CharField()
@@ -0,0 +1,34 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from core.services.versioning import VersionService, user_claims_key
+from .models import CustomUser
+from .tokens import USER_CLAIMS
+
+
+TRACKED_FIELDS = (*USER_CLAIMS, 'is_active')
+
+
+@receiver(pre_save, sender=CustomUser)
+def remember_token_claims(sender, instance, raw=False, update_fields=None, **kwargs):
+    # e.g. login() saving only last_login can't change any claim
+    if raw or not instance.pk or (update_fields is not None and not set(update_fields) & set(TRACKED_FIELDS)):
+        instance._previous_claims = None
+        return
+    previous = CustomUser.objects.filter(pk=instance.pk).values(*TRACKED_FIELDS).first()
+    instance._previous_claims = previous
+
+
+@receiver(post_save, sender=CustomUser)
+def revoke_stale_tokens(sender, instance, created, raw=False, **kwargs):
+    """Issued JWTs embed these fields (users/tokens.py); changing one revokes them."""
+    previous = getattr(instance, '_previous_claims', None)
+    if raw or created or previous is None:
+        return
+    if any(previous[name] != getattr(instance, name) for name in TRACKED_FIELDS):
+        VersionService.bump(user_claims_key(instance.pk))
+
+
+@receiver(post_delete, sender=CustomUser)
+def revoke_deleted_user_tokens(sender, instance, **kwargs):
+    VersionService.bump(user_claims_key(instance.pk))
@@ -0,0 +1,20 @@
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.services.versioning import VersionService, user_claims_key
+
+# Copied into the token so API requests can build request.user without a query
+USER_CLAIMS = ('phone_number', 'is_turf_owner', 'is_owner_approved', 'is_staff')
+CLAIMS_VERSION_CLAIM = 'cv'
+
+
+class ClaimsRefreshToken(RefreshToken):
+    """Refresh token (and, via .access_token, access token) carrying the user's flags."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        for claim in USER_CLAIMS:
+            token[claim] = getattr(user, claim)
+        version, _ = VersionService.get(user_claims_key(user.pk))
+        token[CLAIMS_VERSION_CLAIM] = version
+        return token
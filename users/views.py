@@ -6,58 +6,75 @@ from django.utils import timezone
 from django.conf import settings
 from django.db import transaction
 from .models import CustomUser, TurfOwnerProfile
+from core.services import otp as otp_service
+from core.services.otp import OTPService, OTP_TTL
+from core.utils.ratelimit import rate_limit, by_post_field
 from turfs.models import Turf, SportType, TurfImage, TurfVideo
 
 User = get_user_model()
 
-# ... Login/OTP Views (unchanged) ...
+# ... Login/OTP Views ...
+OTP_ERRORS = {
+    otp_service.INVALID: "Invalid OTP.",
+    otp_service.EXPIRED: "OTP expired. Please request a new one.",
+    otp_service.LOCKED: "Too many incorrect attempts. Please request a new OTP.",
+    otp_service.MISSING: "No active OTP. Please request a new one.",
+}
+
+# The number awaiting verification travels in a signed cookie rather than the
+# session, so anonymous visitors going through the OTP flow never get a session
+# row; one is only created by login().
+PENDING_PHONE_COOKIE = 'auth_phone'
+PENDING_PHONE_SALT = 'users.otp.pending_phone'
+
+def pending_phone(request):
+    return request.get_signed_cookie(
+        PENDING_PHONE_COOKIE, default=None, salt=PENDING_PHONE_SALT,
+        max_age=OTP_TTL.total_seconds(),
+    )
+
+@rate_limit('otp_request_ip')
+@rate_limit('otp_request_phone', key=by_post_field('phone_number'))
 def login_view(request):
     if request.method == 'POST':
         phone = request.POST.get('phone_number')
         if phone:
-            user, created = User.objects.get_or_create(phone_number=phone)
-            otp = user.generate_demo_otp()
-            request.session['auth_user_id'] = user.id
+            # The account is only created once the OTP is verified
+            otp = OTPService.issue(phone)
             if settings.DEBUG:
                 messages.success(request, f"OTP Sent! [DEMO MODE: OTP is {otp}]")
             else:
-                messages.success(request, f"OTP Sent to {phone}. Check Console Logs!")
-            return redirect('users:verify_otp')
+                messages.success(request, f"OTP Sent to {phone}.")
+            response = redirect('users:verify_otp')
+            response.set_signed_cookie(
+                PENDING_PHONE_COOKIE, phone, salt=PENDING_PHONE_SALT,
+                max_age=int(OTP_TTL.total_seconds()), httponly=True, samesite='Lax',
+                secure=settings.SESSION_COOKIE_SECURE,
+            )
+            return response
         else:
             messages.error(request, "Please enter a valid phone number.")
     return render(request, 'users/login.html')
 
+@rate_limit('otp_verify_ip')
+@rate_limit('otp_verify_phone', key=pending_phone)
 def verify_otp_view(request):
-    user_id = request.session.get('auth_user_id')
-    if not user_id: return redirect('users:login')
+    phone = pending_phone(request)
+    if not phone: return redirect('users:login')
     
     if request.method == 'POST':
         otp_input = request.POST.get('otp')
-        try:
-            user = User.objects.get(id=user_id)
-            
-            # CRITICAL SECURITY: Check OTP expiration (10 minutes)
-            if user.otp_created_at:
-                from datetime import timedelta
-                otp_age = timezone.now() - user.otp_created_at
-                if otp_age > timedelta(minutes=10):
-                    user.otp = None  # Invalidate expired OTP
-                    user.save()
-                    messages.error(request, "OTP expired. Please request a new one.")
-                    return redirect('users:login')
-            
-            if user.otp == otp_input:
-                user.otp = None 
-                user.save()
-                login(request, user)
-                del request.session['auth_user_id']
-                if user.is_turf_owner and not user.is_owner_approved:
-                     messages.warning(request, "Your owner account is pending approval.")
-                return redirect('users:dashboard')
-            else:
-                messages.error(request, "Invalid OTP.")
-        except User.DoesNotExist:
-            messages.error(request, "User not found.")
+        outcome = OTPService.verify(phone, otp_input)
+        if outcome == otp_service.VERIFIED:
+            user, created = User.objects.get_or_create(phone_number=phone)
+            login(request, user)
+            if user.is_turf_owner and not user.is_owner_approved:
+                 messages.warning(request, "Your owner account is pending approval.")
+            response = redirect('users:dashboard')
+            response.delete_cookie(PENDING_PHONE_COOKIE, samesite='Lax')
+            return response
+        messages.error(request, OTP_ERRORS[outcome])
+        if outcome != otp_service.INVALID:
             return redirect('users:login')
     return render(request, 'users/verify_otp.html')
 
@@ -81,6 +98,7 @@ def dashboard_view(request):
     return render(request, 'users/dashboard.html', context)
 
 from core.utils.geo import GoogleMapsParser
+from core.services.maps import MapLinkService, INVALID, PENDING
 
 @login_required
 def register_as_owner(request):
@@ -96,19 +114,20 @@ def register_as_owner(request):
         # New Turf Fields
         description = request.POST.get('description', '')
         price_per_hour = request.POST.get('price_per_hour')
-        map_share_url = request.POST.get('map_share_url')
+        map_share_url = (request.POST.get('map_share_url') or '').strip() or None
         sport_ids = request.POST.getlist('sports')
 
         # Location Extraction Logic
-        latitude, longitude = None, None
+        latitude, longitude, outcome = None, None, None
         if map_share_url:
             if not GoogleMapsParser.is_valid_link(map_share_url):
                 messages.error(request, "Invalid Google Maps link format. Please follow the instructions to get a share link.")
                 return render(request, 'users/register_owner.html', {'sports': SportType.objects.all(), 'form_data': request.POST})
             
-            latitude, longitude = GoogleMapsParser.extract_lat_lon(map_share_url)
+            # Short links not seen before are resolved in the background after commit
+            latitude, longitude, outcome = MapLinkService.locate(map_share_url)
             
-            if latitude is None or longitude is None:
+            if outcome == INVALID:
                 messages.error(request, "Could not automatically detect coordinates. Please drop a specific pin on the map location and share that link.")
                 return render(request, 'users/register_owner.html', {'sports': SportType.objects.all(), 'form_data': request.POST})
 
@@ -146,6 +165,9 @@ def register_as_owner(request):
                 is_active=False # Visible only after admin approves the owner
             )
             
+            if outcome == PENDING:
+                transaction.on_commit(lambda: MapLinkService.resolve_async(map_share_url))
+
             # 5. Set Sports
             if sport_ids:
                 turf.sports.set(sport_ids)